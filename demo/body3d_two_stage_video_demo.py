@@ -2,13 +2,14 @@ import copy
 import os
 import os.path as osp
 from argparse import ArgumentParser
+from collections import deque
 
 import cv2
 import mmcv
 import numpy as np
 
-from mmpose.apis import (extract_pose_sequence, get_track_id,
-                         inference_pose_lifter_model,
+from mmpose.apis import (StreamingPoseLifter, extract_pose_sequence,
+                         get_track_id, inference_pose_lifter_model,
                          inference_top_down_pose_model, init_pose_model,
                          process_mmdet_results, vis_3d_pose_result)
 
@@ -51,6 +52,197 @@ def covert_keypoint_definition(keypoints, pose_det_dataset, pose_lift_dataset):
         raise NotImplementedError
 
 
+def get_pose_det_results(args, frame, person_det_model, pose_det_model,
+                         pose_det_results_last, next_id, fps):
+    """Detect and track the 2D poses in a frame.
+
+    Returns:
+        list[dict]: The 2D pose results of the frame.
+        int: The next track id.
+    """
+    pose_det_dataset = pose_det_model.cfg.data['test']['type']
+
+    # test a single image, the resulting box is (x1, y1, x2, y2)
+    mmdet_results = inference_detector(person_det_model, frame)
+
+    # keep the person class bounding boxes.
+    person_det_results = process_mmdet_results(mmdet_results, args.det_cat_id)
+
+    # make person results for single image
+    pose_det_results, _ = inference_top_down_pose_model(
+        pose_det_model,
+        frame,
+        person_det_results,
+        bbox_thr=args.bbox_thr,
+        format='xyxy',
+        dataset=pose_det_dataset,
+        return_heatmap=False,
+        outputs=None)
+
+    # get track id for each person instance
+    pose_det_results, next_id = get_track_id(
+        pose_det_results,
+        pose_det_results_last,
+        next_id,
+        use_oks=args.use_oks_tracking,
+        tracking_thr=args.tracking_thr,
+        use_one_euro=args.euro,
+        fps=fps)
+
+    return pose_det_results, next_id
+
+
+def vis_pose_lift_results(args, pose_lift_model, pose_lift_results,
+                          pose_det_results, img, num_instances):
+    """Visualize the 3D poses of a frame, along with its 2D poses."""
+    # Pose processing
+    pose_lift_results_vis = []
+    for idx, res in enumerate(pose_lift_results):
+        keypoints_3d = res['keypoints_3d']
+        # exchange y,z-axis, and then reverse the direction of x,z-axis
+        keypoints_3d = keypoints_3d[..., [0, 2, 1]]
+        keypoints_3d[..., 0] = -keypoints_3d[..., 0]
+        keypoints_3d[..., 2] = -keypoints_3d[..., 2]
+        # rebase height (z-axis)
+        if args.rebase_keypoint_height:
+            keypoints_3d[..., 2] -= np.min(
+                keypoints_3d[..., 2], axis=-1, keepdims=True)
+        res['keypoints_3d'] = keypoints_3d
+        # add title
+        det_res = pose_det_results[idx]
+        instance_id = det_res['track_id']
+        res['title'] = f'Prediction ({instance_id})'
+        # only visualize the target frame
+        res['keypoints'] = det_res['keypoints']
+        res['bbox'] = det_res['bbox']
+        res['track_id'] = instance_id
+        pose_lift_results_vis.append(res)
+
+    # Visualization
+    img_vis = vis_3d_pose_result(
+        pose_lift_model,
+        result=pose_lift_results_vis,
+        img=img,
+        out_file=None,
+        radius=args.radius,
+        thickness=args.thickness,
+        num_instances=num_instances)
+
+    return img_vis
+
+
+def detect_video(args, video, person_det_model, pose_det_model,
+                 pose_lift_model):
+    """Detect the 2D poses of the whole video.
+
+    Returns:
+        list[list[dict]]: The 2D pose results of the frames, whose keypoints
+            are converted to the definition of the pose lifter.
+    """
+    pose_det_dataset = pose_det_model.cfg.data['test']['type']
+    pose_lift_dataset = pose_lift_model.cfg.data['test']['type']
+
+    pose_det_results_list = []
+    next_id = 0
+    pose_det_results = []
+    for frame in video:
+        pose_det_results, next_id = get_pose_det_results(
+            args, frame, person_det_model, pose_det_model, pose_det_results,
+            next_id, video.fps)
+        pose_det_results_list.append(copy.deepcopy(pose_det_results))
+
+    # convert keypoint definition
+    for pose_det_results in pose_det_results_list:
+        for res in pose_det_results:
+            keypoints = res['keypoints']
+            res['keypoints'] = covert_keypoint_definition(
+                keypoints, pose_det_dataset, pose_lift_dataset)
+
+    return pose_det_results_list
+
+
+def lift_video(args, video, pose_det_results_list, pose_lift_model):
+    """Lift the 2D poses of the video to 3D frame by frame.
+
+    Yields:
+        tuple: The frame, its 3D pose results and its 2D pose results.
+    """
+    pose_lift_dataset = pose_lift_model.cfg.data['test']['type']
+
+    # load temporal padding config from model.data_cfg
+    if hasattr(pose_lift_model.cfg, 'test_data_cfg'):
+        data_cfg = pose_lift_model.cfg.test_data_cfg
+    else:
+        data_cfg = pose_lift_model.cfg.data_cfg
+
+    for i, pose_det_results in enumerate(pose_det_results_list):
+        # extract and pad input pose2d sequence
+        pose_results_2d = extract_pose_sequence(
+            pose_det_results_list,
+            frame_idx=i,
+            causal=data_cfg.causal,
+            seq_len=data_cfg.seq_len,
+            step=data_cfg.seq_frame_interval)
+        # 2D-to-3D pose lifting
+        pose_lift_results = inference_pose_lifter_model(
+            pose_lift_model,
+            pose_results_2d=pose_results_2d,
+            dataset=pose_lift_dataset,
+            with_track_id=True,
+            image_size=video.resolution,
+            norm_pose_2d=args.norm_pose_2d)
+
+        yield video[i], pose_lift_results, pose_det_results
+
+
+def lift_video_streaming(args, video, person_det_model, pose_det_model,
+                         pose_lift_model):
+    """Detect the 2D poses and lift them to 3D in one pass over the video.
+
+    The 3D poses of a frame are predicted as soon as the 2D poses of its
+    temporal context are detected. Only the frames waiting for the context
+    on their right (if the pose lifter is not causal) and the 2D poses in the
+    temporal context are kept, so the memory does not grow with the length
+    of the video.
+
+    Yields:
+        tuple: The frame, its 3D pose results and its 2D pose results.
+    """
+    pose_det_dataset = pose_det_model.cfg.data['test']['type']
+    pose_lift_dataset = pose_lift_model.cfg.data['test']['type']
+
+    pose_lifter = StreamingPoseLifter(
+        pose_lift_model,
+        pose_lift_dataset,
+        image_size=video.resolution,
+        norm_pose_2d=args.norm_pose_2d)
+    pending_frames = deque()
+
+    next_id = 0
+    pose_det_results = []
+    for frame in video:
+        pose_det_results, next_id = get_pose_det_results(
+            args, frame, person_det_model, pose_det_model, pose_det_results,
+            next_id, video.fps)
+
+        # convert keypoint definition
+        pose_lift_inputs = []
+        for res in pose_det_results:
+            res = res.copy()
+            res['keypoints'] = covert_keypoint_definition(
+                res['keypoints'], pose_det_dataset, pose_lift_dataset)
+            pose_lift_inputs.append(res)
+
+        pending_frames.append(frame)
+        for _, pose_lift_results in pose_lifter.update(pose_lift_inputs):
+            # the 3D pose results carry the 2D pose results of the frame
+            yield pending_frames.popleft(), pose_lift_results, \
+                pose_lift_results
+
+    for _, pose_lift_results in pose_lifter.flush():
+        yield pending_frames.popleft(), pose_lift_results, pose_lift_results
+
+
 def main():
     parser = ArgumentParser()
     parser.add_argument('det_config', help='Config file for detection')
@@ -126,6 +318,12 @@ def main():
         '--euro',
         action='store_true',
         help='Using One_Euro_Filter for smoothing')
+    parser.add_argument(
+        '--streaming',
+        action='store_true',
+        help='Lift the 2D poses to 3D as soon as their temporal context is '
+        'detected, instead of detecting the 2D poses of the whole video '
+        'first. The memory usage does not grow with the video length.')
     parser.add_argument(
         '--radius',
         type=int,
@@ -147,9 +345,6 @@ def main():
     video = mmcv.VideoReader(args.video_path)
     assert video.opened, f'Failed to load video file {args.video_path}'
 
-    # First stage: 2D pose detection
-    print('Stage 1: 2D pose detection.')
-
     person_det_model = init_detector(
         args.det_config, args.det_checkpoint, device=args.device.lower())
 
@@ -161,47 +356,6 @@ def main():
     assert pose_det_model.cfg.model.type == 'TopDown', 'Only "TopDown"' \
         'model is supported for the 1st stage (2D pose detection)'
 
-    pose_det_dataset = pose_det_model.cfg.data['test']['type']
-
-    pose_det_results_list = []
-    next_id = 0
-    pose_det_results = []
-    for frame in video:
-        pose_det_results_last = pose_det_results
-
-        # test a single image, the resulting box is (x1, y1, x2, y2)
-        mmdet_results = inference_detector(person_det_model, frame)
-
-        # keep the person class bounding boxes.
-        person_det_results = process_mmdet_results(mmdet_results,
-                                                   args.det_cat_id)
-
-        # make person results for single image
-        pose_det_results, _ = inference_top_down_pose_model(
-            pose_det_model,
-            frame,
-            person_det_results,
-            bbox_thr=args.bbox_thr,
-            format='xyxy',
-            dataset=pose_det_dataset,
-            return_heatmap=False,
-            outputs=None)
-
-        # get track id for each person instance
-        pose_det_results, next_id = get_track_id(
-            pose_det_results,
-            pose_det_results_last,
-            next_id,
-            use_oks=args.use_oks_tracking,
-            tracking_thr=args.tracking_thr,
-            use_one_euro=args.euro,
-            fps=video.fps)
-
-        pose_det_results_list.append(copy.deepcopy(pose_det_results))
-
-    # Second stage: Pose lifting
-    print('Stage 2: 2D-to-3D pose lifting.')
-
     pose_lift_model = init_pose_model(
         args.pose_lifter_config,
         args.pose_lifter_checkpoint,
@@ -210,7 +364,6 @@ def main():
     assert pose_lift_model.cfg.model.type == 'PoseLifter', \
         'Only "PoseLifter" model is supported for the 2nd stage ' \
         '(2D-to-3D lifting)'
-    pose_lift_dataset = pose_lift_model.cfg.data['test']['type']
 
     if args.out_video_root == '':
         save_out_video = False
@@ -223,72 +376,30 @@ def main():
         fps = video.fps
         writer = None
 
-    # convert keypoint definition
-    for pose_det_results in pose_det_results_list:
-        for res in pose_det_results:
-            keypoints = res['keypoints']
-            res['keypoints'] = covert_keypoint_definition(
-                keypoints, pose_det_dataset, pose_lift_dataset)
-
-    # load temporal padding config from model.data_cfg
-    if hasattr(pose_lift_model.cfg, 'test_data_cfg'):
-        data_cfg = pose_lift_model.cfg.test_data_cfg
+    if args.streaming:
+        print('Running 2D pose detection and 2D-to-3D pose lifting.')
+        lifted_frames = lift_video_streaming(args, video, person_det_model,
+                                             pose_det_model, pose_lift_model)
     else:
-        data_cfg = pose_lift_model.cfg.data_cfg
-
-    num_instances = args.num_instances
-    for i, pose_det_results in enumerate(
-            mmcv.track_iter_progress(pose_det_results_list)):
-        # extract and pad input pose2d sequence
-        pose_results_2d = extract_pose_sequence(
-            pose_det_results_list,
-            frame_idx=i,
-            causal=data_cfg.causal,
-            seq_len=data_cfg.seq_len,
-            step=data_cfg.seq_frame_interval)
-        # 2D-to-3D pose lifting
-        pose_lift_results = inference_pose_lifter_model(
-            pose_lift_model,
-            pose_results_2d=pose_results_2d,
-            dataset=pose_lift_dataset,
-            with_track_id=True,
-            image_size=video.resolution,
-            norm_pose_2d=args.norm_pose_2d)
+        # First stage: 2D pose detection
+        print('Stage 1: 2D pose detection.')
+        pose_det_results_list = detect_video(args, video, person_det_model,
+                                             pose_det_model, pose_lift_model)
 
-        # Pose processing
-        pose_lift_results_vis = []
-        for idx, res in enumerate(pose_lift_results):
-            keypoints_3d = res['keypoints_3d']
-            # exchange y,z-axis, and then reverse the direction of x,z-axis
-            keypoints_3d = keypoints_3d[..., [0, 2, 1]]
-            keypoints_3d[..., 0] = -keypoints_3d[..., 0]
-            keypoints_3d[..., 2] = -keypoints_3d[..., 2]
-            # rebase height (z-axis)
-            if args.rebase_keypoint_height:
-                keypoints_3d[..., 2] -= np.min(
-                    keypoints_3d[..., 2], axis=-1, keepdims=True)
-            res['keypoints_3d'] = keypoints_3d
-            # add title
-            det_res = pose_det_results[idx]
-            instance_id = det_res['track_id']
-            res['title'] = f'Prediction ({instance_id})'
-            # only visualize the target frame
-            res['keypoints'] = det_res['keypoints']
-            res['bbox'] = det_res['bbox']
-            res['track_id'] = instance_id
-            pose_lift_results_vis.append(res)
+        # Second stage: Pose lifting
+        print('Stage 2: 2D-to-3D pose lifting.')
+        lifted_frames = lift_video(args, video, pose_det_results_list,
+                                   pose_lift_model)
 
+    num_instances = args.num_instances
+    progress = mmcv.track_iter_progress((lifted_frames, len(video)))
+    for img, pose_lift_results, pose_det_results in progress:
         # Visualization
         if num_instances < 0:
-            num_instances = len(pose_lift_results_vis)
-        img_vis = vis_3d_pose_result(
-            pose_lift_model,
-            result=pose_lift_results_vis,
-            img=video[i],
-            out_file=None,
-            radius=args.radius,
-            thickness=args.thickness,
-            num_instances=num_instances)
+            num_instances = len(pose_lift_results)
+        img_vis = vis_pose_lift_results(args, pose_lift_model,
+                                        pose_lift_results, pose_det_results,
+                                        img, num_instances)
 
         if save_out_video:
             if writer is None:
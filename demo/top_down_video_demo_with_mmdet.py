@@ -3,8 +3,9 @@ from argparse import ArgumentParser
 
 import cv2
 
-from mmpose.apis import (inference_top_down_pose_model, init_pose_model,
-                         process_mmdet_results, vis_pose_result)
+from mmpose.apis import (StreamingPipeline, inference_top_down_pose_model,
+                         init_pose_model, process_mmdet_results,
+                         vis_pose_result)
 
 try:
     from mmdet.apis import inference_detector, init_detector
@@ -58,6 +59,11 @@ def main():
         type=int,
         default=1,
         help='Link thickness for visualization')
+    parser.add_argument(
+        '--queue-size',
+        type=int,
+        default=4,
+        help='Maximum number of frames waiting for each processing stage')
 
     assert has_mmdet, 'Please install mmdet to run the demo.'
 
@@ -100,16 +106,23 @@ def main():
     # e.g. use ('backbone', ) to return backbone feature
     output_layer_names = None
 
-    while (cap.isOpened()):
-        flag, img = cap.read()
-        if not flag:
-            break
+    def read_frames():
+        while (cap.isOpened()):
+            flag, img = cap.read()
+            if not flag:
+                break
+            yield img
+
+    def detect(img):
         # test a single image, the resulting box is (x1, y1, x2, y2)
         mmdet_results = inference_detector(det_model, img)
 
         # keep the person class bounding boxes.
         person_results = process_mmdet_results(mmdet_results, args.det_cat_id)
+        return img, person_results
 
+    def estimate_pose(inputs):
+        img, person_results = inputs
         # test a single image, with a list of bboxes.
         pose_results, returned_outputs = inference_top_down_pose_model(
             pose_model,
@@ -120,7 +133,10 @@ def main():
             dataset=dataset,
             return_heatmap=return_heatmap,
             outputs=output_layer_names)
+        return img, pose_results
 
+    def render(inputs):
+        img, pose_results = inputs
         # show the results
         vis_img = vis_pose_result(
             pose_model,
@@ -131,7 +147,12 @@ def main():
             radius=args.radius,
             thickness=args.thickness,
             show=False)
+        return vis_img
 
+    # decode, detect, estimate pose and render the frames in parallel
+    pipeline = StreamingPipeline([detect, estimate_pose, (render, 2)],
+                                 queue_size=args.queue_size)
+    for vis_img in pipeline.run(read_frames()):
         if args.show:
             cv2.imshow('Image', vis_img)
 
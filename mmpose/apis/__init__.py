@@ -1,10 +1,16 @@
 from .inference import (inference_bottom_up_pose_model,
-                        inference_top_down_pose_model, init_pose_model,
+                        inference_top_down_pose_model,
+                        inference_top_down_video_pose_model, init_pose_model,
                         process_mmdet_results, vis_pose_result)
 from .inference_3d import (extract_pose_sequence, inference_interhand_3d_model,
-                           inference_mesh_model, inference_pose_lifter_model,
-                           vis_3d_mesh_result, vis_3d_pose_result)
-from .inference_tracking import get_track_id, vis_pose_tracking_result
+                           inference_mesh_model, inference_pose_lifter_batch,
+                           inference_pose_lifter_model, vis_3d_mesh_result,
+                           vis_3d_pose_result)
+from .inference_3d_streaming import StreamingPoseLifter
+from .inference_batching import TopDownPoseBatcher
+from .inference_streaming import StreamingPipeline
+from .inference_tracking import (PoseTracker, get_track_id,
+                                 vis_pose_tracking_result)
 from .test import multi_gpu_test, single_gpu_test
 from .train import train_model
 
@@ -14,5 +20,8 @@ __all__ = [
     'vis_pose_result', 'get_track_id', 'vis_pose_tracking_result',
     'inference_pose_lifter_model', 'vis_3d_pose_result',
     'inference_interhand_3d_model', 'extract_pose_sequence',
-    'inference_mesh_model', 'vis_3d_mesh_result', 'process_mmdet_results'
+    'inference_mesh_model', 'vis_3d_mesh_result', 'process_mmdet_results',
+    'TopDownPoseBatcher', 'StreamingPipeline',
+    'inference_top_down_video_pose_model', 'PoseTracker',
+    'StreamingPoseLifter', 'inference_pose_lifter_batch'
 ]
@@ -7,10 +7,14 @@ import torch
 from mmcv.parallel import collate, scatter
 from mmcv.runner import load_checkpoint
 
-from mmpose.core.post_processing import oks_nms
-from mmpose.datasets.pipelines import Compose
+from mmpose.core.post_processing import (batched_oks_nms,
+                                         get_affine_transform_batch,
+                                         get_warp_matrix_batch)
+from mmpose.datasets.pipelines import (Collect, Compose, NormalizeTensor,
+                                       TopDownAffine, ToTensor)
 from mmpose.models import build_posenet
 from mmpose.utils.hooks import OutputHook
+from .inference_tracking import _compute_iou
 
 os.environ['KMP_DUPLICATE_LIB_OK'] = 'TRUE'
 
@@ -110,6 +114,38 @@ def _box2cs(cfg, box):
     return center, scale
 
 
+def _box2cs_batch(cfg, boxes):
+    """This encodes a batch of bboxes (x,y,w,h) into (center, scale). It is
+    the vectorized version of :func:`_box2cs`.
+
+    Args:
+        boxes (np.ndarray): Bounding boxes (with scores), shaped (N, 4) or
+            (N, 5). (left, top, width, height, [score])
+
+    Returns:
+        tuple: A tuple containing centers and scales.
+
+        - np.ndarray[float32](N, 2): Centers of the bboxes (x, y).
+        - np.ndarray[float32](N, 2): Scales of the bboxes w & h.
+    """
+
+    boxes = np.asarray(boxes, dtype=np.float64)
+    x, y, w, h = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+    input_size = cfg.data_cfg['image_size']
+    aspect_ratio = input_size[0] / input_size[1]
+    center = np.stack([x + w * 0.5, y + h * 0.5], axis=1).astype(np.float32)
+
+    w, h = (np.where(w < aspect_ratio * h, h * aspect_ratio, w),
+            np.where(w > aspect_ratio * h, w * 1.0 / aspect_ratio, h))
+
+    # pixel std is 200.0
+    scale = np.stack([w / 200.0, h / 200.0], axis=1).astype(np.float32)
+
+    scale = scale * 1.25
+
+    return center, scale
+
+
 class LoadImage:
     """A simple pipeline to load image."""
 
@@ -142,42 +178,128 @@ class LoadImage:
         return results
 
 
-def _inference_single_pose_model(model,
-                                 img_or_path,
-                                 bboxes,
-                                 dataset,
-                                 return_heatmap=False):
-    """Inference human bounding boxes.
+def _get_inference_cache(model):
+    """Get the inference cache attached to a pose model.
 
-    num_bboxes: N
-    num_keypoints: K
+    The cache holds the composed test pipelines and the dataset meta info
+    used by the inference apis, so that they are built once per model rather
+    than once per call. It is reset whenever ``model.cfg`` is replaced.
 
     Args:
         model (nn.Module): The loaded pose model.
-        img_or_path (str | np.ndarray): Image filename or loaded image.
-        bboxes (list | np.ndarray): All bounding boxes (with scores),
+
+    Returns:
+        dict: The inference cache of the model.
+    """
+    inference_cache = getattr(model, '_inference_cache', None)
+    if inference_cache is None or inference_cache['cfg'] is not model.cfg:
+        inference_cache = dict(cfg=model.cfg, top_down={}, bottom_up=None)
+        model._inference_cache = inference_cache
+    return inference_cache
+
+
+def _get_batch_crop_transforms(test_pipeline):
+    """Get the transforms of a top-down test pipeline (after the loading step)
+    if they can be replaced by :func:`_top_down_batch_crop`.
+
+    Args:
+        test_pipeline (:obj:`Compose`): The per-bbox test pipeline.
+
+    Returns:
+        list | None: The transforms ``TopDownAffine``, ``ToTensor``,
+            ``NormalizeTensor`` and ``Collect``, or None if the pipeline
+            consists of other transforms.
+    """
+    transforms = test_pipeline.transforms
+    transform_types = [type(t) for t in transforms]
+    if transform_types != [TopDownAffine, ToTensor, NormalizeTensor, Collect]:
+        return None
+    if list(transforms[-1].keys) != ['img']:
+        return None
+    return transforms
+
+
+def _top_down_batch_crop(cfg, frame, bboxes, dataset, ann_info, transforms):
+    """Prepare the model inputs of all bboxes of a frame at once.
+
+    This is equivalent to running the per-bbox test pipeline
+    (``TopDownAffine``, ``ToTensor``, ``NormalizeTensor`` and ``Collect``)
+    and collating the results. But the affine matrices of all bboxes are
+    computed in one vectorized call, and the crops are warped into a single
+    buffer which is converted and normalized as one NCHW tensor.
+
+    Args:
+        cfg (:obj:`mmcv.Config`): The model config.
+        frame (dict): The loaded frame, containing 'img' and 'image_file'.
+        bboxes (np.ndarray): All bounding boxes (with scores),
             shaped (N, 4) or (N, 5). (left, top, width, height, [score])
-            where N is number of bounding boxes.
         dataset (str): Dataset name.
-        outputs (list[str] | tuple[str]): Names of layers whose output is
-            to be returned, default: None
+        ann_info (dict): The dataset meta info.
+        transforms (list): The transforms returned by
+            :func:`_get_batch_crop_transforms`.
 
     Returns:
-        ndarray[NxKx3]: Predicted pose x, y, score.
-        heatmap[N, K, H, W]: Model output heatmap.
+        dict: The batch data, containing 'img' (torch.Tensor[N, C, H, W])
+            and 'img_metas' (list[dict]).
     """
+    affine, _, normalize, collect = transforms
+    img = frame['img']
+    image_size = ann_info['image_size']
+    img_w, img_h = int(image_size[0]), int(image_size[1])
 
-    cfg = model.cfg
-    device = next(model.parameters()).device
+    centers, scales = _box2cs_batch(cfg, bboxes)
+    rotation = 0
 
-    # build the data pipeline
-    channel_order = cfg.test_pipeline[0].get('channel_order', 'rgb')
-    test_pipeline = [LoadImage(channel_order=channel_order)
-                     ] + cfg.test_pipeline[1:]
-    test_pipeline = Compose(test_pipeline)
+    if affine.use_udp:
+        trans = get_warp_matrix_batch(rotation, centers * 2.0,
+                                      image_size - 1.0, scales * 200.0)
+    else:
+        trans = get_affine_transform_batch(centers, scales, rotation,
+                                           image_size)
+
+    crops = np.empty((len(bboxes), img_h, img_w, img.shape[2]),
+                     dtype=img.dtype)
+    for i in range(len(bboxes)):
+        cv2.warpAffine(
+            img,
+            trans[i], (img_w, img_h),
+            dst=crops[i],
+            flags=cv2.INTER_LINEAR)
+
+    # ToTensor and NormalizeTensor on the whole batch
+    batch_img = torch.from_numpy(crops).permute(0, 3, 1, 2).contiguous()
+    batch_img = batch_img.to(torch.get_default_dtype()).div_(255)
+    mean = batch_img.new_tensor(normalize.mean).view(1, -1, 1, 1)
+    std = batch_img.new_tensor(normalize.std).view(1, -1, 1, 1)
+    batch_img.sub_(mean).div_(std)
+
+    img_metas = []
+    for center, scale, bbox in zip(centers, scales, bboxes):
+        results = {
+            'img': None,
+            'image_file': frame['image_file'],
+            'center': center,
+            'scale': scale,
+            'bbox_score': bbox[4] if len(bbox) == 5 else 1,
+            'bbox_id': 0,
+            'dataset': dataset,
+            'rotation': rotation,
+            'ann_info': ann_info
+        }
+        img_metas.append(collect(results)['img_metas'].data)
 
-    assert len(bboxes[0]) in [4, 5]
+    return {'img': batch_img, 'img_metas': img_metas}
+
+
+def _get_flip_pairs(dataset):
+    """Get the flip pairs of keypoints for a top-down dataset.
+
+    Args:
+        dataset (str): Dataset name.
 
+    Returns:
+        list[list[int]]: Pairs of keypoint indices swapped by flipping.
+    """
     flip_pairs = None
     if dataset in ('TopDownCocoDataset', 'TopDownOCHumanDataset',
                    'AnimalMacaqueDataset'):
@@ -267,14 +389,219 @@ def _inference_single_pose_model(model,
     else:
         raise NotImplementedError()
 
+    return flip_pairs
+
+
+def _inference_single_pose_model(model,
+                                 img_or_path,
+                                 bboxes,
+                                 dataset,
+                                 return_heatmap=False,
+                                 max_batch_size=None,
+                                 output_hook=None):
+    """Inference human bounding boxes.
+
+    num_bboxes: N
+    num_keypoints: K
+
+    Args:
+        model (nn.Module): The loaded pose model.
+        img_or_path (str | np.ndarray): Image filename or loaded image.
+        bboxes (list | np.ndarray): All bounding boxes (with scores),
+            shaped (N, 4) or (N, 5). (left, top, width, height, [score])
+            where N is number of bounding boxes.
+        dataset (str): Dataset name.
+        return_heatmap (bool) : Flag to return heatmap, default: False
+        max_batch_size (int, optional): The maximum number of bounding boxes
+            fed into the model at once. If given, the bounding boxes are
+            processed in chunks of this size, which bounds the peak memory.
+            Default: None, which means all bounding boxes in one batch.
+        output_hook (:obj:`OutputHook`, optional): The hook recording layer
+            outputs. If given, the layer outputs of all chunks are
+            concatenated. Default: None.
+
+    Returns:
+        ndarray[NxKx3]: Predicted pose x, y, score.
+        heatmap[N, K, H, W]: Model output heatmap.
+    """
+
+    device = next(model.parameters()).device
+
+    # load (and colour-convert) the frame once for all bboxes
+    frame = _load_top_down_frame(model, img_or_path, dataset)
+
+    if max_batch_size is None:
+        max_batch_size = len(bboxes)
+    assert max_batch_size > 0
+
+    preds = []
+    output_heatmaps = []
+    layer_outputs = []
+    for start in range(0, len(bboxes), max_batch_size):
+        batch_data = _prepare_top_down_batch(
+            model, frame, bboxes[start:start + max_batch_size], dataset)
+
+        if next(model.parameters()).is_cuda:
+            # scatter not work so just move image to cuda device
+            batch_data['img'] = batch_data['img'].to(device)
+
+        # forward the model
+        with torch.no_grad():
+            result = model(
+                img=batch_data['img'],
+                img_metas=batch_data['img_metas'],
+                return_loss=False,
+                return_heatmap=return_heatmap)
+
+        preds.append(result['preds'])
+        output_heatmaps.append(result['output_heatmap'])
+        if output_hook is not None:
+            layer_outputs.append(output_hook.layer_outputs.copy())
+
+    if len(preds) == 1:
+        return preds[0], output_heatmaps[0]
+
+    # concatenate the results of all chunks
+    if output_hook is not None:
+        output_hook.layer_outputs = _concat_layer_outputs(layer_outputs)
+    output_heatmap = np.concatenate(output_heatmaps) \
+        if return_heatmap else None
+
+    return np.concatenate(preds), output_heatmap
+
+
+def _concat_layer_outputs(layer_outputs):
+    """Concatenate the layer outputs recorded by :obj:`OutputHook` over
+    several batches.
+
+    Args:
+        layer_outputs (list[dict]): The layer outputs of each batch.
+
+    Returns:
+        dict: The concatenated layer outputs.
+    """
+    concat_outputs = {}
+    for name, output in layer_outputs[0].items():
+        outputs = [outputs[name] for outputs in layer_outputs]
+        if isinstance(output, list):
+            concat_outputs[name] = [
+                np.concatenate(out) for out in zip(*outputs)
+            ]
+        else:
+            concat_outputs[name] = np.concatenate(outputs)
+    return concat_outputs
+
+
+def _get_top_down_cache(model, dataset):
+    """Get the cached data pipeline and dataset meta info for top-down
+    inference, which are built on first use.
+
+    Args:
+        model (nn.Module): The loaded pose model.
+        dataset (str): Dataset name.
+
+    Returns:
+        dict: The cached loading transform, per-bbox test pipeline, batch
+            crop transforms and dataset meta info.
+    """
+    cfg = model.cfg
+    inference_cache = _get_inference_cache(model)
+    if dataset not in inference_cache['top_down']:
+        channel_order = cfg.test_pipeline[0].get('channel_order', 'rgb')
+        # The per-bbox pipeline starts after the loading step, since the
+        # frame is loaded only once and shared by all bboxes.
+        test_pipeline = Compose(cfg.test_pipeline[1:])
+        inference_cache['top_down'][dataset] = dict(
+            load_image=LoadImage(channel_order=channel_order),
+            test_pipeline=test_pipeline,
+            batch_crop_transforms=_get_batch_crop_transforms(test_pipeline),
+            ann_info={
+                'image_size': np.array(cfg.data_cfg['image_size']),
+                'num_joints': cfg.data_cfg['num_joints'],
+                'flip_pairs': _get_flip_pairs(dataset)
+            })
+    return inference_cache['top_down'][dataset]
+
+
+def _load_top_down_frame(model, img_or_path, dataset):
+    """Load (and colour-convert) an image for top-down inference.
+
+    Args:
+        model (nn.Module): The loaded pose model.
+        img_or_path (str | np.ndarray): Image filename or loaded image.
+        dataset (str): Dataset name.
+
+    Returns:
+        dict: The loaded frame, containing 'img' and 'image_file'.
+    """
+    load_image = _get_top_down_cache(model, dataset)['load_image']
+    return load_image({'img_or_path': img_or_path})
+
+
+def _prepare_top_down_batch(model, frame, bboxes, dataset):
+    """Prepare the model inputs of bounding boxes in a loaded frame.
+
+    Args:
+        model (nn.Module): The loaded pose model.
+        frame (dict): The frame loaded by :func:`_load_top_down_frame`.
+        bboxes (list | np.ndarray): All bounding boxes (with scores),
+            shaped (N, 4) or (N, 5). (left, top, width, height, [score])
+            where N is number of bounding boxes.
+        dataset (str): Dataset name.
+
+    Returns:
+        dict: The batch data on cpu, containing 'img'
+            (torch.Tensor[N, C, H, W]) and 'img_metas' (list[dict]).
+    """
+    cfg = model.cfg
+
+    assert len(bboxes[0]) in [4, 5]
+
+    top_down_cache = _get_top_down_cache(model, dataset)
+    test_pipeline = top_down_cache['test_pipeline']
+    ann_info = top_down_cache['ann_info']
+    batch_crop_transforms = top_down_cache['batch_crop_transforms']
+
+    if batch_crop_transforms is not None and frame['img'].ndim == 3 \
+            and frame['img'].dtype == np.uint8:
+        # crop and normalize all bboxes at once
+        batch_data = _top_down_batch_crop(cfg, frame, bboxes, dataset,
+                                          ann_info, batch_crop_transforms)
+    else:
+        batch_data = _top_down_collate_bboxes(cfg, frame, bboxes, dataset,
+                                              ann_info, test_pipeline)
+
+    return batch_data
+
+
+def _top_down_collate_bboxes(cfg, frame, bboxes, dataset, ann_info,
+                             test_pipeline):
+    """Run the per-bbox test pipeline on all bboxes of a frame and collate
+    the results.
+
+    Args:
+        cfg (:obj:`mmcv.Config`): The model config.
+        frame (dict): The loaded frame, containing 'img' and 'image_file'.
+        bboxes (np.ndarray): All bounding boxes (with scores),
+            shaped (N, 4) or (N, 5). (left, top, width, height, [score])
+        dataset (str): Dataset name.
+        ann_info (dict): The dataset meta info.
+        test_pipeline (:obj:`Compose`): The per-bbox test pipeline.
+
+    Returns:
+        dict: The batch data, containing 'img' (torch.Tensor[N, C, H, W])
+            and 'img_metas' (list[dict]).
+    """
     batch_data = []
     for bbox in bboxes:
         center, scale = _box2cs(cfg, bbox)
 
         # prepare data
         data = {
-            'img_or_path':
-            img_or_path,
+            'img':
+            frame['img'],
+            'image_file':
+            frame['image_file'],
             'center':
             center,
             'scale':
@@ -291,34 +618,20 @@ def _inference_single_pose_model(model,
             np.zeros((cfg.data_cfg.num_joints, 3), dtype=np.float32),
             'rotation':
             0,
-            'ann_info': {
-                'image_size': np.array(cfg.data_cfg['image_size']),
-                'num_joints': cfg.data_cfg['num_joints'],
-                'flip_pairs': flip_pairs
-            }
+            'ann_info':
+            ann_info
         }
         data = test_pipeline(data)
         batch_data.append(data)
 
     batch_data = collate(batch_data, samples_per_gpu=1)
 
-    if next(model.parameters()).is_cuda:
-        # scatter not work so just move image to cuda device
-        batch_data['img'] = batch_data['img'].to(device)
     # get all img_metas of each bounding box
     batch_data['img_metas'] = [
         img_metas[0] for img_metas in batch_data['img_metas'].data
     ]
 
-    # forward the model
-    with torch.no_grad():
-        result = model(
-            img=batch_data['img'],
-            img_metas=batch_data['img_metas'],
-            return_loss=False,
-            return_heatmap=return_heatmap)
-
-    return result['preds'], result['output_heatmap']
+    return batch_data
 
 
 def inference_top_down_pose_model(model,
@@ -328,7 +641,8 @@ def inference_top_down_pose_model(model,
                                   format='xywh',
                                   dataset='TopDownCocoDataset',
                                   return_heatmap=False,
-                                  outputs=None):
+                                  outputs=None,
+                                  max_batch_size=None):
     """Inference a single image with a list of person bounding boxes.
 
     num_people: P
@@ -353,6 +667,11 @@ def inference_top_down_pose_model(model,
         return_heatmap (bool) : Flag to return heatmap, default: False
         outputs (list(str) | tuple(str)) : Names of layers whose outputs
             need to be returned, default: None
+        max_batch_size (int, optional): The maximum number of bounding boxes
+            fed into the model at once. Frames with more bounding boxes are
+            processed in chunks, so that the peak memory does not grow with
+            the number of people. Default: None, which means all bounding
+            boxes are processed in one batch.
 
     Returns:
         list[dict]: The bbox & pose info,
@@ -401,7 +720,9 @@ def inference_top_down_pose_model(model,
             img_or_path,
             bboxes_xywh,
             dataset,
-            return_heatmap=return_heatmap)
+            return_heatmap=return_heatmap,
+            max_batch_size=max_batch_size,
+            output_hook=h)
 
         if return_heatmap:
             h.layer_outputs['heatmap'] = heatmap
@@ -420,12 +741,216 @@ def inference_top_down_pose_model(model,
     return pose_results, returned_outputs
 
 
+def _propagate_person_results(pose_results, kpt_thr, bbox_scale):
+    """Get the person bounding boxes of the next frame from the keypoints of
+    the current frame.
+
+    Args:
+        pose_results (list[dict]): The pose results of the current frame.
+        kpt_thr (float): Only keypoints with higher scores are used.
+        bbox_scale (float): The scale factor of the bounding box of the
+            keypoints.
+
+    Returns:
+        list[dict]: The person results with 'bbox' in the format of
+            (left, top, right, bottom, [score]). People with less than 2
+            keypoints are dropped.
+    """
+    person_results = []
+    for pose_result in pose_results:
+        keypoints = pose_result['keypoints']
+        keypoints = keypoints[keypoints[:, 2] > kpt_thr, :2]
+        if len(keypoints) < 2:
+            continue
+        x1, y1 = keypoints.min(axis=0)
+        x2, y2 = keypoints.max(axis=0)
+        if x2 - x1 + y2 - y1 <= 0:
+            continue
+        center = np.array([x1 + x2, y1 + y2]) * 0.5
+        size = np.array([x2 - x1, y2 - y1]) * bbox_scale
+        bbox = np.concatenate((center - size * 0.5, center + size * 0.5,
+                               pose_result['bbox'][4:]))
+
+        person_result = pose_result.copy()
+        person_result['bbox'] = bbox
+        person_results.append(person_result)
+    return person_results
+
+
+def _interpolate_pose_results(results_start,
+                              results_end,
+                              num_frames,
+                              iou_thr=0.3):
+    """Linearly interpolate the pose results of the frames between two frames.
+
+    The people of the two frames are matched greedily by the IoU of their
+    bounding boxes, and only the matched people are interpolated.
+
+    Args:
+        results_start (list[dict]): The pose results of the start frame.
+        results_end (list[dict]): The pose results of the end frame.
+        num_frames (int): The number of frames between the two frames.
+        iou_thr (float): The IoU threshold to match the people.
+
+    Returns:
+        list[list[dict]]: The pose results of the frames in between.
+    """
+    pairs = []
+    results_end = list(results_end)
+    for result in results_start:
+        ious = [
+            _compute_iou(result['bbox'], result_end['bbox'])
+            for result_end in results_end
+        ]
+        if len(ious) > 0 and max(ious) > iou_thr:
+            pairs.append((result, results_end.pop(int(np.argmax(ious)))))
+
+    interpolated = []
+    for i in range(1, num_frames + 1):
+        ratio = i / (num_frames + 1)
+        pose_results = []
+        for result_start, result_end in pairs:
+            pose_result = result_start.copy()
+            for key in ('keypoints', 'bbox'):
+                pose_result[key] = (1 - ratio) * result_start[key] + \
+                    ratio * result_end[key]
+            pose_results.append(pose_result)
+        interpolated.append(pose_results)
+    return interpolated
+
+
+def inference_top_down_video_pose_model(model,
+                                        frames,
+                                        detect,
+                                        det_interval=5,
+                                        propagation='crop',
+                                        bbox_thr=None,
+                                        format='xywh',
+                                        dataset='TopDownCocoDataset',
+                                        kpt_thr=0.3,
+                                        bbox_scale=1.2,
+                                        max_batch_size=None):
+    """Inference the frames of a video, running the person detector only on
+    every ``det_interval`` frames.
+
+    The frames on which the detector is run are key frames. The poses on the
+    other frames are propagated from the key frames in one of two ways:
+
+    - 'crop': The people of the previous frame are cropped with the bounding
+      boxes of their keypoints, and only the pose model is run. The frame
+      becomes a key frame if no people are left.
+    - 'interpolate': The poses are linearly interpolated between the people
+      matched on the key frames before and after, without running any model.
+      The last frame is always a key frame, and the results are yielded with
+      a delay of up to ``det_interval`` frames.
+
+    Example:
+        >>> def detect(img):
+        ...     mmdet_results = inference_detector(det_model, img)
+        ...     return process_mmdet_results(mmdet_results)
+        >>> for pose_results in inference_top_down_video_pose_model(
+        ...         pose_model, frames, detect, det_interval=5,
+        ...         bbox_thr=0.3, format='xyxy'):
+        ...     pass
+
+    Args:
+        model (nn.Module): The loaded pose model.
+        frames (Iterable[str | np.ndarray]): The image filenames or loaded
+            images of the frames.
+        detect (callable): The person detector, which takes a frame and
+            returns the person results, the same as the ``person_results``
+            of :func:`inference_top_down_pose_model`.
+        det_interval (int): The interval of the key frames. Default: 5.
+        propagation (str): How the poses are propagated from the key frames
+            ('crop' | 'interpolate'). Default: 'crop'.
+        bbox_thr (float, optional): Threshold for the bounding boxes of the
+            detector. If bbox_thr is None, ignore it. Default: None.
+        format (str): bbox format of the detector ('xyxy' | 'xywh').
+            Default: 'xywh'.
+        dataset (str): Dataset name, e.g. 'TopDownCocoDataset'.
+        kpt_thr (float): Only keypoints with higher scores are used to get
+            the bounding boxes in 'crop' propagation. Default: 0.3.
+        bbox_scale (float): The scale factor of the bounding boxes of the
+            keypoints in 'crop' propagation. Default: 1.2.
+        max_batch_size (int, optional): The maximum number of bounding boxes
+            fed into the model at once. Default: None.
+
+    Yields:
+        list[dict]: The pose results of each frame, in the same form as the
+            first output of :func:`inference_top_down_pose_model`.
+    """
+    assert propagation in ('crop', 'interpolate')
+    assert det_interval > 0
+
+    def inference_key_frame(img_or_path):
+        pose_results, _ = inference_top_down_pose_model(
+            model,
+            img_or_path,
+            detect(img_or_path),
+            bbox_thr=bbox_thr,
+            format=format,
+            dataset=dataset,
+            max_batch_size=max_batch_size)
+        return pose_results
+
+    if propagation == 'crop':
+        pose_results = []
+        num_propagated = det_interval
+        for img_or_path in frames:
+            person_results = []
+            if num_propagated < det_interval:
+                person_results = _propagate_person_results(
+                    pose_results, kpt_thr, bbox_scale)
+
+            if len(person_results) == 0:
+                pose_results = inference_key_frame(img_or_path)
+                num_propagated = 1
+            else:
+                pose_results, _ = inference_top_down_pose_model(
+                    model,
+                    img_or_path,
+                    person_results,
+                    format='xyxy',
+                    dataset=dataset,
+                    max_batch_size=max_batch_size)
+                num_propagated += 1
+            yield pose_results
+    else:
+        pose_results = None
+        num_skipped = 0
+        for frame_id, img_or_path in enumerate(frames):
+            if frame_id % det_interval > 0:
+                num_skipped += 1
+                last_frame = img_or_path
+                continue
+
+            results_end = inference_key_frame(img_or_path)
+            if pose_results is not None:
+                yield from _interpolate_pose_results(pose_results, results_end,
+                                                     num_skipped)
+            yield results_end
+            pose_results = results_end
+            num_skipped = 0
+
+        if num_skipped > 0:
+            # the last frame is a key frame
+            results_end = inference_key_frame(last_frame)
+            yield from _interpolate_pose_results(pose_results, results_end,
+                                                 num_skipped - 1)
+            yield results_end
+
+
 def inference_bottom_up_pose_model(model,
                                    img_or_path,
                                    pose_nms_thr=0.9,
                                    return_heatmap=False,
-                                   outputs=None):
-    """Inference a single image.
+                                   outputs=None,
+                                   max_batch_size=None):
+    """Inference a single image or a list of images.
+
+    The images in a list are run in batches, where the images are padded to
+    the same size at the bottom and the right, and the people in each image
+    are grouped separately.
 
     num_people: P
     num_keypoints: K
@@ -434,84 +959,128 @@ def inference_bottom_up_pose_model(model,
 
     Args:
         model (nn.Module): The loaded pose model.
-        img_or_path (str| np.ndarray): Image filename or loaded image.
+        img_or_path (str | np.ndarray | list[str | np.ndarray]): Image
+            filename or loaded image, or a list of them.
         pose_nms_thr (float): retain oks overlap < pose_nms_thr, default: 0.9.
         return_heatmap (bool) : Flag to return heatmap, default: False.
         outputs (list(str) | tuple(str)) : Names of layers whose outputs
             need to be returned, default: None.
+        max_batch_size (int, optional): The maximum number of images in a
+            batch when a list of images is given. If None, all the images
+            are run as one batch. Default: None.
 
     Returns:
         list[ndarray]: The predicted pose info.
             The length of the list is the number of people (P).
             Each item in the list is a ndarray, containing each person's
             pose (ndarray[Kx3]): x, y, score.
+            If a list of images is given, a list of the predicted pose info
+            of each image is returned.
         list[dict[np.ndarray[N, K, H, W] | torch.tensor[N, K, H, W]]]:
             Output feature maps from layers specified in `outputs`.
-            Includes 'heatmap' if `return_heatmap` is True.
+            Includes 'heatmap' if `return_heatmap` is True. There is one
+            item for each batch.
     """
-    pose_results = []
+    is_batch = isinstance(img_or_path, (list, tuple))
+    imgs_or_paths = img_or_path if is_batch else [img_or_path]
+
+    pose_results_list = []
     returned_outputs = []
 
     cfg = model.cfg
     device = next(model.parameters()).device
 
-    # build the data pipeline
-    channel_order = cfg.test_pipeline[0].get('channel_order', 'rgb')
-    test_pipeline = [LoadImage(channel_order=channel_order)
-                     ] + cfg.test_pipeline[1:]
-    test_pipeline = Compose(test_pipeline)
-
-    # prepare data
-    data = {
-        'img_or_path': img_or_path,
-        'dataset': 'coco',
-        'ann_info': {
-            'image_size':
-            cfg.data_cfg['image_size'],
-            'num_joints':
-            cfg.data_cfg['num_joints'],
-            'flip_index':
-            [0, 2, 1, 4, 3, 6, 5, 8, 7, 10, 9, 12, 11, 14, 13, 16, 15],
-        }
-    }
-
-    data = test_pipeline(data)
-    data = collate([data], samples_per_gpu=1)
-    if next(model.parameters()).is_cuda:
-        # scatter to specified GPU
-        data = scatter(data, [device])[0]
-    else:
-        # just get the actual data from DataContainer
-        data['img_metas'] = data['img_metas'].data[0]
-
-    with OutputHook(model, outputs=outputs, as_tensor=False) as h:
-        # forward the model
-        with torch.no_grad():
-            result = model(
-                img=data['img'],
-                img_metas=data['img_metas'],
-                return_loss=False,
-                return_heatmap=return_heatmap)
-
-        if return_heatmap:
-            h.layer_outputs['heatmap'] = result['output_heatmap']
+    # the data pipeline and dataset meta info are built once per model
+    inference_cache = _get_inference_cache(model)
+    if inference_cache['bottom_up'] is None:
+        channel_order = cfg.test_pipeline[0].get('channel_order', 'rgb')
+        test_pipeline = [LoadImage(channel_order=channel_order)
+                         ] + cfg.test_pipeline[1:]
+        inference_cache['bottom_up'] = dict(
+            test_pipeline=Compose(test_pipeline),
+            ann_info={
+                'image_size':
+                cfg.data_cfg['image_size'],
+                'num_joints':
+                cfg.data_cfg['num_joints'],
+                'flip_index':
+                [0, 2, 1, 4, 3, 6, 5, 8, 7, 10, 9, 12, 11, 14, 13, 16, 15],
+            })
+    test_pipeline = inference_cache['bottom_up']['test_pipeline']
 
-        returned_outputs.append(h.layer_outputs)
+    if max_batch_size is None:
+        max_batch_size = len(imgs_or_paths)
+    assert max_batch_size > 0
 
-        for idx, pred in enumerate(result['preds']):
-            area = (np.max(pred[:, 0]) - np.min(pred[:, 0])) * (
-                np.max(pred[:, 1]) - np.min(pred[:, 1]))
-            pose_results.append({
-                'keypoints': pred[:, :3],
-                'score': result['scores'][idx],
-                'area': area,
+    for start in range(0, len(imgs_or_paths), max_batch_size):
+        # prepare data
+        batch_data = []
+        for _img_or_path in imgs_or_paths[start:start + max_batch_size]:
+            data = {
+                'img_or_path': _img_or_path,
+                'dataset': 'coco',
+                # the pipeline adds per-image items to 'ann_info', so the
+                # cached meta info is copied rather than shared
+                'ann_info': inference_cache['bottom_up']['ann_info'].copy()
+            }
+            batch_data.append(test_pipeline(data))
+
+        # the images of different sizes are padded at the bottom and the
+        # right to be stacked, which are only used for the batch size and
+        # the device, while the model takes the resized images in the metas
+        img_h = max(data['img'].shape[0] for data in batch_data)
+        img_w = max(data['img'].shape[1] for data in batch_data)
+        for data in batch_data:
+            data['img'] = mmcv.impad(data['img'], shape=(img_h, img_w))
+
+        batch_data = collate(batch_data, samples_per_gpu=len(batch_data))
+        if next(model.parameters()).is_cuda:
+            # scatter to specified GPU
+            batch_data = scatter(batch_data, [device])[0]
+        else:
+            # just get the actual data from DataContainer
+            batch_data['img_metas'] = batch_data['img_metas'].data[0]
+
+        with OutputHook(model, outputs=outputs, as_tensor=False) as h:
+            # forward the model
+            with torch.no_grad():
+                result = model(
+                    img=batch_data['img'],
+                    img_metas=batch_data['img_metas'],
+                    return_loss=False,
+                    return_heatmap=return_heatmap)
+
+            if return_heatmap:
+                h.layer_outputs['heatmap'] = result['output_heatmap']
+
+            returned_outputs.append(h.layer_outputs)
+
+        offsets = np.cumsum([0] + result['num_people'])
+        if offsets[-1] > 0:
+            preds = np.stack(result['preds'])[..., :3]
+            scores = np.array(result['scores'])
+        else:
+            preds = np.zeros((0, cfg.data_cfg['num_joints'], 3))
+            scores = np.zeros(0)
+        areas = (preds[..., 0].max(axis=1) - preds[..., 0].min(axis=1)) * (
+            preds[..., 1].max(axis=1) - preds[..., 1].min(axis=1))
+
+        # pose nms of the people in each image
+        keep = batched_oks_nms(preds, scores, areas, offsets, pose_nms_thr)
+        image_inds = np.searchsorted(offsets, keep, side='right') - 1
+
+        pose_results = [[] for _ in result['num_people']]
+        for idx, image_idx in zip(keep, image_inds):
+            pose_results[image_idx].append({
+                'keypoints': preds[idx],
+                'score': scores[idx],
+                'area': areas[idx],
             })
+        pose_results_list.extend(pose_results)
 
-        # pose nms
-        keep = oks_nms(pose_results, pose_nms_thr, sigmas=None)
-        pose_results = [pose_results[_keep] for _keep in keep]
-
-    return pose_results, returned_outputs
+    if not is_batch:
+        return pose_results_list[0], returned_outputs
+    return pose_results_list, returned_outputs
 
 
 def vis_pose_result(model,
@@ -1,6 +1,6 @@
 import numpy as np
 import torch
-from mmcv.parallel import collate, scatter
+from mmcv.parallel import collate
 
 from mmpose.datasets.pipelines import Compose
 from .inference import LoadImage, _box2cs, _xywh2xyxy, _xyxy2xywh
@@ -154,6 +154,14 @@ def _collate_pose_sequence(pose_results, with_track_id=True, target_frame=-1):
     track_ids = None
     if with_track_id:
         track_ids = [res['track_id'] for res in pose_results[target_frame]]
+        # index the keypoints in each frame by track id, where the first
+        # person of a track id is kept
+        track_keypoints = []
+        for frame in pose_results:
+            frame_keypoints = {}
+            for res in reversed(frame):
+                frame_keypoints[res['track_id']] = res['keypoints']
+            track_keypoints.append(frame_keypoints)
 
     pose_sequences = []
     for idx in range(N):
@@ -172,34 +180,227 @@ def _collate_pose_sequence(pose_results, with_track_id=True, target_frame=-1):
                 'keypoints']
             # find the left most frame containing track_ids[idx]
             for frame_idx in range(target_frame - 1, -1, -1):
-                contains_idx = False
-                for res in pose_results[frame_idx]:
-                    if res['track_id'] == track_ids[idx]:
-                        keypoints[frame_idx] = res['keypoints']
-                        contains_idx = True
-                        break
-                if not contains_idx:
+                if track_ids[idx] not in track_keypoints[frame_idx]:
                     # replicate the left most frame
                     keypoints[:frame_idx + 1] = keypoints[frame_idx + 1]
                     break
+                keypoints[frame_idx] = track_keypoints[frame_idx][
+                    track_ids[idx]]
             # find the right most frame containing track_idx[idx]
             for frame_idx in range(target_frame + 1, T):
-                contains_idx = False
-                for res in pose_results[frame_idx]:
-                    if res['track_id'] == track_ids[idx]:
-                        keypoints[frame_idx] = res['keypoints']
-                        contains_idx = True
-                        break
-                if not contains_idx:
+                if track_ids[idx] not in track_keypoints[frame_idx]:
                     # replicate the right most frame
-                    keypoints[frame_idx + 1:] = keypoints[frame_idx]
+                    keypoints[frame_idx:] = keypoints[frame_idx - 1]
                     break
+                keypoints[frame_idx] = track_keypoints[frame_idx][
+                    track_ids[idx]]
             pose_seq['keypoints'] = keypoints
         pose_sequences.append(pose_seq)
 
     return pose_sequences
 
 
+def _get_pose_lifter_dataset_info(dataset):
+    """Get the flip pairs and the average bbox of a pose lifting dataset.
+
+    Args:
+        dataset (str): Dataset name, e.g. 'Body3DH36MDataset'
+
+    Returns:
+        list: The flip pairs of the keypoints.
+        ndarray[1, 2]: The average center coordinate of the bboxes.
+        int|float: The average scale of the bboxes.
+    """
+    if dataset == 'Body3DH36MDataset':
+        flip_pairs = [[1, 4], [2, 5], [3, 6], [11, 14], [12, 15], [13, 16]]
+        bbox_center = np.array([[528, 427]], dtype=np.float32)
+        bbox_scale = 400
+    else:
+        raise NotImplementedError()
+    return flip_pairs, bbox_center, bbox_scale
+
+
+def _normalize_pose_2d(keypoints, bbox_centers, bbox_scales, bbox_center,
+                       bbox_scale):
+    """Scale the bboxes (along with the 2D poses) to bbox_scale, and move the
+    bboxes (along with the 2D poses) to bbox_center.
+
+    Args:
+        keypoints (ndarray[..., K, 2 or 3]): The 2D poses: x, y, [score]
+        bbox_centers (ndarray[..., 2]): The centers of the bboxes.
+        bbox_scales (ndarray[...]): The scales of the bboxes, i.e. the
+            longer sides of the bboxes.
+        bbox_center (ndarray[1, 2]): x, y. The average center coordinate of the
+            bboxes in the dataset.
+        bbox_scale (int|float): The average scale of the bboxes in the dataset.
+
+    Returns:
+        ndarray[..., K, 2 or 3]: The normalized 2D poses.
+    """
+    bbox_centers = np.asarray(bbox_centers)[..., None, :]
+    bbox_scales = np.asarray(bbox_scales)[..., None, None]
+    coords = (keypoints[..., :2] - bbox_centers) / bbox_scales * bbox_scale \
+        + bbox_center
+    return np.concatenate((coords, keypoints[..., 2:]), axis=-1)
+
+
+def _prepare_pose_lifter_data(pose_2d,
+                              test_pipeline,
+                              flip_pairs,
+                              image_size=None):
+    """Prepare the data of a 2D pose sequence for pose lifter model.
+
+    Args:
+        pose_2d (ndarray[T, K, 2 or 3]): The 2D pose sequence: x, y, [score]
+        test_pipeline (Compose): The test pipeline of the model.
+        flip_pairs (list): The flip pairs of the keypoints.
+        image_size (Tuple|List): image width, image height. If None, image
+            size will not be contained in the data.
+
+    Returns:
+        dict: The data processed by the test pipeline.
+    """
+    pose_2d = pose_2d.astype(np.float32)
+    T, K, C = pose_2d.shape
+
+    input_2d = pose_2d[..., :2]
+    input_2d_visible = pose_2d[..., 2:3]
+    if C > 2:
+        input_2d_visible = pose_2d[..., 2:3]
+    else:
+        input_2d_visible = np.ones((T, K, 1), dtype=np.float32)
+
+    # Dummy 3D input
+    # This is for compatibility with configs in mmpose<=v0.14.0, where a
+    # 3D input is required to generate denormalization parameters. This
+    # part will be removed in the future.
+    target = np.zeros((K, 3), dtype=np.float32)
+    target_visible = np.ones((K, 1), dtype=np.float32)
+
+    # Dummy image path
+    # This is for compatibility with configs in mmpose<=v0.14.0, where
+    # target_image_path is required. This part will be removed in the
+    # future.
+    target_image_path = None
+
+    data = {
+        'input_2d': input_2d,
+        'input_2d_visible': input_2d_visible,
+        'target': target,
+        'target_visible': target_visible,
+        'target_image_path': target_image_path,
+        'ann_info': {
+            'num_joints': K,
+            'flip_pairs': flip_pairs
+        }
+    }
+
+    if image_size is not None:
+        assert len(image_size) == 2
+        data['image_width'] = image_size[0]
+        data['image_height'] = image_size[1]
+
+    return test_pipeline(data)
+
+
+def _prepare_pose_lifter_batch(pose_2d,
+                               test_pipeline,
+                               flip_pairs,
+                               image_size=None):
+    """Prepare a batch of 2D pose sequences for pose lifter model.
+
+    The test pipeline is applied once to the frames of all the sequences,
+    as the transforms of the 2D poses in the test pipelines of pose lifter
+    models work frame by frame.
+
+    Args:
+        pose_2d (ndarray[N, T, K, 2 or 3]): The 2D pose sequences.
+        test_pipeline (Compose): The test pipeline of the model.
+        flip_pairs (list): The flip pairs of the keypoints.
+        image_size (Tuple|List): image width, image height. If None, image
+            size will not be contained in the data.
+
+    Returns:
+        torch.Tensor[N, K*C, T]: The input of the model.
+        list(dict): The metas of the sequences.
+    """
+    N, T, K, C = pose_2d.shape
+    data = _prepare_pose_lifter_data(
+        pose_2d.reshape(N * T, K, C), test_pipeline, flip_pairs, image_size)
+    input = data['input'].reshape(-1, N, T).transpose(0, 1).contiguous()
+    metas = [data['metas'].data] * N
+    return input, metas
+
+
+def _add_dummy_score(poses_3d):
+    """Add a dummy score to the predicted 3D poses if they have none."""
+    if poses_3d.shape[-1] != 4:
+        assert poses_3d.shape[-1] == 3
+        dummy_score = np.ones(
+            poses_3d.shape[:-1] + (1, ), dtype=poses_3d.dtype)
+        poses_3d = np.concatenate((poses_3d, dummy_score), axis=-1)
+    return poses_3d
+
+
+def inference_pose_lifter_batch(model,
+                                keypoints,
+                                dataset,
+                                bbox_centers=None,
+                                bbox_scales=None,
+                                image_size=None):
+    """Inference 3D poses from a batch of 2D pose sequences using a pose
+    lifter model.
+
+    The 2D pose sequences of all the people are given as one array, so the
+    normalization of the 2D poses and the test pipeline are applied to all of
+    them at once, and the model is run once for the whole batch.
+
+    Notes:
+        N: The number of the pose sequences
+        T: The temporal length of the pose sequences
+        K: The number of the keypoints
+
+    Args:
+        model (nn.Module): The loaded pose lifter model
+        keypoints (ndarray[N, T, K, 2 or 3]): The 2D pose sequences:
+            x, y, [score]
+        dataset (str): Dataset name, e.g. 'Body3DH36MDataset'
+        bbox_centers (ndarray[N, T, 2], optional): The bbox centers of the 2D
+            poses. If given along with ``bbox_scales``, scale the bbox (along
+            with the 2D pose) to the average bbox scale of the dataset, and
+            move the bbox (along with the 2D pose) to the average bbox center
+            of the dataset. Default: None.
+        bbox_scales (ndarray[N, T], optional): The bbox scales of the 2D
+            poses, i.e. the longer sides of the bboxes. Default: None.
+        image_size (Tuple|List): image width, image height. If None, image size
+            will not be contained in dict ``data``.
+
+    Returns:
+        ndarray[N, K, 4]: The predicted 3D poses of the target frames, which
+            are the last frames if the model is causal, or the middle frames
+            otherwise: x, y, z, score.
+    """
+    test_pipeline = Compose(model.cfg.test_pipeline)
+    flip_pairs, bbox_center, bbox_scale = _get_pose_lifter_dataset_info(
+        dataset)
+
+    keypoints = np.asarray(keypoints)
+    if bbox_centers is not None:
+        assert bbox_scales is not None
+        keypoints = _normalize_pose_2d(keypoints, bbox_centers, bbox_scales,
+                                       bbox_center, bbox_scale)
+    keypoints = keypoints.astype(np.float32)
+
+    input, metas = _prepare_pose_lifter_batch(keypoints, test_pipeline,
+                                              flip_pairs, image_size)
+    device = next(model.parameters()).device
+
+    with torch.no_grad():
+        result = model(input=input.to(device), metas=metas, return_loss=False)
+
+    return _add_dummy_score(result['preds'])
+
+
 def inference_pose_lifter_model(model,
                                 pose_results_2d,
                                 dataset,
@@ -237,16 +438,7 @@ def inference_pose_lifter_model(model,
             - "track_id" (int): from the last frame in ``pose_results_2d``.
             If there is no valid instance, an empty list will be returned.
     """
-    cfg = model.cfg
-    test_pipeline = Compose(cfg.test_pipeline)
-
-    flip_pairs = None
-    if dataset == 'Body3DH36MDataset':
-        flip_pairs = [[1, 4], [2, 5], [3, 6], [11, 14], [12, 15], [13, 16]]
-        bbox_center = np.array([[528, 427]], dtype=np.float32)
-        bbox_scale = 400
-    else:
-        raise NotImplementedError()
+    _, bbox_center, bbox_scale = _get_pose_lifter_dataset_info(dataset)
 
     target_idx = -1 if model.causal else len(pose_results_2d) // 2
     pose_lifter_inputs = _gather_pose_lifter_inputs(pose_results_2d,
@@ -258,70 +450,12 @@ def inference_pose_lifter_model(model,
     if not pose_sequences_2d:
         return []
 
-    batch_data = []
-    for seq in pose_sequences_2d:
-        pose_2d = seq['keypoints'].astype(np.float32)
-        T, K, C = pose_2d.shape
-
-        input_2d = pose_2d[..., :2]
-        input_2d_visible = pose_2d[..., 2:3]
-        if C > 2:
-            input_2d_visible = pose_2d[..., 2:3]
-        else:
-            input_2d_visible = np.ones((T, K, 1), dtype=np.float32)
-
-        # Dummy 3D input
-        # This is for compatibility with configs in mmpose<=v0.14.0, where a
-        # 3D input is required to generate denormalization parameters. This
-        # part will be removed in the future.
-        target = np.zeros((K, 3), dtype=np.float32)
-        target_visible = np.ones((K, 1), dtype=np.float32)
-
-        # Dummy image path
-        # This is for compatibility with configs in mmpose<=v0.14.0, where
-        # target_image_path is required. This part will be removed in the
-        # future.
-        target_image_path = None
-
-        data = {
-            'input_2d': input_2d,
-            'input_2d_visible': input_2d_visible,
-            'target': target,
-            'target_visible': target_visible,
-            'target_image_path': target_image_path,
-            'ann_info': {
-                'num_joints': K,
-                'flip_pairs': flip_pairs
-            }
-        }
-
-        if image_size is not None:
-            assert len(image_size) == 2
-            data['image_width'] = image_size[0]
-            data['image_height'] = image_size[1]
-
-        data = test_pipeline(data)
-        batch_data.append(data)
+    poses_3d = inference_pose_lifter_batch(
+        model,
+        np.stack([seq['keypoints'] for seq in pose_sequences_2d]),
+        dataset,
+        image_size=image_size)
 
-    batch_data = collate(batch_data, samples_per_gpu=len(batch_data))
-    if next(model.parameters()).is_cuda:
-        device = next(model.parameters()).device
-        batch_data = scatter(batch_data, target_gpus=[device.index])[0]
-    else:
-        batch_data = scatter(batch_data, target_gpus=[-1])[0]
-
-    with torch.no_grad():
-        result = model(
-            input=batch_data['input'],
-            metas=batch_data['metas'],
-            return_loss=False)
-
-    poses_3d = result['preds']
-    if poses_3d.shape[-1] != 4:
-        assert poses_3d.shape[-1] == 3
-        dummy_score = np.ones(
-            poses_3d.shape[:-1] + (1, ), dtype=poses_3d.dtype)
-        poses_3d = np.concatenate((poses_3d, dummy_score), axis=-1)
     pose_results = []
     for pose_2d, pose_3d in zip(pose_sequences_2d, poses_3d):
         pose_result = pose_2d.copy()
@@ -0,0 +1,298 @@
+from collections import deque
+
+import numpy as np
+import torch
+
+from mmpose.datasets.pipelines import Compose
+from .inference_3d import (_add_dummy_score, _get_pose_lifter_dataset_info,
+                           _normalize_pose_2d, _prepare_pose_lifter_batch)
+
+
+class _PoseRun:
+    """The consecutive frames of a track, whose 2D poses are kept in a ring
+    buffer.
+
+    Args:
+        frame_idx (int): The index of the first frame of the run.
+        buffer_size (int): The number of the last frames to keep.
+    """
+
+    def __init__(self, frame_idx, buffer_size):
+        self.start = frame_idx
+        self.end = frame_idx - 1
+        self.buffer_size = buffer_size
+        self.buffer = None
+
+        # the state of the incremental steps of the model
+        self.cache = None
+        self.num_steps = 0
+        self.outputs = {}
+
+    def append(self, keypoints):
+        """Append the 2D pose of the next frame."""
+        if self.buffer is None:
+            self.buffer = np.zeros(
+                (self.buffer_size, ) + keypoints.shape, dtype=np.float32)
+        self.end += 1
+        self.buffer[self.end % self.buffer_size] = keypoints
+
+    def get_sequence(self, frame_idx, frames_left, frames_right, step):
+        """Get the pose sequence around a frame of the run, which is padded by
+        replicating the first and the last frames of the run."""
+        offsets = np.arange(-frames_left, frames_right + 1)
+        offsets = np.clip(offsets, -((frame_idx - self.start) // step),
+                          (self.end - frame_idx) // step)
+        return self.buffer[(frame_idx + offsets * step) % self.buffer_size]
+
+
+class StreamingPoseLifter:
+    """Lift the 2D poses of a video to 3D frame by frame.
+
+    The 2D pose results are fed frame by frame. Each track keeps the 2D poses
+    of its last frames in a ring buffer, so the pose sequence of a person is
+    sliced from its buffer instead of being searched for in the results of
+    all the frames. If the backbone supports ``forward_step`` (e.g.
+    :class:`TCN` of VideoPose3D), the activations of the previous frames are
+    cached as well, so each new frame takes one incremental step of the model
+    instead of a forward pass over the whole sequence.
+
+    The pose sequences are padded in the same way as
+    :func:`extract_pose_sequence` and :func:`inference_pose_lifter_model`
+    with ``with_track_id=True``, i.e. a sequence is made of the consecutive
+    frames where the track is found, and is padded by replicating its first
+    and last frames. If the model is not causal, the 3D poses of a frame are
+    returned after the 2D poses of the following ``(seq_len - 1) // 2``
+    frames are fed, and the frames at the end of the video are returned by
+    :meth:`flush`.
+
+    Example:
+        >>> lifter = StreamingPoseLifter(
+        ...     pose_lift_model, image_size=video.resolution)
+        >>> for pose_det_results in pose_det_results_stream:
+        ...     for frame_idx, pose_lift_results in lifter.update(
+        ...             pose_det_results):
+        ...         show(frame_idx, pose_lift_results)
+        >>> for frame_idx, pose_lift_results in lifter.flush():
+        ...     show(frame_idx, pose_lift_results)
+
+    Args:
+        model (nn.Module): The loaded pose lifter model.
+        dataset (str): Dataset name, e.g. 'Body3DH36MDataset'
+        image_size (Tuple|List): image width, image height. If None, image size
+            will not be contained in dict ``data``.
+        norm_pose_2d (bool): If True, scale the bbox (along with the 2D
+            pose) to the average bbox scale of the dataset, and move the bbox
+            (along with the 2D pose) to the average bbox center of the dataset.
+        use_cache (bool): If True, cache the activations of the model when
+            its backbone supports ``forward_step``. Otherwise, the model is
+            run on the whole pose sequence of each person. Default: True.
+    """
+
+    def __init__(self,
+                 model,
+                 dataset='Body3DH36MDataset',
+                 image_size=None,
+                 norm_pose_2d=False,
+                 use_cache=True):
+        self.model = model
+        self.image_size = image_size
+        self.norm_pose_2d = norm_pose_2d
+
+        cfg = model.cfg
+        self.test_pipeline = Compose(cfg.test_pipeline)
+        self.flip_pairs, self.bbox_center, self.bbox_scale = \
+            _get_pose_lifter_dataset_info(dataset)
+
+        # load temporal padding config from model.data_cfg
+        if hasattr(cfg, 'test_data_cfg'):
+            data_cfg = cfg.test_data_cfg
+        else:
+            data_cfg = cfg.data_cfg
+        if data_cfg.causal:
+            self.frames_left = data_cfg.seq_len - 1
+            self.frames_right = 0
+        else:
+            self.frames_left = (data_cfg.seq_len - 1) // 2
+            self.frames_right = self.frames_left
+        self.step = data_cfg.seq_frame_interval
+        self.buffer_size = (self.frames_left + self.frames_right) * \
+            self.step + 1
+
+        # the incremental steps take every frame of the sequences, and their
+        # output is the prediction of the whole receptive field
+        self.use_cache = use_cache and self.step == 1 and \
+            model.with_keypoint and not model.with_traj and \
+            hasattr(model.backbone, 'forward_step') and \
+            model.backbone.receptive_field == \
+            self.frames_left + self.frames_right + 1
+
+        self.reset()
+
+    def reset(self):
+        """Reset the state to lift a new video."""
+        self.frame_idx = -1
+        self.runs = {}
+        self.pending = deque()
+
+    def update(self, pose_results):
+        """Feed the 2D pose results of the next frame.
+
+        Args:
+            pose_results (List[dict]): The 2D pose results of the frame. Each
+                element is the 2D pose of one person, which contains:
+                - "keypoints" (ndarray[K, 2 or 3]): x, y, [score]
+                - "track_id" (int)
+                - "bbox" ((4, ) or (5, )): required when ``norm_pose_2d`` is
+                    True
+
+        Returns:
+            List[tuple(int, List[dict])]: The frames whose 3D poses are ready,
+                in the form of (frame index, 3D pose results). The 3D pose
+                result of a person is a copy of its 2D pose result of the
+                frame, with the predicted 3D pose added as "keypoints_3d"
+                (ndarray[K, 4]).
+        """
+        self.frame_idx += 1
+        frame_idx = self.frame_idx
+
+        if len(pose_results) > 0:
+            keypoints = np.stack([res['keypoints'] for res in pose_results])
+            if self.norm_pose_2d:
+                bboxes = np.array([res['bbox'][:4] for res in pose_results])
+                centers = (bboxes[:, :2] + bboxes[:, 2:]) / 2
+                scales = (bboxes[:, 2:] - bboxes[:, :2]).max(axis=1)
+                keypoints = _normalize_pose_2d(keypoints, centers, scales,
+                                               self.bbox_center,
+                                               self.bbox_scale)
+
+        runs = {}
+        targets = []
+        ended = []
+        for i, res in enumerate(pose_results):
+            track_id = res['track_id']
+            if track_id in runs:
+                # duplicated track ids in a frame
+                run = _PoseRun(frame_idx, self.buffer_size)
+                ended.append(run)
+            else:
+                run = self.runs.pop(track_id, None)
+                if run is None:
+                    run = _PoseRun(frame_idx, self.buffer_size)
+                runs[track_id] = run
+            run.append(keypoints[i])
+            targets.append((res, run))
+        # the tracks which are lost in the frame
+        ended.extend(self.runs.values())
+        self.runs = runs
+
+        if self.use_cache:
+            if len(targets) > 0:
+                self._step([run for _, run in targets], keypoints)
+            self._finish_runs(ended)
+
+        self.pending.append((frame_idx, targets))
+        return self._pop_results(frame_idx - self.frames_right * self.step)
+
+    def flush(self):
+        """Finish the video, and return the frames whose 3D poses are not
+        returned yet.
+
+        Returns:
+            List[tuple(int, List[dict])]: See :meth:`update`.
+        """
+        if self.use_cache:
+            self._finish_runs(list(self.runs.values()))
+        self.runs = {}
+        return self._pop_results(self.frame_idx)
+
+    def _prepare_input(self, pose_2d):
+        """Prepare the input of the model from the 2D pose sequences."""
+        input, metas = _prepare_pose_lifter_batch(
+            pose_2d.astype(np.float32), self.test_pipeline, self.flip_pairs,
+            self.image_size)
+        device = next(self.model.parameters()).device
+        return input.to(device), metas
+
+    def _step(self, runs, keypoints):
+        """Run an incremental step of the model on the runs, with the 2D
+        poses of their new frames."""
+        input, metas = self._prepare_input(keypoints[:, None])
+
+        # the new runs start from their first frame, while the others
+        # continue with their caches
+        new_idx = [i for i, run in enumerate(runs) if run.cache is None]
+        cached_idx = [i for i, run in enumerate(runs) if run.cache is not None]
+        for idx in (new_idx, cached_idx):
+            if len(idx) == 0:
+                continue
+            cache = None
+            if runs[idx[0]].cache is not None:
+                cache = [
+                    torch.cat([runs[i].cache[j] for i in idx])
+                    for j in range(len(runs[idx[0]].cache))
+                ]
+            with torch.no_grad():
+                result, cache = self.model.forward_step(
+                    input[idx], [metas[i] for i in idx], cache)
+            poses_3d = _add_dummy_score(result['preds'])
+
+            for k, i in enumerate(idx):
+                run = runs[i]
+                run.cache = [c[k:k + 1] for c in cache]
+                # the prediction is delayed by the frames on the right
+                target = run.start + run.num_steps - self.frames_right
+                run.num_steps += 1
+                if target >= run.start:
+                    run.outputs[target] = poses_3d[k]
+
+    def _finish_runs(self, runs):
+        """Pad the ended runs with their last frames to predict their last
+        frames."""
+        if len(runs) == 0:
+            return
+        keypoints = np.stack(
+            [run.buffer[run.end % self.buffer_size] for run in runs])
+        for _ in range(self.frames_right):
+            self._step(runs, keypoints)
+        for run in runs:
+            run.cache = None
+
+    def _pop_results(self, last_frame_idx):
+        """Get the 3D poses of the pending frames up to ``last_frame_idx``."""
+        frames = []
+        while len(self.pending) > 0 and self.pending[0][0] <= last_frame_idx:
+            frames.append(self.pending.popleft())
+
+        if self.use_cache:
+            poses_3d = [
+                run.outputs.pop(frame_idx) for frame_idx, targets in frames
+                for _, run in targets
+            ]
+        else:
+            poses_3d = self._lift([
+                run.get_sequence(frame_idx, self.frames_left,
+                                 self.frames_right, self.step)
+                for frame_idx, targets in frames for _, run in targets
+            ])
+
+        results = []
+        i = 0
+        for frame_idx, targets in frames:
+            pose_results = []
+            for res, _ in targets:
+                pose_result = res.copy()
+                pose_result['keypoints_3d'] = poses_3d[i]
+                pose_results.append(pose_result)
+                i += 1
+            results.append((frame_idx, pose_results))
+        return results
+
+    def _lift(self, pose_sequences_2d):
+        """Run the model on the whole pose sequences."""
+        if len(pose_sequences_2d) == 0:
+            return []
+
+        input, metas = self._prepare_input(np.stack(pose_sequences_2d))
+        with torch.no_grad():
+            result = self.model(input=input, metas=metas, return_loss=False)
+        return _add_dummy_score(result['preds'])
@@ -0,0 +1,222 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+import torch
+
+from .inference import (_load_top_down_frame, _prepare_top_down_batch,
+                        _xywh2xyxy, _xyxy2xywh)
+
+
+class TopDownPoseBatcher:
+    """Micro-batching engine for top-down pose inference.
+
+    Frames submitted by any number of callers (e.g. one per video stream) are
+    cropped in the calling threads, while a worker thread gathers the crops
+    of consecutive frames into one batch and runs the pose model once per
+    batch. A batch is run as soon as it holds ``batch_size`` crops, or when
+    ``max_latency`` seconds have passed since its first frame was submitted.
+    The crops of a frame are never split across batches, and a frame with
+    more than ``batch_size`` crops is run as a batch on its own.
+
+    Example:
+        >>> batcher = TopDownPoseBatcher(pose_model, batch_size=32)
+        >>> futures = [
+        ...     batcher.submit(frame, person_results)
+        ...     for frame, person_results in inputs
+        ... ]
+        >>> # the results are in the same order as the submitted frames
+        >>> pose_results = [future.result() for future in futures]
+        >>> batcher.close()
+
+    Args:
+        model (nn.Module): The loaded pose model.
+        batch_size (int): The number of crops to gather before running the
+            model. Default: 16.
+        max_latency (float): The maximum time (in seconds) to wait for more
+            frames before running a batch which is not full. Default: 0.01.
+        bbox_thr (float, optional): Threshold for bounding boxes. Only bboxes
+            with higher scores will be fed into the pose detector. If
+            bbox_thr is None, ignore it. Default: None.
+        format (str): bbox format ('xyxy' | 'xywh'). Default: 'xywh'.
+        dataset (str): Dataset name, e.g. 'TopDownCocoDataset'.
+    """
+
+    def __init__(self,
+                 model,
+                 batch_size=16,
+                 max_latency=0.01,
+                 bbox_thr=None,
+                 format='xywh',
+                 dataset='TopDownCocoDataset'):
+        # only two kinds of bbox format is supported.
+        assert format in ['xyxy', 'xywh']
+        assert batch_size > 0
+        assert max_latency >= 0
+
+        self.model = model
+        self.batch_size = batch_size
+        self.max_latency = max_latency
+        self.bbox_thr = bbox_thr
+        self.format = format
+        self.dataset = dataset
+
+        self._queue = queue.Queue()
+        self._closed = False
+        # the closed flag is checked and the frames are queued under the
+        # lock, so that no frame is queued after the stop sentinel
+        self._lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def submit(self, img_or_path, person_results):
+        """Submit a frame for pose inference.
+
+        Args:
+            img_or_path (str | np.ndarray): Image filename or loaded image.
+            person_results (List(dict)): the item in the dict may contain
+                'bbox' and/or 'track_id'.
+                'bbox' (4, ) or (5, ): The person bounding box, which contains
+                4 box coordinates (and score).
+                'track_id' (int): The unique id for each human instance.
+
+        Returns:
+            :obj:`concurrent.futures.Future`: The future of the pose results
+                of the frame, which are in the same form as the first output
+                of :func:`inference_top_down_pose_model`.
+        """
+        if self._closed:
+            raise RuntimeError('submit() is called after close()')
+
+        future = Future()
+
+        if len(person_results) == 0:
+            future.set_result([])
+            return future
+
+        bboxes = np.array([box['bbox'] for box in person_results])
+
+        # Select bboxes by score threshold
+        if self.bbox_thr is not None:
+            assert bboxes.shape[1] == 5
+            valid_idx = np.where(bboxes[:, 4] > self.bbox_thr)[0]
+            bboxes = bboxes[valid_idx]
+            person_results = [person_results[i] for i in valid_idx]
+
+        # if bbox_thr remove all bounding box
+        if len(bboxes) == 0:
+            future.set_result([])
+            return future
+
+        if self.format == 'xyxy':
+            bboxes_xyxy = bboxes
+            bboxes_xywh = _xyxy2xywh(bboxes)
+        else:
+            # format is already 'xywh'
+            bboxes_xywh = bboxes
+            bboxes_xyxy = _xywh2xyxy(bboxes)
+
+        try:
+            frame = _load_top_down_frame(self.model, img_or_path, self.dataset)
+            batch_data = _prepare_top_down_batch(self.model, frame,
+                                                 bboxes_xywh, self.dataset)
+        except Exception as e:
+            future.set_exception(e)
+            return future
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('submit() is called after close()')
+            self._queue.put(
+                dict(
+                    img=batch_data['img'],
+                    img_metas=batch_data['img_metas'],
+                    person_results=person_results,
+                    bboxes_xyxy=bboxes_xyxy,
+                    future=future,
+                    submit_time=time.monotonic()))
+
+        return future
+
+    def close(self):
+        """Run the pending frames and stop the worker thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._worker.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _run(self):
+        """Gather the submitted frames into batches and run them."""
+        pending = None
+        stopped = False
+        while not stopped:
+            request = pending if pending is not None else self._queue.get()
+            pending = None
+            if request is None:
+                break
+
+            batch = [request]
+            num_crops = len(request['img_metas'])
+            deadline = request['submit_time'] + self.max_latency
+            while num_crops < self.batch_size:
+                try:
+                    request = self._queue.get(
+                        timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if request is None:
+                    stopped = True
+                    break
+                if num_crops + len(request['img_metas']) > self.batch_size:
+                    # keep the crops of a frame in the same batch
+                    pending = request
+                    break
+                batch.append(request)
+                num_crops += len(request['img_metas'])
+
+            self._run_batch(batch)
+
+    def _run_batch(self, batch):
+        """Run the pose model on a batch of frames and set their results."""
+        try:
+            device = next(self.model.parameters()).device
+            img = torch.cat([request['img'] for request in batch]).to(device)
+            img_metas = []
+            for request in batch:
+                img_metas.extend(request['img_metas'])
+
+            with torch.no_grad():
+                result = self.model(
+                    img=img,
+                    img_metas=img_metas,
+                    return_loss=False,
+                    return_heatmap=False)
+        except Exception as e:
+            for request in batch:
+                request['future'].set_exception(e)
+            return
+
+        # scatter the predictions back to the frames
+        start = 0
+        for request in batch:
+            end = start + len(request['img_metas'])
+            pose_results = []
+            for pose, person_result, bbox_xyxy in zip(
+                    result['preds'][start:end], request['person_results'],
+                    request['bboxes_xyxy']):
+                pose_result = person_result.copy()
+                pose_result['keypoints'] = pose
+                pose_result['bbox'] = bbox_xyxy
+                pose_results.append(pose_result)
+            request['future'].set_result(pose_results)
+            start = end
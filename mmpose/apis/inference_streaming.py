@@ -0,0 +1,206 @@
+import queue
+import threading
+
+# the end of the stream
+_END = object()
+
+
+class _Stage:
+    """A stage of :class:`StreamingPipeline` with its running state."""
+
+    def __init__(self, fn, num_workers):
+        self.fn = fn
+        self.num_workers = num_workers
+        self.num_running = num_workers
+        self.lock = threading.Lock()
+
+
+class StreamingPipeline:
+    """Streaming pipeline to process a stream of items (e.g. video frames)
+    with a sequence of stages (e.g. detect -> pose -> track -> render).
+
+    Each stage runs on its own worker threads, and the stages are connected by
+    bounded queues. A stage blocks when the queue to the next stage is full,
+    so a slow stage holds back the faster stages before it instead of letting
+    the items pile up in memory. As the stages work on different items at the
+    same time, the throughput approaches that of the slowest stage rather
+    than the sum of all the stages. Most of the work in the stages (model
+    inference, image decoding and drawing) is done by torch and OpenCV, which
+    release the GIL.
+
+    A stage with one worker gets the items in the order of the input stream,
+    so it can keep a state across the items, e.g. to track people. A stage
+    with more workers should be stateless, as its workers process the items
+    in parallel. The outputs are always yielded in the order of the input
+    stream.
+
+    Example:
+        >>> pipeline = StreamingPipeline([detect, pose, track, (render, 2)])
+        >>> # frames can be a generator decoding the video, which is run on
+        >>> # a thread of its own
+        >>> for vis_img in pipeline.run(frames):
+        ...     video_writer.write(vis_img)
+
+    Args:
+        stages (list[callable | tuple(callable, int)]): The stages in order.
+            Each stage is called with the output of the previous stage, and
+            the first stage with an item of the input stream. A stage can be
+            given as ``(fn, num_workers)`` to run it on several threads.
+        queue_size (int): The maximum number of items waiting for each
+            stage. Default: 4.
+    """
+
+    def __init__(self, stages, queue_size=4):
+        assert len(stages) > 0
+        assert queue_size > 0
+
+        self.stages = []
+        for stage in stages:
+            if callable(stage):
+                fn, num_workers = stage, 1
+            else:
+                fn, num_workers = stage
+            assert num_workers > 0
+            self.stages.append((fn, num_workers))
+        self.queue_size = queue_size
+
+    def run(self, inputs):
+        """Process a stream of items.
+
+        Args:
+            inputs (Iterable): The input stream. It is iterated on a thread of
+                its own, so reading from it may be a stage as well.
+
+        Yields:
+            The outputs of the last stage, in the order of the inputs.
+        """
+        stages = [_Stage(fn, num_workers) for fn, num_workers in self.stages]
+        queues = [queue.Queue(self.queue_size) for _ in range(len(stages))]
+        queues.append(queue.Queue(self.queue_size))
+        stop = threading.Event()
+        errors = []
+
+        threads = [
+            threading.Thread(
+                target=self._feed,
+                args=(inputs, queues[0], stages[0].num_workers, stop, errors),
+                daemon=True)
+        ]
+        for i, stage in enumerate(stages):
+            num_next_workers = stages[i + 1].num_workers \
+                if i + 1 < len(stages) else 1
+            for _ in range(stage.num_workers):
+                threads.append(
+                    threading.Thread(
+                        target=self._work,
+                        args=(stage, queues[i], queues[i + 1],
+                              num_next_workers, stop, errors),
+                        daemon=True))
+        for thread in threads:
+            thread.start()
+
+        try:
+            next_index = 0
+            pending = {}
+            while True:
+                item = self._get(queues[-1], stop)
+                if item is None:
+                    # a stage has failed
+                    raise errors[0]
+                if item is _END:
+                    break
+                index, output = item
+                pending[index] = output
+                # keep the order of the inputs
+                while next_index in pending:
+                    yield pending.pop(next_index)
+                    next_index += 1
+        finally:
+            # also stop the workers when the caller stops early
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+    @staticmethod
+    def _put(q, item, stop):
+        """Put an item into a queue unless the pipeline is stopped.
+
+        Returns:
+            bool: Whether the item is put.
+        """
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    @staticmethod
+    def _get(q, stop):
+        """Get an item from a queue unless the pipeline is stopped.
+
+        Returns:
+            The item, or None if the pipeline is stopped.
+        """
+        while not stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        return None
+
+    def _feed(self, inputs, out_queue, num_next_workers, stop, errors):
+        """Put the items of the input stream into the first queue."""
+        try:
+            for item in enumerate(inputs):
+                if not self._put(out_queue, item, stop):
+                    return
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+            return
+
+        for _ in range(num_next_workers):
+            self._put(out_queue, _END, stop)
+
+    def _work(self, stage, in_queue, out_queue, num_next_workers, stop,
+              errors):
+        """Run a worker of a stage until the end of the stream."""
+        next_index = 0
+        pending = {}
+        while True:
+            item = self._get(in_queue, stop)
+            if item is None:
+                return
+            if item is _END:
+                break
+
+            if stage.num_workers == 1:
+                # process the items in the order of the inputs
+                index, data = item
+                pending[index] = data
+                items = []
+                while next_index in pending:
+                    items.append((next_index, pending.pop(next_index)))
+                    next_index += 1
+            else:
+                items = [item]
+
+            for index, data in items:
+                try:
+                    output = stage.fn(data)
+                except Exception as e:
+                    errors.append(e)
+                    stop.set()
+                    return
+                if not self._put(out_queue, (index, output), stop):
+                    return
+
+        # the last worker of the stage ends the stream of the next stage
+        with stage.lock:
+            stage.num_running -= 1
+            is_last = stage.num_running == 0
+        if is_last:
+            for _ in range(num_next_workers):
+                self._put(out_queue, _END, stop)
@@ -1,8 +1,9 @@
 import warnings
 
 import numpy as np
+from scipy.optimize import linear_sum_assignment
 
-from mmpose.core import OneEuroFilter, oks_iou
+from mmpose.core import BatchedOneEuroFilter, OneEuroFilter, oks_iou
 
 
 def _compute_iou(bboxA, bboxB):
@@ -222,6 +223,310 @@ def get_track_id(results,
     return results, next_id
 
 
+def _compute_iou_matrix(bboxes, bboxes_last):
+    """Compute the IoU between every pair of the boxes of two frames.
+
+    Args:
+        bboxes (np.ndarray[N, 4]): The boxes of the current frame
+            (left, top, right, bottom).
+        bboxes_last (np.ndarray[M, 4]): The boxes of the last frame.
+
+    Returns:
+        np.ndarray[N, M]: The IoU values.
+    """
+    x1 = np.maximum(bboxes[:, None, 0], bboxes_last[None, :, 0])
+    y1 = np.maximum(bboxes[:, None, 1], bboxes_last[None, :, 1])
+    x2 = np.minimum(bboxes[:, None, 2], bboxes_last[None, :, 2])
+    y2 = np.minimum(bboxes[:, None, 3], bboxes_last[None, :, 3])
+    inter_area = np.maximum(0, x2 - x1) * np.maximum(0, y2 - y1)
+
+    area = (bboxes[:, 2] - bboxes[:, 0]) * (bboxes[:, 3] - bboxes[:, 1])
+    area_last = (bboxes_last[:, 2] - bboxes_last[:, 0]) * (
+        bboxes_last[:, 3] - bboxes_last[:, 1])
+    union_area = area[:, None] + area_last[None, :] - inter_area
+    union_area[union_area == 0] = 1e-5
+
+    return inter_area / union_area
+
+
+def _compute_oks_matrix(keypoints, keypoints_last, areas, areas_last, sigmas):
+    """Compute the OKS between every pair of the poses of two frames, the
+    same as :func:`oks_iou` without the visibility threshold.
+
+    Args:
+        keypoints (np.ndarray[N, K, 2+]): The keypoints of the current frame.
+        keypoints_last (np.ndarray[M, K, 2+]): The keypoints of the last
+            frame.
+        areas (np.ndarray[N]): The areas of the people of the current frame.
+        areas_last (np.ndarray[M]): The areas of the people of the last
+            frame.
+        sigmas (np.ndarray[K]): The standard deviation of keypoint labelling.
+
+    Returns:
+        np.ndarray[N, M]: The OKS values.
+    """
+    vars = (sigmas * 2)**2
+    distances = ((keypoints[:, None, :, :2] -
+                  keypoints_last[None, :, :, :2])**2).sum(axis=-1)
+    scales = (areas[:, None] + areas_last[None, :]) / 2 + np.spacing(1)
+    e = distances / vars / scales[..., None] / 2
+    return np.exp(-e).mean(axis=-1)
+
+
+class PoseTracker:
+    """Track the people across the frames of a video.
+
+    For each frame, the IoU of the bounding boxes or the OKS of the poses
+    between all the people of the frame and all the tracks are computed at
+    once, and the people are assigned to the tracks by a global assignment
+    rather than one by one, which avoids swapping the ids of people close to
+    each other.
+
+    A track which is not matched on a frame, e.g. because the person is
+    occluded, is kept for up to ``max_miss`` frames, so that the person gets
+    the same id when it is seen again. With ``use_velocity=True``, the
+    bounding box (and the keypoints) of a track are moved with its velocity
+    on the last frames before matching, which helps with fast moving people
+    and tracks missed for several frames. The state of the tracks is kept in
+    arrays with one row per track, including the number of frames since the
+    track is created (``ages``), the number of frames it is matched on
+    (``hits``) and the number of consecutive frames it is missed
+    (``misses``).
+
+    Example:
+        >>> tracker = PoseTracker(use_oks=True, max_miss=5)
+        >>> for frame in frames:
+        ...     pose_results, _ = inference_top_down_pose_model(...)
+        ...     # 'track_id' is set for each person
+        ...     pose_results = tracker.update(pose_results)
+
+    Args:
+        use_oks (bool): Flag to use OKS tracking, or IoU tracking otherwise.
+            Default: False.
+        tracking_thr (float): The minimum IoU or OKS to match a person to a
+            track. Default: 0.3.
+        assignment (str): The assignment algorithm ('hungarian' | 'greedy').
+            'hungarian' maximizes the total IoU or OKS of the matched pairs.
+            'greedy' matches the pair with the highest IoU or OKS first.
+            Default: 'hungarian'.
+        max_miss (int): The maximum number of consecutive frames a track is
+            kept without being matched. Default: 0, which means only the
+            people of the last frame are tracked.
+        use_velocity (bool): Option to predict the bounding boxes of the
+            tracks with their velocities. Default: False.
+        min_keypoints (int): Minimum number of keypoints recognized as
+            person. Default: 3.
+        use_one_euro (bool): Option to use one-euro-filter. Default: False.
+        fps (optional): Parameters that d_cutoff when one-euro-filter is
+            used as a video input.
+        sigmas (np.ndarray[K], optional): The standard deviation of keypoint
+            labelling for OKS tracking. Default: None, which means the
+            sigmas of COCO.
+    """
+
+    def __init__(self,
+                 use_oks=False,
+                 tracking_thr=0.3,
+                 assignment='hungarian',
+                 max_miss=0,
+                 use_velocity=False,
+                 min_keypoints=3,
+                 use_one_euro=False,
+                 fps=None,
+                 sigmas=None):
+        assert assignment in ('hungarian', 'greedy')
+        assert max_miss >= 0
+        self.use_oks = use_oks
+        self.tracking_thr = tracking_thr
+        self.assignment = assignment
+        self.max_miss = max_miss
+        self.use_velocity = use_velocity
+        self.min_keypoints = min_keypoints
+        self.use_one_euro = use_one_euro
+        self.fps = fps
+        if sigmas is None:
+            sigmas = np.array([
+                .26, .25, .25, .35, .35, .79, .79, .72, .72, .62, .62, 1.07,
+                1.07, .87, .87, .89, .89
+            ]) / 10.0
+        self.sigmas = sigmas
+        self.reset()
+
+    def reset(self):
+        """Remove all the tracks."""
+        self.next_id = 0
+        self.reset_tracks()
+
+    def reset_tracks(self):
+        """Remove all the tracks but keep counting the track ids."""
+        # the state of the tracks when they are last matched
+        self.track_ids = np.zeros(0, dtype=int)
+        self.bboxes = np.zeros((0, 4), dtype=np.float32)
+        self.velocities = np.zeros((0, 4), dtype=np.float32)
+        self.areas = np.zeros(0, dtype=np.float32)
+        self.keypoints = None
+        self.one_euro = BatchedOneEuroFilter(fps=self.fps)
+        # the counters of the tracks
+        self.ages = np.zeros(0, dtype=int)
+        self.hits = np.zeros(0, dtype=int)
+        self.misses = np.zeros(0, dtype=int)
+
+    def update(self, results):
+        """Assign the people of the current frame to the tracks.
+
+        Args:
+            results (list[dict]): The bbox & pose results of the current
+                frame (bbox_result, pose_result).
+
+        Returns:
+            list[dict]: The bbox & pose & track_id info of the current frame
+                (bbox_result, pose_result, track_id). People which are not
+                matched to any track and have too few keypoints get a
+                track_id of -1.
+        """
+        results = _get_area(results)
+        matched = np.full(len(results), -1)
+        if len(results) > 0:
+            keypoints = np.stack([result['keypoints'] for result in results])
+            bboxes = np.stack([result['bbox'][:4] for result in results])
+            bboxes = bboxes.astype(np.float32)
+            areas = (bboxes[:, 2] - bboxes[:, 0]) * (
+                bboxes[:, 3] - bboxes[:, 1])
+            num_keypoints = np.count_nonzero(keypoints[:, :, 1], axis=1)
+
+            if len(self.track_ids) > 0:
+                bboxes_last, keypoints_last = self._predict()
+                if self.use_oks:
+                    similarity = _compute_oks_matrix(keypoints, keypoints_last,
+                                                     areas, self.areas,
+                                                     self.sigmas)
+                else:
+                    similarity = _compute_iou_matrix(bboxes, bboxes_last)
+                rows, cols = self._assign(similarity)
+                matched[rows] = cols
+
+        # update the matched tracks
+        self.ages += 1
+        self.misses += 1
+        rows = np.nonzero(matched >= 0)[0]
+        cols = matched[rows]
+        if len(rows) > 0:
+            # velocity per frame since the tracks are last matched
+            self.velocities[cols] = (bboxes[rows] - self.bboxes[cols]) / \
+                self.misses[cols, None]
+            self.bboxes[cols] = bboxes[rows]
+            self.areas[cols] = areas[rows]
+            self.keypoints[cols] = keypoints[rows]
+            self.hits[cols] += 1
+            self.misses[cols] = 0
+
+        new_rows = []
+        for i, result in enumerate(results):
+            if matched[i] >= 0:
+                result['track_id'] = self.track_ids[matched[i]]
+            elif num_keypoints[i] > self.min_keypoints:
+                result['track_id'] = self.next_id
+                self.next_id += 1
+                new_rows.append(i)
+            else:
+                # If the number of keypoints detected is small,
+                # delete that person instance.
+                result['keypoints'][:, 1] = -10
+                result['bbox'] *= 0
+                result['track_id'] = -1
+
+        if self.use_one_euro:
+            # smooth the keypoints of all the tracked people at once, the
+            # new tracks are added to the filter
+            tracked = [result for result in results if result['track_id'] >= 0]
+            if len(tracked) > 0:
+                ids = [result['track_id'] for result in tracked]
+                coords = np.stack(
+                    [result['keypoints'][:, :2] for result in tracked])
+                smoothed = self.one_euro(ids, coords)
+                for result, keypoints_smoothed in zip(tracked, smoothed):
+                    result['keypoints'][:, :2] = keypoints_smoothed
+
+        # add the new tracks
+        if len(new_rows) > 0:
+            num_new = len(new_rows)
+            self.track_ids = np.concatenate(
+                (self.track_ids, [results[i]['track_id'] for i in new_rows]))
+            self.bboxes = np.concatenate((self.bboxes, bboxes[new_rows]))
+            self.velocities = np.concatenate(
+                (self.velocities, np.zeros((num_new, 4), dtype=np.float32)))
+            self.areas = np.concatenate((self.areas, areas[new_rows]))
+            self.keypoints = keypoints[new_rows] if self.keypoints is None \
+                else np.concatenate((self.keypoints, keypoints[new_rows]))
+            self.ages = np.concatenate((self.ages, np.ones(num_new, int)))
+            self.hits = np.concatenate((self.hits, np.ones(num_new, int)))
+            self.misses = np.concatenate((self.misses, np.zeros(num_new, int)))
+
+        # remove the tracks missed for too long
+        keep = self.misses <= self.max_miss
+        if not keep.all():
+            self.one_euro.remove(self.track_ids[~keep])
+            self.track_ids = self.track_ids[keep]
+            self.bboxes = self.bboxes[keep]
+            self.velocities = self.velocities[keep]
+            self.areas = self.areas[keep]
+            self.keypoints = self.keypoints[keep]
+            self.ages = self.ages[keep]
+            self.hits = self.hits[keep]
+            self.misses = self.misses[keep]
+
+        return results
+
+    def _predict(self):
+        """Predict the bounding boxes and the keypoints of the tracks on the
+        current frame.
+
+        Returns:
+            tuple(np.ndarray[M, 4], np.ndarray[M, K, C]): The bounding boxes
+                and the keypoints of the M tracks.
+        """
+        if not self.use_velocity:
+            return self.bboxes, self.keypoints
+
+        # the number of frames since the tracks are last matched
+        steps = self.misses[:, None] + 1
+        offsets = self.velocities * steps
+        bboxes = self.bboxes + offsets
+        keypoints = self.keypoints.copy()
+        keypoints[..., 0] += (offsets[:, None, 0] + offsets[:, None, 2]) / 2
+        keypoints[..., 1] += (offsets[:, None, 1] + offsets[:, None, 3]) / 2
+        return bboxes, keypoints
+
+    def _assign(self, similarity):
+        """Assign the people to the tracks.
+
+        Args:
+            similarity (np.ndarray[N, M]): The IoU or OKS between the N
+                people and the M tracks.
+
+        Returns:
+            tuple(np.ndarray, np.ndarray): The indices of the matched people
+                and tracks.
+        """
+        if self.assignment == 'hungarian':
+            rows, cols = linear_sum_assignment(similarity, maximize=True)
+            keep = similarity[rows, cols] > self.tracking_thr
+            return rows[keep], cols[keep]
+
+        similarity = similarity.copy()
+        rows, cols = [], []
+        for _ in range(min(similarity.shape)):
+            row, col = np.unravel_index(
+                np.argmax(similarity), similarity.shape)
+            if similarity[row, col] <= self.tracking_thr:
+                break
+            rows.append(row)
+            cols.append(col)
+            similarity[row, :] = -np.inf
+            similarity[:, col] = -np.inf
+        return np.array(rows, dtype=int), np.array(cols, dtype=int)
+
+
 def vis_pose_tracking_result(model,
                              img,
                              result,
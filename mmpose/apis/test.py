@@ -4,12 +4,25 @@ import shutil
 import tempfile
 
 import mmcv
+import numpy as np
 import torch
 import torch.distributed as dist
 from mmcv.runner import get_dist_info
 
 
-def single_gpu_test(model, data_loader):
+def _trim_result(result, batch_size, num_samples):
+    """Keep the first ``num_samples`` samples of the result of a batch, i.e.
+    remove the samples padded by the distributed sampler."""
+    return {
+        key:
+        value[:num_samples]
+        if isinstance(value, (list, tuple, np.ndarray, torch.Tensor))
+        and len(value) == batch_size else value
+        for key, value in result.items()
+    }
+
+
+def single_gpu_test(model, data_loader, accumulator=None):
     """Test model with a single gpu.
 
     This method tests model with a single gpu and displays test progress bar.
@@ -17,10 +30,14 @@ def single_gpu_test(model, data_loader):
     Args:
         model (nn.Module): Model to be tested.
         data_loader (nn.Dataloader): Pytorch data loader.
-
+        accumulator (object, optional): The accumulator of the metrics
+            returned by ``dataset.get_accumulator``. If given, the metrics
+            are accumulated by ``dataset.accumulate`` batch by batch instead
+            of keeping the results. Default: None.
 
     Returns:
-        list: The prediction results.
+        list | object: The prediction results, or the accumulator if it is
+            given.
     """
 
     model.eval()
@@ -30,16 +47,25 @@ def single_gpu_test(model, data_loader):
     for data in data_loader:
         with torch.no_grad():
             result = model(return_loss=False, **data)
-        results.append(result)
+        if accumulator is not None:
+            dataset.accumulate(accumulator, result)
+        else:
+            results.append(result)
 
         # use the first key as main key to calculate the batch size
         batch_size = len(next(iter(data.values())))
         for _ in range(batch_size):
             prog_bar.update()
+    if accumulator is not None:
+        return accumulator
     return results
 
 
-def multi_gpu_test(model, data_loader, tmpdir=None, gpu_collect=False):
+def multi_gpu_test(model,
+                   data_loader,
+                   tmpdir=None,
+                   gpu_collect=False,
+                   accumulator=None):
     """Test model with multiple gpus.
 
     This method tests model with multiple gpus and collects the results
@@ -54,9 +80,14 @@ def multi_gpu_test(model, data_loader, tmpdir=None, gpu_collect=False):
         tmpdir (str): Path of directory to save the temporary results from
             different gpus under cpu mode.
         gpu_collect (bool): Option to use either gpu or cpu to collect results.
+        accumulator (object, optional): The accumulator of the metrics
+            returned by ``dataset.get_accumulator``. If given, the metrics
+            are accumulated by ``dataset.accumulate`` on each gpu, and the
+            accumulators are merged by the rank 0 worker. Default: None.
 
     Returns:
-        list: The prediction results.
+        list | object: The prediction results, or the accumulator if it is
+            given.
     """
     model.eval()
     results = []
@@ -64,10 +95,20 @@ def multi_gpu_test(model, data_loader, tmpdir=None, gpu_collect=False):
     rank, world_size = get_dist_info()
     if rank == 0:
         prog_bar = mmcv.ProgressBar(len(dataset))
+    # the samples of the worker, without those padded by the sampler
+    num_samples = len(range(rank, len(dataset), world_size))
     for data in data_loader:
         with torch.no_grad():
             result = model(return_loss=False, **data)
-        results.append(result)
+        if accumulator is not None:
+            batch_size = len(next(iter(data.values())))
+            if num_samples < batch_size:
+                result = _trim_result(result, batch_size, num_samples)
+            if num_samples > 0:
+                dataset.accumulate(accumulator, result)
+            num_samples -= batch_size
+        else:
+            results.append(result)
 
         if rank == 0:
             # use the first key as main key to calculate the batch size
@@ -75,6 +116,19 @@ def multi_gpu_test(model, data_loader, tmpdir=None, gpu_collect=False):
             for _ in range(batch_size * world_size):
                 prog_bar.update()
 
+    if accumulator is not None:
+        # collect the accumulators from all ranks, and merge them
+        if gpu_collect:
+            accumulators = collect_results_gpu([accumulator], world_size)
+        else:
+            accumulators = collect_results_cpu([accumulator], world_size,
+                                               tmpdir)
+        if rank != 0:
+            return None
+        for other in accumulators[1:]:
+            accumulator.merge(other)
+        return accumulator
+
     # collect results from all ranks
     if gpu_collect:
         results = collect_results_gpu(results, len(dataset))
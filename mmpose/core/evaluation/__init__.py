@@ -1,5 +1,8 @@
+from .accumulators import (KeypointAccumulator, MPJPEAccumulator,
+                           ResultAccumulator)
 from .bottom_up_eval import (aggregate_results, get_group_preds,
                              get_multi_stage_outputs)
+from .coco_eval import ParallelCOCOeval
 from .eval_hooks import DistEvalHook, EvalHook
 from .mesh_eval import compute_similarity_transform
 from .pose3d_eval import keypoint_3d_auc, keypoint_3d_pck, keypoint_mpjpe
@@ -15,5 +18,7 @@ __all__ = [
     'keypoint_epe', 'get_group_preds', 'get_multi_stage_outputs',
     'aggregate_results', 'compute_similarity_transform', 'post_dark_udp',
     'keypoint_mpjpe', 'keypoints_from_heatmaps3d',
-    'multilabel_classification_accuracy', 'keypoint_3d_pck', 'keypoint_3d_auc'
+    'multilabel_classification_accuracy', 'keypoint_3d_pck', 'keypoint_3d_auc',
+    'ParallelCOCOeval', 'KeypointAccumulator', 'MPJPEAccumulator',
+    'ResultAccumulator'
 ]
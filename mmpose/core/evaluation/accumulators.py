@@ -0,0 +1,259 @@
+from collections import OrderedDict, defaultdict
+
+import numpy as np
+
+from .pose3d_eval import keypoint_mpjpe
+from .top_down_eval import _calc_distances
+
+
+class KeypointAccumulator:
+    """Accumulate the 2D keypoint metrics batch by batch.
+
+    Only the numbers of the valid and the correct keypoints and the sums of
+    the errors are kept, so the memory does not grow with the number of
+    samples. The metrics are the same as :func:`keypoint_pck_accuracy`,
+    :func:`keypoint_auc`, :func:`keypoint_epe` and :func:`keypoint_nme` on
+    all the samples at once.
+
+    Note:
+        batch_size: N
+        num_keypoints: K
+
+    Args:
+        metrics (str | list[str]): Metrics to be accumulated. Options:
+            'PCK', 'PCKh', 'AUC', 'EPE', 'NME'.
+        pck_thr (float): PCK threshold. Default: 0.2.
+        pckh_thr (float): PCKh threshold. Default: 0.7.
+        auc_nor (float): AUC normalization factor. Default: 30.
+        num_step (int): The number of the PCK thresholds of AUC. Default: 20.
+    """
+
+    def __init__(self,
+                 metrics,
+                 pck_thr=0.2,
+                 pckh_thr=0.7,
+                 auc_nor=30,
+                 num_step=20):
+        self.metrics = metrics if isinstance(metrics, list) else [metrics]
+        self.pck_thr = pck_thr
+        self.pckh_thr = pckh_thr
+        self.auc_nor = auc_nor
+        self.auc_thrs = [1.0 * i / num_step for i in range(num_step)]
+
+        # the numbers of the valid keypoints, and those of the correct ones
+        # under each threshold of PCK, PCKh and AUC
+        self.num_valid = {}
+        self.num_correct = {}
+        # the sums and the numbers of the errors of EPE and NME
+        self.error_sum = defaultdict(float)
+        self.num_errors = defaultdict(int)
+
+    def _update_pck(self, name, pred, gt, mask, thrs, normalize):
+        distances = _calc_distances(pred, gt, mask, normalize)
+        valid = distances != -1
+        # the thresholds are compared in the precision of the distances
+        thrs = np.array(thrs, dtype=distances.dtype).reshape(-1, 1, 1)
+        correct = valid & (distances < thrs)
+        self.num_valid[name] = self.num_valid.get(name, 0) + valid.sum(axis=1)
+        self.num_correct[name] = self.num_correct.get(name,
+                                                      0) + correct.sum(axis=2)
+
+    def _update_error(self, name, pred, gt, mask, normalize):
+        distances = _calc_distances(pred, gt, mask, normalize)
+        distance_valid = distances[distances != -1]
+        self.error_sum[name] += float(distance_valid.sum(dtype=np.float64))
+        self.num_errors[name] += len(distance_valid)
+
+    def update(self,
+               pred,
+               gt,
+               mask,
+               bbox_size=None,
+               head_size=None,
+               normalize_factor=None):
+        """Update the metrics with a batch of samples.
+
+        Args:
+            pred (np.ndarray[N, K, 2]): Predicted keypoint location.
+            gt (np.ndarray[N, K, 2]): Groundtruth keypoint location.
+            mask (np.ndarray[N, K]): Visibility of the target. False for
+                invisible joints, and True for visible.
+            bbox_size (np.ndarray[N]): The size of the bboxes, which
+                normalizes the distances of PCK.
+            head_size (np.ndarray[N]): The size of the heads, which
+                normalizes the distances of PCKh.
+            normalize_factor (np.ndarray[N, 2]): Normalization factor of NME.
+        """
+        pred = np.asarray(pred, dtype=np.float64)
+        gt = np.asarray(gt, dtype=np.float64)
+        mask = np.asarray(mask, dtype=bool)
+        if len(pred) == 0:
+            return
+        if 'PCK' in self.metrics:
+            normalize = np.tile(
+                np.asarray(bbox_size, dtype=np.float64)[:, None], (1, 2))
+            self._update_pck('PCK', pred, gt, mask, self.pck_thr, normalize)
+        if 'PCKh' in self.metrics:
+            normalize = np.tile(
+                np.asarray(head_size, dtype=np.float64)[:, None], (1, 2))
+            self._update_pck('PCKh', pred, gt, mask, self.pckh_thr, normalize)
+        if 'AUC' in self.metrics:
+            normalize = np.full((len(pred), 2), self.auc_nor, dtype=np.float64)
+            self._update_pck('AUC', pred, gt, mask, self.auc_thrs, normalize)
+        if 'EPE' in self.metrics:
+            self._update_error('EPE', pred, gt, mask,
+                               np.ones((len(pred), 2), dtype=np.float32))
+        if 'NME' in self.metrics:
+            self._update_error('NME', pred, gt, mask,
+                               np.array(normalize_factor, dtype=np.float64))
+
+    def merge(self, other):
+        """Merge the metrics of the other samples, e.g. those of the other
+        processes."""
+        for name, num_valid in other.num_valid.items():
+            self.num_valid[name] = self.num_valid.get(name, 0) + num_valid
+            self.num_correct[name] = self.num_correct.get(
+                name, 0) + other.num_correct[name]
+        for name, error_sum in other.error_sum.items():
+            self.error_sum[name] += error_sum
+            self.num_errors[name] += other.num_errors[name]
+
+    def _get_pck(self, name, num_thrs=1):
+        """Get the PCK averaged over the keypoints for each threshold."""
+        num_valid = self.num_valid.get(name, np.zeros(0, dtype=int))
+        valid = num_valid > 0
+        if not valid.any():
+            return [0] * num_thrs
+        return [(num_correct[valid] / num_valid[valid]).mean()
+                for num_correct in self.num_correct[name]]
+
+    def summarize(self):
+        """Get the accumulated metrics.
+
+        Returns:
+            List: Evaluation results for evaluation metric.
+        """
+        info_str = []
+        if 'PCK' in self.metrics:
+            info_str.append(('PCK', self._get_pck('PCK')[0]))
+        if 'PCKh' in self.metrics:
+            info_str.append(('PCKh', self._get_pck('PCKh')[0]))
+        if 'AUC' in self.metrics:
+            y = self._get_pck('AUC', len(self.auc_thrs))
+            auc = 0
+            for i in range(len(self.auc_thrs)):
+                auc += 1.0 / len(self.auc_thrs) * y[i]
+            info_str.append(('AUC', auc))
+        for name in ['EPE', 'NME']:
+            if name in self.metrics:
+                info_str.append(
+                    (name,
+                     self.error_sum[name] / max(1, self.num_errors[name])))
+        return info_str
+
+
+class MPJPEAccumulator:
+    """Accumulate the mean per-joint position error (MPJPE) batch by batch.
+
+    The errors are accumulated over all the samples and over the groups of
+    the samples (e.g. the actions), with each of the alignments. Only the
+    sums and the numbers of the errors are kept.
+
+    Args:
+        alignments (list[str]): The alignments of the predictions. See
+            :func:`keypoint_mpjpe` for the options. Default: ['none'].
+    """
+
+    def __init__(self, alignments=('none', )):
+        self.alignments = list(alignments)
+        self.error_sum = defaultdict(float)
+        self.num_errors = defaultdict(int)
+
+    def update(self, pred, gt, mask, groups=None):
+        """Update the errors with a batch of samples.
+
+        Note:
+            batch_size: N
+            num_keypoints: K
+            keypoint_dims: C
+
+        Args:
+            pred (np.ndarray[N, K, C]): Predicted keypoint location.
+            gt (np.ndarray[N, K, C]): Groundtruth keypoint location.
+            mask (np.ndarray[N, K]): Visibility of the target.
+            groups (list[str], optional): The group of each sample.
+        """
+        if groups is None:
+            partition = [(None, np.arange(len(pred)))]
+        else:
+            groups = np.asarray(groups)
+            partition = [(group, np.flatnonzero(groups == group))
+                         for group in OrderedDict.fromkeys(groups.tolist())]
+        for alignment in self.alignments:
+            # the errors of all the samples are summed over the groups
+            for group, indices in partition:
+                num_errors = int(mask[indices].sum())
+                if num_errors == 0:
+                    continue
+                error_sum = float(
+                    keypoint_mpjpe(pred[indices], gt[indices], mask[indices],
+                                   alignment)) * num_errors
+                for key in {(alignment, None), (alignment, group)}:
+                    self.error_sum[key] += error_sum
+                    self.num_errors[key] += num_errors
+
+    def merge(self, other):
+        """Merge the errors of the other samples, e.g. those of the other
+        processes."""
+        for key, error_sum in other.error_sum.items():
+            self.error_sum[key] += error_sum
+            self.num_errors[key] += other.num_errors[key]
+
+    @property
+    def groups(self):
+        """list[str]: The groups of the samples, in the order they are
+        seen."""
+        return list(
+            OrderedDict.fromkeys(group for _, group in self.num_errors
+                                 if group is not None))
+
+    def summarize(self, alignment='none', group=None):
+        """Get the MPJPE of all the samples, or those of a group.
+
+        Args:
+            alignment (str): The alignment of the predictions.
+            group (str, optional): The group of the samples.
+
+        Returns:
+            float: The MPJPE.
+        """
+        num_errors = self.num_errors[alignment, group]
+        assert num_errors > 0
+        return self.error_sum[alignment, group] / num_errors
+
+
+class ResultAccumulator:
+    """Accumulate the compact results of the batches as arrays.
+
+    The results to evaluate are accumulated in place of the whole outputs of
+    the model (e.g. without the heatmaps), when the metric can only be
+    computed on all the results at once, e.g. COCO mAP.
+    """
+
+    def __init__(self):
+        self.results = defaultdict(list)
+
+    def update(self, **results):
+        """Append the arrays of a batch, e.g. ``update(preds=preds)``."""
+        for name, result in results.items():
+            self.results[name].append(np.asarray(result))
+
+    def merge(self, other):
+        """Merge the results of the other samples, e.g. those of the other
+        processes."""
+        for name, results in other.results.items():
+            self.results[name].extend(results)
+
+    def get(self, name):
+        """Get the concatenated array of a result."""
+        return np.concatenate(self.results[name])
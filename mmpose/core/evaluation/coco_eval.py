@@ -0,0 +1,222 @@
+import copy
+import time
+from collections import defaultdict
+from multiprocessing import Pool
+
+import numpy as np
+from xtcocotools.cocoeval import COCOeval
+
+# the keypoint fields of the annotations for each iou type, where the
+# keypoints of the whole body are concatenated
+_KEYPOINT_FIELDS = {
+    'keypoints_wholebody':
+    ['keypoints', 'foot_kpts', 'face_kpts', 'lefthand_kpts', 'righthand_kpts'],
+    'keypoints_foot': ['foot_kpts'],
+    'keypoints_face': ['face_kpts'],
+    'keypoints_lefthand': ['lefthand_kpts'],
+    'keypoints_righthand': ['righthand_kpts'],
+}
+
+
+def _evaluate_chunk(args):
+    """Compute the OKS and evaluate the images of a chunk in a worker.
+
+    Args:
+        args (tuple): The evaluator settings, and the ground truths and
+            detections of the images in the chunk.
+
+    Returns:
+        dict: The OKS of each (image id, category id).
+        dict: The evaluation results of each (category index, area range
+            index, image id).
+    """
+    (iou_type, sigmas, use_area, score_key, params, img_ids, gts, dts) = args
+    coco_eval = ParallelCOCOeval(
+        iouType=iou_type, sigmas=sigmas, use_area=use_area)
+    coco_eval.score_key = score_key
+    coco_eval.params = params
+    coco_eval._gts = defaultdict(list, gts)
+    coco_eval._dts = defaultdict(list, dts)
+    return coco_eval._evaluate_images(img_ids)
+
+
+class ParallelCOCOeval(COCOeval):
+    """COCOeval for keypoints, which computes the OKS of each image with
+    vectorised NumPy and evaluates the images with a pool of processes.
+
+    The OKS of the detections of an image with a ground truth is computed at
+    once, and the images are split into chunks, which are evaluated by
+    ``nproc`` processes. The per image results are the same as those of
+    :class:`xtcocotools.cocoeval.COCOeval`, and ``accumulate`` and
+    ``summarize`` are inherited, so the stats are identical.
+
+    Args:
+        cocoGt (COCO): The ground truths.
+        cocoDt (COCO): The detections.
+        iouType (str): 'keypoints', 'keypoints_crowd',
+            'keypoints_wholebody', 'keypoints_foot', 'keypoints_face',
+            'keypoints_lefthand' or 'keypoints_righthand'.
+            Default: 'keypoints'.
+        sigmas (np.ndarray): The keypoint labelling sigmas. If None, the
+            sigmas of COCO are used.
+        use_area (bool): Whether to use the area of the ground truths. If
+            False (e.g. CrowdPose and AIC), the area is estimated from the
+            bbox. Default: True.
+        nproc (int): The number of processes. If not greater than 1, the
+            images are evaluated in the current process. Default: 1.
+    """
+
+    def __init__(self,
+                 cocoGt=None,
+                 cocoDt=None,
+                 iouType='keypoints',
+                 sigmas=None,
+                 use_area=True,
+                 nproc=1):
+        assert 'keypoints' in iouType, \
+            f'iouType {iouType} is not supported'
+        super().__init__(cocoGt, cocoDt, iouType, sigmas, use_area)
+        self.nproc = nproc
+
+    def _get_keypoints(self, anns):
+        """Get the keypoints of the annotations as an array of [N, K*3]."""
+        fields = _KEYPOINT_FIELDS.get(self.params.iouType, ['keypoints'])
+        keypoints = []
+        for ann in anns:
+            kpts = ann[fields[0]]
+            for field in fields[1:]:
+                kpts = kpts + ann[field]
+            keypoints.append(kpts)
+        return np.array(keypoints)
+
+    def computeOks(self, imgId, catId):
+        """Compute the OKS between the detections and the ground truths of an
+        image.
+
+        Returns:
+            np.ndarray[D, G] | list: The OKS of the detections, which are
+                sorted by score. An empty list if there are no detections or
+                ground truths.
+        """
+        p = self.params
+        gts = self._gts[imgId, catId]
+        dts = self._dts[imgId, catId]
+        inds = np.argsort([-d[self.score_key] for d in dts], kind='mergesort')
+        dts = [dts[i] for i in inds]
+        if len(dts) > p.maxDets[-1]:
+            dts = dts[0:p.maxDets[-1]]
+        if len(gts) == 0 or len(dts) == 0:
+            return []
+        ious = np.zeros((len(dts), len(gts)))
+        vars = (self.sigmas * 2)**2
+
+        d = self._get_keypoints(dts)
+        xd = d[:, 0::3]
+        yd = d[:, 1::3]
+        for j, (gt, g) in enumerate(zip(gts, self._get_keypoints(gts))):
+            xg = g[0::3]
+            yg = g[1::3]
+            vg = g[2::3]
+            k1 = np.count_nonzero(vg > 0)
+            bb = gt['bbox']
+            if k1 > 0:
+                # measure the per-keypoint distance if keypoints visible
+                dx = xd - xg
+                dy = yd - yg
+            else:
+                # measure the minimum distance to the doubled gt bbox
+                x0 = bb[0] - bb[2]
+                x1 = bb[0] + bb[2] * 2
+                y0 = bb[1] - bb[3]
+                y1 = bb[1] + bb[3] * 2
+                dx = np.maximum(0, x0 - xd) + np.maximum(0, xd - x1)
+                dy = np.maximum(0, y0 - yd) + np.maximum(0, yd - y1)
+
+            if self.use_area:
+                area = gt['area']
+            else:
+                area = bb[3] * bb[2] * 0.53
+            e = (dx**2 + dy**2) / vars / (area + np.spacing(1)) / 2
+
+            if k1 > 0:
+                # the indexing on the last axis makes a Fortran-ordered
+                # array, which would change the order of the summation
+                e = np.ascontiguousarray(e[:, vg > 0])
+            ious[:, j] = np.sum(np.exp(-e), axis=1) / e.shape[1]
+        return ious
+
+    def _evaluate_images(self, img_ids):
+        """Compute the OKS and evaluate the images in the current process.
+
+        Args:
+            img_ids (list[int]): The image ids.
+
+        Returns:
+            dict: The OKS of each (image id, category id).
+            dict: The evaluation results of each (category index, area range
+                index, image id).
+        """
+        p = self.params
+        cat_ids = p.catIds if p.useCats else [-1]
+        self.ious = {
+            (img_id, cat_id): self.computeOks(img_id, cat_id)
+            for img_id in img_ids
+            for cat_id in cat_ids
+        }
+
+        max_det = p.maxDets[-1]
+        eval_imgs = {
+            (c, a, img_id): self.evaluateImg(img_id, cat_id, area_rng, max_det)
+            for c, cat_id in enumerate(cat_ids)
+            for a, area_rng in enumerate(p.areaRng)
+            for img_id in img_ids
+        }
+        return self.ious, eval_imgs
+
+    def evaluate(self):
+        """Run per image evaluation on the given images and store the results
+        (a list of dict) in ``self.evalImgs``."""
+        tic = time.time()
+        print('Running per image evaluation...')
+        p = self.params
+        print(f'Evaluate annotation type *{p.iouType}*')
+        p.imgIds = list(np.unique(p.imgIds))
+        if p.useCats:
+            p.catIds = list(np.unique(p.catIds))
+        p.maxDets = sorted(p.maxDets)
+        self.params = p
+
+        self._prepare()
+        cat_ids = p.catIds if p.useCats else [-1]
+
+        if self.nproc > 1 and len(p.imgIds) > 1:
+            # the chunks are small enough to balance the workload
+            num_chunks = min(len(p.imgIds), self.nproc * 4)
+            chunks = np.array_split(np.array(p.imgIds), num_chunks)
+            tasks = []
+            for img_ids in chunks:
+                img_ids = list(img_ids)
+                keys = [(img_id, cat_id) for img_id in img_ids
+                        for cat_id in p.catIds]
+                gts = {key: self._gts[key] for key in keys if key in self._gts}
+                dts = {key: self._dts[key] for key in keys if key in self._dts}
+                tasks.append((p.iouType, self.sigmas, self.use_area,
+                              self.score_key, p, img_ids, gts, dts))
+            with Pool(min(self.nproc, num_chunks)) as pool:
+                results = pool.map(_evaluate_chunk, tasks)
+            self.ious = {}
+            eval_imgs = {}
+            for ious, chunk_eval_imgs in results:
+                self.ious.update(ious)
+                eval_imgs.update(chunk_eval_imgs)
+        else:
+            _, eval_imgs = self._evaluate_images(p.imgIds)
+
+        # keep the order of COCOeval, i.e. category, area range and image
+        self.evalImgs = [
+            eval_imgs[c, a, img_id] for c in range(len(cat_ids))
+            for a in range(len(p.areaRng)) for img_id in p.imgIds
+        ]
+        self._paramsEval = copy.deepcopy(self.params)
+        toc = time.time()
+        print(f'DONE (t={toc - tic:0.2f}s).')
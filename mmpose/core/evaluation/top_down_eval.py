@@ -2,6 +2,8 @@ import warnings
 
 import cv2
 import numpy as np
+import torch
+import torch.nn.functional as F
 
 from mmpose.core.post_processing import transform_preds
 
@@ -91,6 +93,36 @@ def _get_max_preds(heatmaps):
     return preds, maxvals
 
 
+def _get_max_preds_tensor(heatmaps):
+    """Get keypoint predictions from score maps on the device of the score
+    maps. The torch version of :func:`_get_max_preds`.
+
+    Note:
+        batch_size: N
+        num_keypoints: K
+        heatmap height: H
+        heatmap width: W
+
+    Args:
+        heatmaps (torch.Tensor[N, K, H, W]): model predicted heatmaps.
+
+    Returns:
+        tuple: A tuple containing aggregated results.
+
+        - preds (torch.Tensor[N, K, 2]): Predicted keypoint location.
+        - maxvals (torch.Tensor[N, K, 1]): Scores (confidence) of the
+          keypoints.
+    """
+    assert heatmaps.ndim == 4, 'batch_images should be 4-ndim'
+
+    N, K, _, W = heatmaps.shape
+    maxvals, idx = heatmaps.reshape((N, K, -1)).max(dim=2, keepdim=True)
+
+    preds = torch.cat((idx % W, idx // W), dim=2).float()
+    preds = torch.where(maxvals > 0.0, preds, preds.new_tensor(-1.))
+    return preds, maxvals
+
+
 def _get_max_preds_3d(heatmaps):
     """Get keypoint predictions from 3D score maps.
 
@@ -355,18 +387,13 @@ def post_dark_udp(coords, batch_heatmaps, kernel=3):
     B, K, H, W = batch_heatmaps.shape
     N = coords.shape[0]
     assert (B == 1 or B == N)
-    for heatmaps in batch_heatmaps:
-        for heatmap in heatmaps:
-            cv2.GaussianBlur(heatmap, (kernel, kernel), 0, heatmap)
+    batch_heatmaps = _blur_heatmaps(batch_heatmaps, kernel)
     np.clip(batch_heatmaps, 0.001, 50, batch_heatmaps)
     np.log(batch_heatmaps, batch_heatmaps)
-    batch_heatmaps = np.transpose(batch_heatmaps,
-                                  (2, 3, 0, 1)).reshape(H, W, -1)
-    batch_heatmaps_pad = cv2.copyMakeBorder(
-        batch_heatmaps, 1, 1, 1, 1, borderType=cv2.BORDER_REFLECT)
-    batch_heatmaps_pad = np.transpose(
-        batch_heatmaps_pad.reshape(H + 2, W + 2, B, K),
-        (2, 3, 0, 1)).flatten()
+    # cv2.BORDER_REFLECT repeats the edges for a 1 pixel border
+    batch_heatmaps_pad = np.pad(
+        batch_heatmaps, ((0, 0), (0, 0), (1, 1), (1, 1)),
+        mode='edge').flatten()
 
     index = coords[..., 0] + 1 + (coords[..., 1] + 1) * (W + 2)
     index += (W + 2) * (H + 2) * np.arange(0, B * K).reshape(-1, K)
@@ -418,23 +445,409 @@ def _gaussian_blur(heatmaps, kernel=11):
     """
     assert kernel % 2 == 1
 
-    border = (kernel - 1) // 2
-    batch_size = heatmaps.shape[0]
-    num_joints = heatmaps.shape[1]
-    height = heatmaps.shape[2]
-    width = heatmaps.shape[3]
-    for i in range(batch_size):
-        for j in range(num_joints):
-            origin_max = np.max(heatmaps[i, j])
-            dr = np.zeros((height + 2 * border, width + 2 * border),
-                          dtype=np.float32)
-            dr[border:-border, border:-border] = heatmaps[i, j].copy()
-            dr = cv2.GaussianBlur(dr, (kernel, kernel), 0)
-            heatmaps[i, j] = dr[border:-border, border:-border].copy()
-            heatmaps[i, j] *= origin_max / np.max(heatmaps[i, j])
+    origin_max = np.max(heatmaps, axis=(2, 3), keepdims=True)
+    # blurring with zero borders equals blurring the zero-padded heatmaps
+    heatmaps[...] = _blur_heatmaps(
+        heatmaps, kernel, border_type=cv2.BORDER_CONSTANT)
+    heatmaps *= origin_max / np.max(heatmaps, axis=(2, 3), keepdims=True)
     return heatmaps
 
 
+def _blur_heatmaps(heatmaps, kernel, border_type=cv2.BORDER_DEFAULT):
+    """Blur each heatmap with a Gaussian kernel.
+
+    Note:
+        batch_size: N
+        num_keypoints: K
+        heatmap height: H
+        heatmap width: W
+
+    Args:
+        heatmaps (np.ndarray[N, K, H, W]): model predicted heatmaps.
+        kernel (int): Gaussian kernel size.
+        border_type (int): Pixel extrapolation method of cv2.
+            Default: cv2.BORDER_DEFAULT.
+
+    Returns:
+        np.ndarray[N, K, H, W]: Blurred heatmaps.
+    """
+    N, K, H, W = heatmaps.shape
+    blurred = np.empty((N, K, H, W), dtype=heatmaps.dtype)
+    for heatmap, dst in zip(
+            heatmaps.reshape(-1, H, W), blurred.reshape(-1, H, W)):
+        cv2.GaussianBlur(
+            heatmap, (kernel, kernel), 0, dst, borderType=border_type)
+    return blurred
+
+
+def _get_blur_matrix(size, kernel, border_type=cv2.BORDER_DEFAULT):
+    """Get the matrix which applies a 1D Gaussian blur by multiplication.
+
+    Args:
+        size (int): The length of the signals to blur.
+        kernel (int): Gaussian kernel size.
+        border_type (int): Pixel extrapolation method of cv2, which should
+            be cv2.BORDER_DEFAULT (reflect 101) or cv2.BORDER_CONSTANT
+            (zeros). Default: cv2.BORDER_DEFAULT.
+
+    Returns:
+        np.ndarray[size, size]: The matrix M, where M @ x is the blurred x.
+    """
+    assert border_type in (cv2.BORDER_DEFAULT, cv2.BORDER_CONSTANT)
+    border = (kernel - 1) // 2
+    assert border < size
+
+    rows = np.repeat(np.arange(size), kernel)
+    cols = (np.arange(size)[:, None] + np.arange(-border, border + 1))
+    cols = cols.reshape(-1)
+    weights = np.tile(cv2.getGaussianKernel(kernel, 0).reshape(-1), size)
+    if border_type == cv2.BORDER_CONSTANT:
+        inside = (cols >= 0) & (cols < size)
+        rows, cols, weights = rows[inside], cols[inside], weights[inside]
+    else:
+        cols = np.abs(cols)
+        cols = np.where(cols >= size, 2 * (size - 1) - cols, cols)
+    matrix = np.zeros((size, size))
+    np.add.at(matrix, (rows, cols), weights)
+    return matrix
+
+
+def _taylor_batch(heatmaps, coords):
+    """Distribution aware coordinate decoding method for all the keypoints at
+    once. The vectorized version of :func:`_taylor`.
+
+    Note:
+        batch_size: N
+        num_keypoints: K
+        heatmap height: H
+        heatmap width: W
+
+    Args:
+        heatmaps (np.ndarray[N, K, H, W]): Heatmaps of the keypoints.
+        coords (np.ndarray[N, K, 2]): Coordinates of the predicted keypoints.
+
+    Returns:
+        np.ndarray[N, K, 2]: Updated coordinates.
+    """
+    N, K, H, W = heatmaps.shape
+    px = coords[..., 0].astype(int)
+    py = coords[..., 1].astype(int)
+    valid = (1 < px) & (px < W - 2) & (1 < py) & (py < H - 2)
+
+    # gather the 5x5 patches around the (clipped) locations
+    px = np.clip(px, 2, W - 3)
+    py = np.clip(py, 2, H - 3)
+    offsets = (np.arange(-2, 3)[:, None] * W + np.arange(-2, 3)).reshape(-1)
+    index = (py * W + px)[..., None] + offsets
+    patch = np.take_along_axis(
+        heatmaps.reshape(N, K, -1), index, axis=2).reshape(N, K, 5, 5)
+
+    dx = 0.5 * (patch[..., 2, 3] - patch[..., 2, 1])
+    dy = 0.5 * (patch[..., 3, 2] - patch[..., 1, 2])
+    dxx = 0.25 * (patch[..., 2, 4] - 2 * patch[..., 2, 2] + patch[..., 2, 0])
+    dxy = 0.25 * (
+        patch[..., 3, 3] - patch[..., 1, 3] - patch[..., 3, 1] +
+        patch[..., 1, 1])
+    dyy = 0.25 * (patch[..., 4, 2] - 2 * patch[..., 2, 2] + patch[..., 0, 2])
+    det = dxx * dyy - dxy**2
+    valid &= det != 0
+    det = np.where(valid, det, 1)
+
+    # offset = -hessian^-1 @ derivative
+    offset = -np.stack((dyy * dx - dxy * dy, dxx * dy - dxy * dx), axis=-1)
+    coords[valid] += (offset / det[..., None])[valid]
+    return coords
+
+
+def _shift_preds(preds, heatmaps, megvii=False):
+    """Add +/-0.25 shift to the predicted locations, towards the higher
+    neighbours in the heatmaps.
+
+    Note:
+        batch_size: N
+        num_keypoints: K
+        heatmap height: H
+        heatmap width: W
+
+    Args:
+        preds (np.ndarray[N, K, 2]): Predicted keypoint location.
+        heatmaps (np.ndarray[N, K, H, W]): model predicted heatmaps.
+        megvii (bool): Option to add the extra 0.5 shift of megvii.
+
+    Returns:
+        np.ndarray[N, K, 2]: Shifted keypoint location.
+    """
+    N, K, H, W = heatmaps.shape
+    px = preds[..., 0].astype(int)
+    py = preds[..., 1].astype(int)
+    valid = (1 < px) & (px < W - 1) & (1 < py) & (py < H - 1)
+
+    # clip the invalid locations so that all the neighbours are in range
+    index = (np.clip(py, 1, H - 2) * W + np.clip(px, 1, W - 2))[..., None]
+    neighbours = np.take_along_axis(
+        heatmaps.reshape(N, K, -1), index + np.array([1, -1, W, -W]), axis=2)
+    diff = np.stack((neighbours[..., 0] - neighbours[..., 1],
+                     neighbours[..., 2] - neighbours[..., 3]),
+                    axis=-1)
+    shift = np.sign(diff) * .25
+    if megvii:
+        shift += 0.5
+    preds[valid] += shift[valid]
+    return preds
+
+
+def _decode_heatmaps(heatmaps, post_process, kernel, valid_radius_factor,
+                     use_udp, target_type):
+    """Get keypoint predictions in the heatmap space from numpy heatmaps.
+
+    See :func:`keypoints_from_heatmaps` for the arguments.
+    """
+    # Avoid being affected
+    heatmaps = heatmaps.copy()
+
+    # start processing
+    if post_process == 'megvii':
+        heatmaps = _gaussian_blur(heatmaps, kernel=kernel)
+
+    N, K, H, W = heatmaps.shape
+    if use_udp:
+        if target_type.lower() == 'GaussianHeatMap'.lower():
+            preds, maxvals = _get_max_preds(heatmaps)
+            preds = post_dark_udp(preds, heatmaps, kernel=kernel)
+        elif target_type.lower() == 'CombinedTarget'.lower():
+            heatmaps = heatmaps.reshape(N, K // 3, 3, H, W)
+            heatmaps[:, :, 0] = _blur_heatmaps(heatmaps[:, :, 0],
+                                               2 * kernel + 1)
+            heatmaps[:, :, 1:] = _blur_heatmaps(
+                heatmaps[:, :, 1:].reshape(N, -1, H, W),
+                kernel).reshape(N, K // 3, 2, H, W)
+            # valid radius is in direct proportion to the height of heatmap.
+            valid_radius = valid_radius_factor * H
+            preds, maxvals = _get_max_preds(heatmaps[:, :, 0])
+            index = (preds[..., 0] + preds[..., 1] * W).astype(int)
+            offsets = np.take_along_axis(
+                heatmaps[:, :, 1:].reshape(N, K // 3, 2, -1),
+                index[..., None, None],
+                axis=3)
+            preds += offsets[..., 0] * valid_radius
+        else:
+            raise ValueError('target_type should be either '
+                             "'GaussianHeatmap' or 'CombinedTarget'")
+    else:
+        preds, maxvals = _get_max_preds(heatmaps)
+        if post_process == 'unbiased':  # alleviate biased coordinate
+            # apply Gaussian distribution modulation.
+            heatmaps = np.log(
+                np.maximum(_gaussian_blur(heatmaps, kernel), 1e-10))
+            preds = _taylor_batch(heatmaps, preds)
+        elif post_process is not None:
+            # add +/-0.25 shift to the predicted locations for higher acc.
+            preds = _shift_preds(
+                preds, heatmaps, megvii=post_process == 'megvii')
+
+    return preds, maxvals
+
+
+def _blur_heatmaps_tensor(heatmaps, kernel, border_type=cv2.BORDER_DEFAULT):
+    """Blur each heatmap with a Gaussian kernel on the device of the heatmaps.
+    The torch version of :func:`_blur_heatmaps`.
+
+    The separable Gaussian blur is applied as two matrix multiplications,
+    which is much faster than single-channel convolutions.
+
+    Args:
+        heatmaps (torch.Tensor[N, K, H, W]): model predicted heatmaps.
+        kernel (int): Gaussian kernel size.
+        border_type (int): Pixel extrapolation method of cv2, which should
+            be cv2.BORDER_DEFAULT or cv2.BORDER_CONSTANT.
+            Default: cv2.BORDER_DEFAULT.
+
+    Returns:
+        torch.Tensor[N, K, H, W]: Blurred heatmaps.
+    """
+    H, W = heatmaps.shape[2:]
+    matrix_y = heatmaps.new_tensor(_get_blur_matrix(H, kernel, border_type))
+    matrix_x = heatmaps.new_tensor(_get_blur_matrix(W, kernel, border_type))
+    return matrix_y @ heatmaps @ matrix_x.T
+
+
+def _gaussian_blur_tensor(heatmaps, kernel=11):
+    """Modulate heatmap distribution with Gaussian on the device of the
+    heatmaps. The torch version of :func:`_gaussian_blur`.
+
+    Args:
+        heatmaps (torch.Tensor[N, K, H, W]): model predicted heatmaps.
+        kernel (int): Gaussian kernel size (K) for modulation.
+
+    Returns:
+        torch.Tensor[N, K, H, W]: Modulated heatmap distribution.
+    """
+    assert kernel % 2 == 1
+
+    origin_max = heatmaps.flatten(2).max(dim=2, keepdim=True)[0][..., None]
+    heatmaps = _blur_heatmaps_tensor(
+        heatmaps, kernel, border_type=cv2.BORDER_CONSTANT)
+    return heatmaps * (
+        origin_max /
+        heatmaps.flatten(2).max(dim=2, keepdim=True)[0][..., None])
+
+
+def _taylor_tensor(heatmaps, coords):
+    """Distribution aware coordinate decoding method on the device of the
+    heatmaps. The torch version of :func:`_taylor_batch`.
+
+    Args:
+        heatmaps (torch.Tensor[N, K, H, W]): Heatmaps of the keypoints.
+        coords (torch.Tensor[N, K, 2]): Coordinates of the predicted
+            keypoints.
+
+    Returns:
+        torch.Tensor[N, K, 2]: Updated coordinates.
+    """
+    N, K, H, W = heatmaps.shape
+    px = coords[..., 0].long()
+    py = coords[..., 1].long()
+    valid = (1 < px) & (px < W - 2) & (1 < py) & (py < H - 2)
+
+    # gather the 5x5 patches around the (clamped) locations
+    index = (py.clamp(2, H - 3) * W + px.clamp(2, W - 3)).unsqueeze(-1)
+    offsets = torch.arange(-2, 3, device=index.device)
+    offsets = (offsets[:, None] * W + offsets).reshape(-1)
+    patch = heatmaps.reshape(N, K, -1).gather(2, index + offsets)
+    patch = patch.reshape(N, K, 5, 5)
+
+    dx = 0.5 * (patch[..., 2, 3] - patch[..., 2, 1])
+    dy = 0.5 * (patch[..., 3, 2] - patch[..., 1, 2])
+    dxx = 0.25 * (patch[..., 2, 4] - 2 * patch[..., 2, 2] + patch[..., 2, 0])
+    dxy = 0.25 * (
+        patch[..., 3, 3] - patch[..., 1, 3] - patch[..., 3, 1] +
+        patch[..., 1, 1])
+    dyy = 0.25 * (patch[..., 4, 2] - 2 * patch[..., 2, 2] + patch[..., 0, 2])
+    det = dxx * dyy - dxy**2
+    valid &= det != 0
+    det = torch.where(valid, det, torch.ones_like(det))
+
+    # offset = -hessian^-1 @ derivative
+    offset = -torch.stack((dyy * dx - dxy * dy, dxx * dy - dxy * dx), dim=-1)
+    offset = offset / det.unsqueeze(-1)
+    return torch.where(valid.unsqueeze(-1), coords + offset, coords)
+
+
+def _post_dark_udp_tensor(coords, heatmaps, kernel=3):
+    """DARK post-pocessing implemented by udp on the device of the heatmaps.
+    The torch version of :func:`post_dark_udp` for top-down heatmaps.
+
+    Args:
+        coords (torch.Tensor[N, K, 2]): Initial coordinates of human pose.
+        heatmaps (torch.Tensor[N, K, H, W]): model predicted heatmaps.
+        kernel (int): Gaussian kernel size (K) for modulation.
+
+    Returns:
+        torch.Tensor[N, K, 2]: Refined coordinates.
+    """
+    N, K, H, W = heatmaps.shape
+    heatmaps = _blur_heatmaps_tensor(heatmaps, kernel).clamp(0.001, 50).log()
+    # cv2.BORDER_REFLECT repeats the edges for a 1 pixel border
+    heatmaps = F.pad(heatmaps, (1, 1, 1, 1), mode='replicate')
+
+    px = coords[..., 0].long().clamp(0, W - 1) + 1
+    py = coords[..., 1].long().clamp(0, H - 1) + 1
+    index = (py * (W + 2) + px).unsqueeze(-1)
+    offsets = index.new_tensor([0, 1, W + 2, W + 3, -W - 3, -1, -W - 2])
+    i_, ix1, iy1, ix1y1, ix1_y1_, ix1_, iy1_ = heatmaps.reshape(
+        N, K, -1).gather(2, index + offsets).unbind(-1)
+
+    dx = 0.5 * (ix1 - ix1_)
+    dy = 0.5 * (iy1 - iy1_)
+    eps = torch.finfo(torch.float32).eps
+    dxx = ix1 - 2 * i_ + ix1_ + eps
+    dyy = iy1 - 2 * i_ + iy1_ + eps
+    dxy = 0.5 * (ix1y1 - ix1 - iy1 + i_ + i_ - ix1_ - iy1_ + ix1_y1_)
+    det = dxx * dyy - dxy**2
+    offset = torch.stack((dyy * dx - dxy * dy, dxx * dy - dxy * dx), dim=-1)
+    return coords - offset / det.unsqueeze(-1)
+
+
+def _shift_preds_tensor(preds, heatmaps, megvii=False):
+    """Add +/-0.25 shift to the predicted locations on the device of the
+    heatmaps. The torch version of :func:`_shift_preds`.
+
+    Args:
+        preds (torch.Tensor[N, K, 2]): Predicted keypoint location.
+        heatmaps (torch.Tensor[N, K, H, W]): model predicted heatmaps.
+        megvii (bool): Option to add the extra 0.5 shift of megvii.
+
+    Returns:
+        torch.Tensor[N, K, 2]: Shifted keypoint location.
+    """
+    N, K, H, W = heatmaps.shape
+    px = preds[..., 0].long()
+    py = preds[..., 1].long()
+    valid = (1 < px) & (px < W - 1) & (1 < py) & (py < H - 1)
+
+    # clamp the invalid locations so that all the neighbours are in range
+    index = (py.clamp(1, H - 2) * W + px.clamp(1, W - 2)).unsqueeze(-1)
+    neighbours = heatmaps.reshape(N, K, -1).gather(
+        2, index + index.new_tensor([1, -1, W, -W]))
+    diff = torch.stack((neighbours[..., 0] - neighbours[..., 1],
+                        neighbours[..., 2] - neighbours[..., 3]),
+                       dim=-1)
+    shift = torch.sign(diff).to(preds.dtype) * .25
+    if megvii:
+        shift += 0.5
+    return torch.where(valid.unsqueeze(-1), preds + shift, preds)
+
+
+def _decode_heatmaps_tensor(heatmaps, post_process, kernel,
+                            valid_radius_factor, use_udp, target_type):
+    """Get keypoint predictions in the heatmap space from torch heatmaps.
+
+    The heatmaps are decoded on their own device, and only the predictions
+    are copied to the host. See :func:`keypoints_from_heatmaps` for the
+    arguments.
+    """
+    heatmaps = heatmaps.detach().float()
+
+    # start processing
+    if post_process == 'megvii':
+        heatmaps = _gaussian_blur_tensor(heatmaps, kernel=kernel)
+
+    N, K, H, W = heatmaps.shape
+    if use_udp:
+        if target_type.lower() == 'GaussianHeatMap'.lower():
+            preds, maxvals = _get_max_preds_tensor(heatmaps)
+            preds = _post_dark_udp_tensor(preds, heatmaps, kernel=kernel)
+        elif target_type.lower() == 'CombinedTarget'.lower():
+            heatmaps = heatmaps.reshape(N, K // 3, 3, H, W)
+            response = _blur_heatmaps_tensor(heatmaps[:, :, 0], 2 * kernel + 1)
+            offsets = _blur_heatmaps_tensor(
+                heatmaps[:, :, 1:].reshape(N, -1, H, W), kernel)
+            # valid radius is in direct proportion to the height of heatmap.
+            valid_radius = valid_radius_factor * H
+            preds, maxvals = _get_max_preds_tensor(response)
+            index = (preds[..., 0] + preds[..., 1] * W).long().clamp(min=0)
+            offsets = offsets.reshape(N, K // 3, 2, -1).gather(
+                3, index[..., None, None].expand(-1, -1, 2, -1))
+            preds = preds + offsets[..., 0] * valid_radius
+        else:
+            raise ValueError('target_type should be either '
+                             "'GaussianHeatmap' or 'CombinedTarget'")
+    else:
+        preds, maxvals = _get_max_preds_tensor(heatmaps)
+        if post_process == 'unbiased':  # alleviate biased coordinate
+            # apply Gaussian distribution modulation.
+            heatmaps = _gaussian_blur_tensor(heatmaps, kernel)
+            preds = _taylor_tensor(heatmaps.clamp(min=1e-10).log(), preds)
+        elif post_process is not None:
+            # add +/-0.25 shift to the predicted locations for higher acc.
+            preds = _shift_preds_tensor(
+                preds, heatmaps, megvii=post_process == 'megvii')
+
+    # copy the predictions to the host at once
+    preds_and_maxvals = torch.cat((preds, maxvals), dim=2).cpu().numpy()
+    return preds_and_maxvals[..., :2], preds_and_maxvals[..., 2:]
+
+
 def keypoints_from_regression(regression_preds, center, scale, img_size):
     """Get final keypoint predictions from regression vectors and transform
     them back to the image.
@@ -486,7 +899,9 @@ def keypoints_from_heatmaps(heatmaps,
         heatmap width: W
 
     Args:
-        heatmaps (np.ndarray[N, K, H, W]): model predicted heatmaps.
+        heatmaps (np.ndarray[N, K, H, W] | torch.Tensor[N, K, H, W]): model
+            predicted heatmaps. Tensors are decoded on their own device, and
+            only the keypoints are copied to the host.
         center (np.ndarray[N, 2]): Center of the bounding box (x, y).
         scale (np.ndarray[N, 2]): Scale of the bounding box
             wrt height/width.
@@ -518,9 +933,6 @@ def keypoints_from_heatmaps(heatmaps,
         - preds (np.ndarray[N, K, 2]): Predicted keypoint location in images.
         - maxvals (np.ndarray[N, K, 1]): Scores (confidence) of the keypoints.
     """
-    # Avoid being affected
-    heatmaps = heatmaps.copy()
-
     # detect conflicts
     if unbiased:
         assert post_process not in [False, None, 'megvii']
@@ -555,62 +967,23 @@ def keypoints_from_heatmaps(heatmaps,
                 "post_process='unbiased' instead", DeprecationWarning)
             post_process = 'unbiased'
 
-    # start processing
-    if post_process == 'megvii':
-        heatmaps = _gaussian_blur(heatmaps, kernel=kernel)
-
     N, K, H, W = heatmaps.shape
-    if use_udp:
-        if target_type.lower() == 'GaussianHeatMap'.lower():
-            preds, maxvals = _get_max_preds(heatmaps)
-            preds = post_dark_udp(preds, heatmaps, kernel=kernel)
-        elif target_type.lower() == 'CombinedTarget'.lower():
-            for person_heatmaps in heatmaps:
-                for i, heatmap in enumerate(person_heatmaps):
-                    kt = 2 * kernel + 1 if i % 3 == 0 else kernel
-                    cv2.GaussianBlur(heatmap, (kt, kt), 0, heatmap)
-            # valid radius is in direct proportion to the height of heatmap.
-            valid_radius = valid_radius_factor * H
-            offset_x = heatmaps[:, 1::3, :].flatten() * valid_radius
-            offset_y = heatmaps[:, 2::3, :].flatten() * valid_radius
-            heatmaps = heatmaps[:, ::3, :]
-            preds, maxvals = _get_max_preds(heatmaps)
-            index = preds[..., 0] + preds[..., 1] * W
-            index += W * H * np.arange(0, N * K / 3)
-            index = index.astype(int).reshape(N, K // 3, 1)
-            preds += np.concatenate((offset_x[index], offset_y[index]), axis=2)
-        else:
-            raise ValueError('target_type should be either '
-                             "'GaussianHeatmap' or 'CombinedTarget'")
+    if isinstance(heatmaps, torch.Tensor):
+        preds, maxvals = _decode_heatmaps_tensor(heatmaps, post_process,
+                                                 kernel, valid_radius_factor,
+                                                 use_udp, target_type)
     else:
-        preds, maxvals = _get_max_preds(heatmaps)
-        if post_process == 'unbiased':  # alleviate biased coordinate
-            # apply Gaussian distribution modulation.
-            heatmaps = np.log(
-                np.maximum(_gaussian_blur(heatmaps, kernel), 1e-10))
-            for n in range(N):
-                for k in range(K):
-                    preds[n][k] = _taylor(heatmaps[n][k], preds[n][k])
-        elif post_process is not None:
-            # add +/-0.25 shift to the predicted locations for higher acc.
-            for n in range(N):
-                for k in range(K):
-                    heatmap = heatmaps[n][k]
-                    px = int(preds[n][k][0])
-                    py = int(preds[n][k][1])
-                    if 1 < px < W - 1 and 1 < py < H - 1:
-                        diff = np.array([
-                            heatmap[py][px + 1] - heatmap[py][px - 1],
-                            heatmap[py + 1][px] - heatmap[py - 1][px]
-                        ])
-                        preds[n][k] += np.sign(diff) * .25
-                        if post_process == 'megvii':
-                            preds[n][k] += 0.5
+        preds, maxvals = _decode_heatmaps(heatmaps, post_process, kernel,
+                                          valid_radius_factor, use_udp,
+                                          target_type)
 
     # Transform back to the image
-    for i in range(N):
-        preds[i] = transform_preds(
-            preds[i], center[i], scale[i], [W, H], use_udp=use_udp)
+    scale = scale * 200.0
+    if use_udp:
+        scale_xy = scale / (np.array([W, H]) - 1.0)
+    else:
+        scale_xy = scale / np.array([W, H])
+    preds[...] = preds * scale_xy[:, None] + (center - scale * 0.5)[:, None]
 
     if post_process == 'megvii':
         maxvals = maxvals / 255.0 + 0.5
@@ -1,13 +1,17 @@
-from .nms import oks_iou, oks_nms, soft_oks_nms
-from .one_euro_filter import OneEuroFilter
+from .nms import (batched_oks_nms, oks_iou, oks_iou_matrix, oks_nms,
+                  oks_nms_array, soft_oks_nms, soft_oks_nms_array)
+from .one_euro_filter import BatchedOneEuroFilter, OneEuroFilter
 from .post_transforms import (affine_transform, flip_back, fliplr_joints,
                               fliplr_regression, get_affine_transform,
-                              get_warp_matrix, rotate_point, transform_preds,
-                              warp_affine_joints)
+                              get_affine_transform_batch, get_warp_matrix,
+                              get_warp_matrix_batch, rotate_point,
+                              transform_preds, warp_affine_joints)
 
 __all__ = [
     'oks_nms', 'soft_oks_nms', 'affine_transform', 'rotate_point', 'flip_back',
     'fliplr_joints', 'fliplr_regression', 'transform_preds',
     'get_affine_transform', 'get_warp_matrix', 'warp_affine_joints',
-    'OneEuroFilter', 'oks_iou'
+    'OneEuroFilter', 'oks_iou', 'get_affine_transform_batch',
+    'get_warp_matrix_batch', 'BatchedOneEuroFilter', 'oks_iou_matrix',
+    'oks_nms_array', 'soft_oks_nms_array', 'batched_oks_nms'
 ]
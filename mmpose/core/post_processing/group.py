@@ -6,6 +6,7 @@
 import numpy as np
 import torch
 from munkres import Munkres
+from scipy.optimize import linear_sum_assignment
 
 from mmpose.core.evaluation import post_dark_udp
 
@@ -25,9 +26,56 @@ def _py_max_match(scores):
     return tmp
 
 
+def _scipy_max_match(scores):
+    """Apply the Hungarian algorithm of scipy to get the best match.
+
+    It gives the same optimal assignment as :func:`_py_max_match`, but is
+    implemented in C and is much faster for many people.
+
+    Args:
+        scores(np.ndarray): cost matrix.
+
+    Returns:
+        np.ndarray: best match.
+    """
+    rows, cols = linear_sum_assignment(scores)
+    return np.stack((rows, cols), axis=1).astype(int)
+
+
+def _greedy_max_match(scores):
+    """Greedily match the pairs with the lowest cost first.
+
+    The result is not guaranteed to be optimal, but each step only takes one
+    vectorized search over the cost matrix.
+
+    Args:
+        scores(np.ndarray): cost matrix.
+
+    Returns:
+        np.ndarray: best match.
+    """
+    scores = np.array(scores, dtype=np.float64)
+    num_rows, num_cols = scores.shape
+    pairs = np.zeros((min(num_rows, num_cols), 2), dtype=int)
+    for i in range(len(pairs)):
+        row, col = np.unravel_index(np.argmin(scores), scores.shape)
+        pairs[i] = row, col
+        scores[row, :] = np.inf
+        scores[:, col] = np.inf
+    # sort by rows as the other matchers
+    return pairs[np.argsort(pairs[:, 0])]
+
+
+_MATCHERS = {
+    'munkres': _py_max_match,
+    'scipy': _scipy_max_match,
+    'greedy': _greedy_max_match
+}
+
+
 def _match_by_tag(inp, params):
-    """Match joints by tags. Use Munkres algorithm to calculate the best match
-    for keypoints grouping.
+    """Match joints by tags. Use the assignment algorithm set by
+    ``params.assignment`` to calculate the best match for keypoints grouping.
 
     Note:
         number of keypoints: K
@@ -51,6 +99,7 @@ def _match_by_tag(inp, params):
     assert isinstance(params, _Params), 'params should be class _Params()'
 
     tag_k, loc_k, val_k = inp
+    max_match = _MATCHERS[params.assignment]
 
     default_ = np.zeros((params.num_joints, 3 + tag_k.shape[2]),
                         dtype=np.float32)
@@ -99,7 +148,7 @@ def _match_by_tag(inp, params):
                               dtype=np.float32) + 1e10),
                     axis=1)
 
-            pairs = _py_max_match(diff_normed)
+            pairs = max_match(diff_normed)
             for row, col in pairs:
                 if (row < num_added and col < num_grouped
                         and diff_saved[row][col] < params.tag_threshold):
@@ -131,6 +180,10 @@ class _Params:
         self.tag_threshold = cfg['tag_threshold']
         self.use_detection_val = cfg['use_detection_val']
         self.ignore_too_much = cfg['ignore_too_much']
+        self.assignment = cfg.get('assignment', 'munkres')
+        assert self.assignment in _MATCHERS, \
+            f'assignment should be one of {list(_MATCHERS)}, ' \
+            f'but got {self.assignment}'
 
         if self.num_joints == 17:
             self.joint_order = [
@@ -256,25 +309,29 @@ class HeatmapParser:
         """
         _, _, H, W = heatmaps.shape
         for batch_id, people in enumerate(ans):
-            for people_id, people_i in enumerate(people):
-                for joint_id, joint in enumerate(people_i):
-                    if joint[2] > 0:
-                        x, y = joint[0:2]
-                        xx, yy = int(x), int(y)
-                        tmp = heatmaps[batch_id][joint_id]
-                        if tmp[min(H - 1, yy + 1), xx] > tmp[max(0, yy - 1),
-                                                             xx]:
-                            y += 0.25
-                        else:
-                            y -= 0.25
-
-                        if tmp[yy, min(W - 1, xx + 1)] > tmp[yy,
-                                                             max(0, xx - 1)]:
-                            x += 0.25
-                        else:
-                            x -= 0.25
-                        ans[batch_id][people_id, joint_id,
-                                      0:2] = (x + 0.5, y + 0.5)
+            if len(people) == 0:
+                continue
+            joint_ids = np.arange(people.shape[1])
+            xx = people[..., 0].astype(int)
+            yy = people[..., 1].astype(int)
+
+            # look up the neighbours of all the joints at once, in the order
+            # of bottom, top, right and left
+            bottom = np.minimum(H - 1, yy + 1)
+            top = np.maximum(0, yy - 1)
+            right = np.minimum(W - 1, xx + 1)
+            left = np.maximum(0, xx - 1)
+            ys = np.stack((bottom, top, yy, yy))
+            xs = np.stack((xx, xx, right, left))
+            neighbours = heatmaps[batch_id][joint_ids, ys, xs]
+            if isinstance(neighbours, torch.Tensor):
+                neighbours = neighbours.cpu().numpy()
+
+            dy = np.where(neighbours[0] > neighbours[1], 0.25, -0.25)
+            dx = np.where(neighbours[2] > neighbours[3], 0.25, -0.25)
+            detected = people[..., 2] > 0
+            people[detected, 0] += dx[detected] + 0.5
+            people[detected, 1] += dy[detected] + 0.5
         return ans
 
     @staticmethod
@@ -298,61 +355,91 @@ class HeatmapParser:
         Returns:
             np.ndarray: The refined keypoints.
         """
+        return HeatmapParser.refine_batch(
+            torch.from_numpy(heatmap), torch.from_numpy(tag), keypoints[None],
+            use_udp)[0]
 
-        K, H, W = heatmap.shape
-        if len(tag.shape) == 3:
-            tag = tag[..., None]
+    @staticmethod
+    def refine_batch(heatmap, tag, keypoints, use_udp=False):
+        """Given initial keypoint predictions of all the people in an image,
+        we identify missing joints.
+
+        The missing joints of all the people are searched at once on the
+        device of the heatmaps, and only the found joints are copied to the
+        host.
 
-        tags = []
-        for i in range(K):
-            if keypoints[i, 2] > 0:
-                # save tag value of detected keypoint
-                x, y = keypoints[i][:2].astype(int)
-                x = np.clip(x, 0, W - 1)
-                y = np.clip(y, 0, H - 1)
-                tags.append(tag[i, y, x])
+        Note:
+            number of people: M
+            number of keypoints: K
+            heatmap height: H
+            heatmap width: W
+            dim of tags: L
+                If use flip testing, L=2; else L=1.
+
+        Args:
+            heatmap: torch.Tensor(K, H, W).
+            tag: torch.Tensor(K, H, W) |  torch.Tensor(K, H, W, L)
+            keypoints: np.ndarray of size (M, K, 3 + L)
+                        last dim is (x, y, score, tag).
+            use_udp: bool-unbiased data processing
 
-        # mean tag of current detected people
-        prev_tag = np.mean(tags, axis=0)
-        ans = []
+        Returns:
+            np.ndarray: The refined keypoints.
+        """
+        M, K = keypoints.shape[:2]
+        _, H, W = heatmap.shape
+        if tag.dim() == 3:
+            tag = tag[..., None]
 
-        for _heatmap, _tag in zip(heatmap, tag):
+        # mean tag of the detected keypoints of each person
+        x = np.clip(keypoints[..., 0].astype(int), 0, W - 1)
+        y = np.clip(keypoints[..., 1].astype(int), 0, H - 1)
+        detected = torch.from_numpy(keypoints[..., 2] > 0).to(tag)
+        prev_tag = (tag[np.arange(K), y, x] * detected[..., None]).sum(dim=1)
+        prev_tag /= detected.sum(dim=1)[:, None]
+
+        # only search for the joints which are not detected
+        person_ids, joint_ids = np.nonzero(keypoints[..., 2] == 0)
+        if len(person_ids) == 0:
+            return keypoints
+
+        index = heatmap.new_empty(len(joint_ids), dtype=torch.long)
+        for joint_id in np.unique(joint_ids):
+            missing = np.nonzero(joint_ids == joint_id)[0]
             # distance of all tag values with mean tag of
             # current detected people
-            distance_tag = (((_tag -
-                              prev_tag[None, None, :])**2).sum(axis=2)**0.5)
-            norm_heatmap = _heatmap - np.round(distance_tag)
+            distance_tag = (prev_tag[person_ids[missing], None] -
+                            tag[joint_id].reshape(1, H * W, -1)).norm(dim=-1)
+            norm_heatmap = heatmap[joint_id].reshape(1, -1) - \
+                torch.round(distance_tag)
 
             # find maximum position
-            y, x = np.unravel_index(np.argmax(norm_heatmap), _heatmap.shape)
-            xx = x.copy()
-            yy = y.copy()
-            # detection score at maximum position
-            val = _heatmap[y, x]
-            if not use_udp:
-                # offset by 0.5
-                x += 0.5
-                y += 0.5
-
-            # add a quarter offset
-            if _heatmap[yy, min(W - 1, xx + 1)] > _heatmap[yy, max(0, xx - 1)]:
-                x += 0.25
-            else:
-                x -= 0.25
-
-            if _heatmap[min(H - 1, yy + 1), xx] > _heatmap[max(0, yy - 1), xx]:
-                y += 0.25
-            else:
-                y -= 0.25
-
-            ans.append((x, y, val))
-        ans = np.array(ans)
-
-        if ans is not None:
-            for i in range(K):
-                # add keypoint if it is not detected
-                if ans[i, 2] > 0 and keypoints[i, 2] == 0:
-                    keypoints[i, :3] = ans[i, :3]
+            index[missing] = norm_heatmap.argmax(dim=1)
+        joint_ids = torch.from_numpy(joint_ids).to(index)
+        yy = index // W
+        xx = index % W
+        # detection score at maximum position
+        val = heatmap[joint_ids, yy, xx]
+        x = xx.to(heatmap.dtype)
+        y = yy.to(heatmap.dtype)
+        if not use_udp:
+            # offset by 0.5
+            x += 0.5
+            y += 0.5
+
+        # add a quarter offset
+        right = heatmap[joint_ids, yy, (xx + 1).clamp(max=W - 1)]
+        left = heatmap[joint_ids, yy, (xx - 1).clamp(min=0)]
+        bottom = heatmap[joint_ids, (yy + 1).clamp(max=H - 1), xx]
+        top = heatmap[joint_ids, (yy - 1).clamp(min=0), xx]
+        x += (right > left).to(x.dtype) * 0.5 - 0.25
+        y += (bottom > top).to(y.dtype) * 0.5 - 0.25
+
+        ans = torch.stack((x, y, val), dim=1).cpu().numpy()
+        # add keypoint if it is not detected
+        found = ans[:, 2] > 0
+        keypoints[person_ids[found], joint_ids.cpu().numpy()[found], :3] = \
+            ans[found]
 
         return keypoints
 
@@ -392,15 +479,13 @@ class HeatmapParser:
 
         if refine:
             ans = ans[0]
-            # for every detected person
-            for i in range(len(ans)):
-                heatmap_numpy = heatmaps[0].cpu().numpy()
-                tag_numpy = tags[0].cpu().numpy()
+            # for all the detected people at once
+            if len(ans) > 0:
+                tag = tags[0]
                 if not self.tag_per_joint:
-                    tag_numpy = np.tile(tag_numpy,
-                                        (self.params.num_joints, 1, 1, 1))
-                ans[i] = self.refine(
-                    heatmap_numpy, tag_numpy, ans[i], use_udp=self.use_udp)
+                    tag = tag.expand(self.params.num_joints, *tag.shape[1:])
+                ans = self.refine_batch(
+                    heatmaps[0], tag, ans, use_udp=self.use_udp)
             ans = [ans]
 
         return ans, scores
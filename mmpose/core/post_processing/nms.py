@@ -62,28 +62,60 @@ def oks_iou(g, d, a_g, a_d, sigmas=None, vis_thr=None):
     Returns:
         list: The oks ious.
     """
+    g = np.asarray(g).reshape(1, -1, 3)
+    d = np.asarray(d).reshape(len(d), g.shape[1], 3)
+    return oks_iou_matrix(g, d, [a_g], a_d, sigmas, vis_thr)[0]
+
+
+def oks_iou_matrix(kpts_g,
+                   kpts_d,
+                   areas_g,
+                   areas_d,
+                   sigmas=None,
+                   vis_thr=None):
+    """Calculate the oks ious between every pair of the ground truth and the
+    detected poses at once.
+
+    Note:
+        As in :func:`oks_iou`, only the visibility of the detected keypoints
+        is thresholded with ``vis_thr``.
+
+    Args:
+        kpts_g (np.ndarray[N, K, 3]): Ground truth keypoints.
+        kpts_d (np.ndarray[M, K, 3]): Detected keypoints.
+        areas_g (np.ndarray[N]): Areas of the ground truth objects.
+        areas_d (np.ndarray[M]): Areas of the detected objects.
+        sigmas: standard deviation of keypoint labelling.
+        vis_thr: threshold of the keypoint visibility.
+
+    Returns:
+        np.ndarray[N, M]: The oks ious.
+    """
     if sigmas is None:
         sigmas = np.array([
             .26, .25, .25, .35, .35, .79, .79, .72, .72, .62, .62, 1.07, 1.07,
             .87, .87, .89, .89
         ]) / 10.0
     vars = (sigmas * 2)**2
-    xg = g[0::3]
-    yg = g[1::3]
-    vg = g[2::3]
-    ious = np.zeros(len(d), dtype=np.float32)
-    for n_d in range(0, len(d)):
-        xd = d[n_d, 0::3]
-        yd = d[n_d, 1::3]
-        vd = d[n_d, 2::3]
-        dx = xd - xg
-        dy = yd - yg
-        e = (dx**2 + dy**2) / vars / ((a_g + a_d[n_d]) / 2 + np.spacing(1)) / 2
-        if vis_thr is not None:
-            ind = list(vg > vis_thr) and list(vd > vis_thr)
-            e = e[ind]
-        ious[n_d] = np.sum(np.exp(-e)) / len(e) if len(e) != 0 else 0.0
-    return ious
+    kpts_g = np.asarray(kpts_g)
+    kpts_d = np.asarray(kpts_d)
+    areas_g = np.asarray(areas_g)
+    areas_d = np.asarray(areas_d)
+
+    dx = kpts_d[None, :, :, 0] - kpts_g[:, None, :, 0]
+    dy = kpts_d[None, :, :, 1] - kpts_g[:, None, :, 1]
+    scales = (areas_g[:, None] + areas_d[None, :]) / 2 + np.spacing(1)
+    e = (dx**2 + dy**2) / vars / scales[..., None] / 2
+    oks = np.exp(-e)
+    if vis_thr is None:
+        num_valid = np.full(oks.shape[:2], oks.shape[2])
+    else:
+        valid = np.broadcast_to(kpts_d[None, :, :, 2] > vis_thr, oks.shape)
+        oks = np.where(valid, oks, 0)
+        num_valid = valid.sum(axis=-1)
+    ious = oks.sum(axis=-1) / np.maximum(num_valid, 1)
+    ious[num_valid == 0] = 0.0
+    return ious.astype(np.float32)
 
 
 def oks_nms(kpts_db, thr, sigmas=None, vis_thr=None):
@@ -105,20 +137,44 @@ def oks_nms(kpts_db, thr, sigmas=None, vis_thr=None):
     kpts = np.array([k['keypoints'].flatten() for k in kpts_db])
     areas = np.array([k['area'] for k in kpts_db])
 
-    order = scores.argsort()[::-1]
+    return oks_nms_array(
+        kpts.reshape(len(kpts), -1, 3), scores, areas, thr, sigmas, vis_thr)
 
-    keep = []
-    while len(order) > 0:
-        i = order[0]
-        keep.append(i)
 
-        oks_ovr = oks_iou(kpts[i], kpts[order[1:]], areas[i], areas[order[1:]],
-                          sigmas, vis_thr)
+def oks_nms_array(kpts, scores, areas, thr, sigmas=None, vis_thr=None):
+    """OKS NMS on the arrays of the poses.
 
-        inds = np.where(oks_ovr <= thr)[0]
-        order = order[inds + 1]
+    The oks ious between all the poses are computed at once before the
+    suppression.
+
+    Args:
+        kpts (np.ndarray[N, K, 3]): keypoints.
+        scores (np.ndarray[N]): scores of the poses.
+        areas (np.ndarray[N]): areas of the poses.
+        thr: Retain overlap < thr.
+        sigmas: standard deviation of keypoint labelling.
+        vis_thr: threshold of the keypoint visibility.
+
+    Returns:
+        np.ndarray: indexes to keep.
+    """
+    if len(kpts) == 0:
+        return np.zeros(0, dtype=np.intp)
+
+    oks = oks_iou_matrix(kpts, kpts, areas, areas, sigmas, vis_thr)
+    # oks[i, j] is the overlap of the pose j with the kept pose i
+    suppress = ~(oks <= thr)
+
+    order = np.asarray(scores).argsort()[::-1]
+    suppressed = np.zeros(len(kpts), dtype=bool)
+    keep = []
+    for i in order:
+        if suppressed[i]:
+            continue
+        keep.append(i)
+        suppressed |= suppress[i]
 
-    keep = np.array(keep)
+    keep = np.array(keep, dtype=np.intp)
 
     return keep
 
@@ -166,6 +222,40 @@ def soft_oks_nms(kpts_db, thr, max_dets=20, sigmas=None, vis_thr=None):
     kpts = np.array([k['keypoints'].flatten() for k in kpts_db])
     areas = np.array([k['area'] for k in kpts_db])
 
+    return soft_oks_nms_array(
+        kpts.reshape(len(kpts), -1, 3), scores, areas, thr, max_dets, sigmas,
+        vis_thr)
+
+
+def soft_oks_nms_array(kpts,
+                       scores,
+                       areas,
+                       thr,
+                       max_dets=20,
+                       sigmas=None,
+                       vis_thr=None):
+    """Soft OKS NMS on the arrays of the poses.
+
+    The oks ious between all the poses are computed at once before the
+    rescoring.
+
+    Args:
+        kpts (np.ndarray[N, K, 3]): keypoints.
+        scores (np.ndarray[N]): scores of the poses.
+        areas (np.ndarray[N]): areas of the poses.
+        thr: retain oks overlap < thr.
+        max_dets: max number of detections to keep.
+        sigmas: Keypoint labelling uncertainty.
+
+    Returns:
+        np.ndarray: indexes to keep.
+    """
+    if len(kpts) == 0:
+        return np.zeros(0, dtype=np.intp)
+
+    oks = oks_iou_matrix(kpts, kpts, areas, areas, sigmas, vis_thr)
+
+    scores = np.array(scores)
     order = scores.argsort()[::-1]
     scores = scores[order]
 
@@ -174,8 +264,7 @@ def soft_oks_nms(kpts_db, thr, max_dets=20, sigmas=None, vis_thr=None):
     while len(order) > 0 and keep_cnt < max_dets:
         i = order[0]
 
-        oks_ovr = oks_iou(kpts[i], kpts[order[1:]], areas[i], areas[order[1:]],
-                          sigmas, vis_thr)
+        oks_ovr = oks[i, order[1:]]
 
         order = order[1:]
         scores = _rescore(oks_ovr, scores[1:], thr)
@@ -190,3 +279,50 @@ def soft_oks_nms(kpts_db, thr, max_dets=20, sigmas=None, vis_thr=None):
     keep = keep[:keep_cnt]
 
     return keep
+
+
+def batched_oks_nms(kpts,
+                    scores,
+                    areas,
+                    offsets,
+                    thr,
+                    soft=False,
+                    max_dets=20,
+                    sigmas=None,
+                    vis_thr=None):
+    """OKS NMS (or soft OKS NMS) on the poses of many images in one call.
+
+    The poses of all the images are concatenated, and the poses of the i-th
+    image are ``kpts[offsets[i]:offsets[i + 1]]``. The poses of different
+    images do not suppress each other.
+
+    Args:
+        kpts (np.ndarray[N, K, 3]): keypoints of all the images.
+        scores (np.ndarray[N]): scores of the poses.
+        areas (np.ndarray[N]): areas of the poses.
+        offsets (np.ndarray[M + 1]): the index of the first pose of each
+            image, followed by the total number of the poses N.
+        thr: retain oks overlap < thr.
+        soft (bool): whether to use soft OKS NMS. Default: False.
+        max_dets: max number of detections to keep in each image, only used
+            by soft OKS NMS.
+        sigmas: standard deviation of keypoint labelling.
+        vis_thr: threshold of the keypoint visibility.
+
+    Returns:
+        np.ndarray: indexes to keep, of the images in order.
+    """
+    keep = []
+    for start, end in zip(offsets[:-1], offsets[1:]):
+        if soft:
+            _keep = soft_oks_nms_array(kpts[start:end], scores[start:end],
+                                       areas[start:end], thr, max_dets, sigmas,
+                                       vis_thr)
+        else:
+            _keep = oks_nms_array(kpts[start:end], scores[start:end],
+                                  areas[start:end], thr, sigmas, vis_thr)
+        keep.append(_keep + start)
+
+    if len(keep) == 0:
+        return np.zeros(0, dtype=np.intp)
+    return np.concatenate(keep)
@@ -99,3 +99,156 @@ class OneEuroFilter:
         self.mask_prev = mask
 
         return x_hat
+
+
+class BatchedOneEuroFilter:
+
+    def __init__(self, min_cutoff=1.7, beta=0.3, d_cutoff=30.0, fps=None):
+        """One Euro Filter for the keypoints of many tracks at once.
+
+        Each track is filtered the same as with its own
+        :class:`OneEuroFilter`, but the states of all the tracks are kept in
+        contiguous arrays, so that all the tracks of a frame are filtered with
+        one vectorized call.
+
+        Example:
+            >>> one_euro = BatchedOneEuroFilter(fps=30)
+            >>> for frame in frames:
+            ...     # keypoints: np.ndarray[N, K, 2] of N tracked people
+            ...     keypoints = one_euro(track_ids, keypoints)
+            ...     one_euro.remove(lost_track_ids)
+
+        Args:
+            min_cutoff (float): parameter for one euro filter
+            beta (float): parameter for one euro filter
+            d_cutoff (float): Input data FPS
+            fps (float): Video FPS for video inference
+        """
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.realtime = fps is None
+        if self.realtime:
+            # Using in realtime inference
+            self.d_cutoff = d_cutoff
+            self.skip_frame_factor = d_cutoff
+        else:
+            # fps using video inference
+            self.d_cutoff = float(fps)
+
+        # The states of the tracks, one row per track.
+        self.track_ids = np.zeros(0, dtype=int)
+        self.x_prev = None
+        self.dx_prev = None
+        self.t_prev = np.zeros(0)
+        self._rows = {}
+
+    def __len__(self):
+        return len(self.track_ids)
+
+    def add(self, track_ids, x0, dx0=0.0):
+        """Add new tracks.
+
+        Args:
+            track_ids (Sequence[int]): The ids of the N new tracks.
+            x0 (np.ndarray[N, K, 2]): Initialize keypoints value
+            dx0 (float): 0.0
+        """
+        track_ids = np.asarray(track_ids, dtype=int).reshape(-1)
+        assert len(track_ids) == len(x0)
+        assert not any(track_id in self._rows for track_id in track_ids)
+        if len(track_ids) == 0:
+            return
+
+        x0 = np.asarray(x0, dtype=float)
+        t = time() if self.realtime else 0
+        if self.x_prev is None:
+            self.x_prev = np.zeros((0, ) + x0.shape[1:])
+            self.dx_prev = np.zeros((0, ) + x0.shape[1:])
+        self._rows.update(
+            (track_id, i)
+            for i, track_id in enumerate(track_ids, len(self.track_ids)))
+        self.track_ids = np.concatenate((self.track_ids, track_ids))
+        self.x_prev = np.concatenate((self.x_prev, x0))
+        self.dx_prev = np.concatenate((self.dx_prev, np.full(x0.shape, dx0)))
+        self.t_prev = np.concatenate((self.t_prev, np.full(len(x0), t)))
+
+    def remove(self, track_ids):
+        """Remove tracks. The ids which are not tracked are ignored.
+
+        Args:
+            track_ids (Sequence[int]): The ids of the tracks to remove.
+        """
+        keep = ~np.isin(self.track_ids, track_ids)
+        if keep.all():
+            return
+        self.track_ids = self.track_ids[keep]
+        self.x_prev = self.x_prev[keep]
+        self.dx_prev = self.dx_prev[keep]
+        self.t_prev = self.t_prev[keep]
+        self._rows = {
+            track_id: i
+            for i, track_id in enumerate(self.track_ids.tolist())
+        }
+
+    def __call__(self, track_ids, x, t_e=1.0):
+        """Compute the filtered signal of the tracks.
+
+        The tracks which are not added yet are added with ``x`` as the
+        initial value, which is returned as it is.
+
+        Args:
+            track_ids (Sequence[int]): The ids of the N tracks.
+            x (np.ndarray[N, K, 2]): keypoints results in frame
+            t_e (Optional): video skip frame count for posetrack
+                evaluation
+
+        Returns:
+            np.ndarray[N, K, 2]: The filtered keypoints.
+        """
+        track_ids = np.asarray(track_ids, dtype=int).reshape(-1)
+        assert len(track_ids) == len(x)
+        x = np.asarray(x, dtype=float)
+
+        is_new = np.array(
+            [track_id not in self._rows for track_id in track_ids], dtype=bool)
+        if is_new.any():
+            self.add(track_ids[is_new], x[is_new])
+        x_hat = x.copy()
+        if is_new.all():
+            return x_hat
+
+        rows = np.array(
+            [self._rows[track_id] for track_id in track_ids[~is_new]])
+        x = x[~is_new]
+        assert x.shape[1:] == self.x_prev.shape[1:]
+
+        if self.realtime:
+            t = time()
+            t_e = (t - self.t_prev[rows]) * self.skip_frame_factor
+            t_e = t_e.reshape((-1, ) + (1, ) * (x.ndim - 1))
+        else:
+            t = 0
+
+        # missing keypoints mask
+        mask = x <= 0
+
+        # The filtered derivative of the signal.
+        a_d = smoothing_factor(t_e, self.d_cutoff)
+        dx = (x - self.x_prev[rows]) / t_e
+        dx_hat = exponential_smoothing(a_d, dx, self.dx_prev[rows])
+
+        # The filtered signal.
+        cutoff = self.min_cutoff + self.beta * np.abs(dx_hat)
+        a = smoothing_factor(t_e, cutoff)
+        x_filtered = exponential_smoothing(a, x, self.x_prev[rows])
+
+        # missing keypoints remove
+        x_filtered[mask] = -10
+
+        # Memorize the previous values.
+        self.x_prev[rows] = x_filtered
+        self.dx_prev[rows] = dx_hat
+        self.t_prev[rows] = t
+
+        x_hat[~is_new] = x_filtered
+        return x_hat
@@ -7,6 +7,7 @@ import math
 
 import cv2
 import numpy as np
+import torch
 
 
 def fliplr_joints(joints_3d, joints_3d_visible, img_width, flip_pairs):
@@ -115,14 +116,16 @@ def flip_back(output_flipped, flip_pairs, target_type='GaussianHeatmap'):
         heatmap width: W
 
     Args:
-        output_flipped (np.ndarray[N, K, H, W]): The output heatmaps obtained
-            from the flipped images.
+        output_flipped (np.ndarray[N, K, H, W] | torch.Tensor[N, K, H, W]):
+            The output heatmaps obtained from the flipped images. Tensors
+            are flipped on their own device.
         flip_pairs (list[tuple()): Pairs of keypoints which are mirrored
             (for example, left ear -- right ear).
         target_type (str): GaussianHeatmap or CombinedTarget
 
     Returns:
-        np.ndarray: heatmaps that flipped back to the original image
+        np.ndarray | torch.Tensor: heatmaps that flipped back to the original
+            image, of the same type as ``output_flipped``.
     """
     assert output_flipped.ndim == 4, \
         'output_flipped should be [batch_size, num_keypoints, height, width]'
@@ -133,7 +136,10 @@ def flip_back(output_flipped, flip_pairs, target_type='GaussianHeatmap'):
         output_flipped[:, 1::3, ...] = -output_flipped[:, 1::3, ...]
     output_flipped = output_flipped.reshape(shape_ori[0], -1, channels,
                                             shape_ori[2], shape_ori[3])
-    output_flipped_back = output_flipped.copy()
+    if isinstance(output_flipped, torch.Tensor):
+        output_flipped_back = output_flipped.clone()
+    else:
+        output_flipped_back = output_flipped.copy()
 
     # Swap left-right parts
     for left, right in flip_pairs:
@@ -141,7 +147,10 @@ def flip_back(output_flipped, flip_pairs, target_type='GaussianHeatmap'):
         output_flipped_back[:, right, ...] = output_flipped[:, left, ...]
     output_flipped_back = output_flipped_back.reshape(shape_ori)
     # Flip horizontally
-    output_flipped_back = output_flipped_back[..., ::-1]
+    if isinstance(output_flipped_back, torch.Tensor):
+        output_flipped_back = output_flipped_back.flip(-1)
+    else:
+        output_flipped_back = output_flipped_back[..., ::-1]
     return output_flipped_back
 
 
@@ -250,6 +259,70 @@ def get_affine_transform(center,
     return trans
 
 
+def get_affine_transform_batch(center,
+                               scale,
+                               rot,
+                               output_size,
+                               shift=(0., 0.),
+                               inv=False):
+    """Get the affine transform matrices of a batch of bounding boxes.
+
+    This is a vectorized version of :func:`get_affine_transform`. The
+    transform defined by the three pairs of points in
+    :func:`get_affine_transform` is a similarity transform, so its matrix is
+    computed in closed form for all boxes at once.
+
+    Note:
+        batch_size: N
+
+    Args:
+        center (np.ndarray[N, 2]): Center of the bounding boxes (x, y).
+        scale (np.ndarray[N, 2]): Scale of the bounding boxes
+            wrt [width, height].
+        rot (float | np.ndarray[N, ]): Rotation angles (degree).
+        output_size (np.ndarray[2, ] | list(2,)): Size of the
+            destination heatmaps.
+        shift (0-100%): Shift translation ratio wrt the width/height.
+            Default (0., 0.).
+        inv (bool): Option to inverse the affine transform direction.
+            (inv=False: src->dst or inv=True: dst->src)
+
+    Returns:
+        np.ndarray[N, 2, 3]: The transform matrices.
+    """
+    center = np.asarray(center, dtype=np.float64).reshape(-1, 2)
+    scale = np.asarray(scale, dtype=np.float64).reshape(-1, 2)
+    assert len(center) == len(scale)
+    assert len(output_size) == 2
+    assert len(shift) == 2
+    num_boxes = len(center)
+
+    # pixel_std is 200.
+    scale_tmp = scale * 200.0
+    rot_rad = np.broadcast_to(np.pi * np.asarray(rot) / 180, (num_boxes, ))
+    sn, cs = np.sin(rot_rad), np.cos(rot_rad)
+
+    # the source anchor point and the ratio between destination and source
+    src_center = center + scale_tmp * np.array(shift)
+    dst_center = np.array([output_size[0] * 0.5, output_size[1] * 0.5])
+    ratio = output_size[0] / scale_tmp[:, 0]
+
+    trans = np.zeros((num_boxes, 2, 3), dtype=np.float64)
+    if inv:
+        # dst->src: rotate by rot and scale by 1 / ratio
+        rot_mat = np.stack([cs, -sn, sn, cs], axis=1).reshape(-1, 2, 2)
+        trans[:, :, :2] = rot_mat / ratio[:, None, None]
+        trans[:, :, 2] = src_center - trans[:, :, :2] @ dst_center
+    else:
+        # src->dst: rotate by -rot and scale by ratio
+        rot_mat = np.stack([cs, sn, -sn, cs], axis=1).reshape(-1, 2, 2)
+        trans[:, :, :2] = rot_mat * ratio[:, None, None]
+        trans[:, :, 2] = dst_center - np.einsum('nij,nj->ni',
+                                                trans[:, :, :2], src_center)
+
+    return trans
+
+
 def affine_transform(pt, trans_mat):
     """Apply an affine transformation to the points.
 
@@ -338,6 +411,47 @@ def get_warp_matrix(theta, size_input, size_dst, size_target):
     return matrix
 
 
+def get_warp_matrix_batch(theta, size_input, size_dst, size_target):
+    """Calculate the transformation matrices of a batch of bounding boxes
+    under the constraint of unbiased. This is a vectorized version of
+    :func:`get_warp_matrix`.
+
+    Note:
+        batch_size: N
+
+    Args:
+        theta (float | np.ndarray[N, ]): Rotation angles in degrees.
+        size_input (np.ndarray[N, 2]): Size of input images [w, h].
+        size_dst (np.ndarray[2, ]): Size of output image [w, h].
+        size_target (np.ndarray[N, 2]): Size of ROIs in input plane [w, h].
+
+    Returns:
+        matrix (np.ndarray[N, 2, 3]): Matrices for transformation.
+    """
+    size_input = np.asarray(size_input, dtype=np.float64).reshape(-1, 2)
+    size_target = np.asarray(size_target, dtype=np.float64).reshape(-1, 2)
+    assert len(size_input) == len(size_target)
+    num_boxes = len(size_input)
+
+    theta = np.broadcast_to(np.deg2rad(theta), (num_boxes, ))
+    sn, cs = np.sin(theta), np.cos(theta)
+    scale_x = size_dst[0] / size_target[:, 0]
+    scale_y = size_dst[1] / size_target[:, 1]
+
+    matrix = np.zeros((num_boxes, 2, 3), dtype=np.float32)
+    matrix[:, 0, 0] = cs * scale_x
+    matrix[:, 0, 1] = -sn * scale_x
+    matrix[:, 0, 2] = scale_x * (-0.5 * size_input[:, 0] * cs +
+                                 0.5 * size_input[:, 1] * sn +
+                                 0.5 * size_target[:, 0])
+    matrix[:, 1, 0] = sn * scale_y
+    matrix[:, 1, 1] = cs * scale_y
+    matrix[:, 1, 2] = scale_y * (-0.5 * size_input[:, 0] * sn -
+                                 0.5 * size_input[:, 1] * cs +
+                                 0.5 * size_target[:, 1])
+    return matrix
+
+
 def warp_affine_joints(joints, mat):
     """Apply affine transformation defined by the transform matrix on the
     joints.
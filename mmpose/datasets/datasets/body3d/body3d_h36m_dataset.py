@@ -4,7 +4,7 @@ from collections import OrderedDict, defaultdict
 import mmcv
 import numpy as np
 
-from mmpose.core.evaluation import keypoint_mpjpe
+from mmpose.core.evaluation import MPJPEAccumulator, keypoint_mpjpe
 from ...builder import DATASETS
 from .body3d_base_dataset import Body3DBaseDataset
 
@@ -62,6 +62,11 @@ class Body3DH36MDataset(Body3DBaseDataset):
 
     # metric
     ALLOWED_METRICS = {'mpjpe', 'p-mpjpe', 'n-mpjpe'}
+    MPJPE_ALIGNMENTS = {
+        'mpjpe': 'none',
+        'p-mpjpe': 'procrustes',
+        'n-mpjpe': 'scale'
+    }
 
     def load_config(self, data_cfg):
         super().load_config(data_cfg)
@@ -301,6 +306,80 @@ class Body3DH36MDataset(Body3DBaseDataset):
 
         return name_value_tuples
 
+    def get_accumulator(self, metric='mpjpe', **kwargs):
+        """Get the accumulator of the errors, which is updated with the
+        outputs of the model batch by batch by :meth:`accumulate`, instead of
+        keeping all the outputs for :meth:`evaluate`.
+
+        Args:
+            metric (str | list[str]): Metric to be performed. Options:
+                'mpjpe', 'p-mpjpe', 'n-mpjpe'. See :meth:`_report_mpjpe`.
+
+        Returns:
+            MPJPEAccumulator: The accumulator of the errors.
+        """
+        metrics = metric if isinstance(metric, list) else [metric]
+        for _metric in metrics:
+            if _metric not in self.ALLOWED_METRICS:
+                raise ValueError(
+                    f'Unsupported metric "{_metric}" for human3.6 dataset.'
+                    f'Supported metrics are {self.ALLOWED_METRICS}')
+
+        # the errors of the action categories are not aligned, as in
+        # _report_mpjpe
+        alignments = ['none'] + [
+            self.MPJPE_ALIGNMENTS[_metric]
+            for _metric in metrics if _metric != 'mpjpe'
+        ]
+        return MPJPEAccumulator(alignments)
+
+    def accumulate(self, accumulator, output):
+        """Update the accumulator with the output of the model on a batch.
+
+        Args:
+            accumulator (MPJPEAccumulator): The accumulator returned by
+                :meth:`get_accumulator`.
+            output (dict): The output of a batch. See :meth:`evaluate`.
+        """
+        target_ids = [
+            self.name2id[image_path]
+            for image_path in output['target_image_paths']
+        ]
+        gts, gts_visible = np.split(
+            self.data_info['joints_3d'][target_ids], [3], axis=-1)
+        masks = gts_visible.squeeze(-1) > 0
+        action_categories = [
+            self._parse_h36m_imgname(
+                self.data_info['imgnames'][target_id])[1].split('_')[0]
+            for target_id in target_ids
+        ]
+        accumulator.update(output['preds'], gts, masks, action_categories)
+
+    def evaluate_accumulator(self, accumulator, metric='mpjpe', **kwargs):
+        """Get the errors accumulated by :meth:`accumulate`.
+
+        Args:
+            accumulator (MPJPEAccumulator): The accumulator.
+            metric (str | list[str]): Metric to be performed, which is the
+                same as that of :meth:`get_accumulator`.
+
+        Returns:
+            dict: Evaluation results for evaluation metric.
+        """
+        metrics = metric if isinstance(metric, list) else [metric]
+        name_value_tuples = []
+        for _metric in metrics:
+            err_name = _metric.upper()
+            name_value_tuples.append(
+                (err_name,
+                 accumulator.summarize(self.MPJPE_ALIGNMENTS[_metric])))
+            for action_category in accumulator.groups:
+                name_value_tuples.append(
+                    (f'{err_name}_{action_category}',
+                     accumulator.summarize('none', action_category)))
+
+        return OrderedDict(name_value_tuples)
+
     def _load_camera_param(self, camera_param_file):
         """Load camera parameters from file."""
         return mmcv.load(camera_param_file)
@@ -5,8 +5,8 @@ import json_tricks as json
 import numpy as np
 import xtcocotools
 from xtcocotools.coco import COCO
-from xtcocotools.cocoeval import COCOeval
 
+from mmpose.core.evaluation import ParallelCOCOeval
 from mmpose.core.post_processing import oks_nms, soft_oks_nms
 from mmpose.datasets.builder import DATASETS
 from .bottom_up_base_dataset import BottomUpBaseDataset
@@ -212,7 +212,7 @@ class BottomUpCocoDataset(BottomUpBaseDataset):
 
         return m < 0.5
 
-    def evaluate(self, outputs, res_folder, metric='mAP', **kwargs):
+    def evaluate(self, outputs, res_folder, metric='mAP', nproc=1, **kwargs):
         """Evaluate coco keypoint results. The pose prediction results will be
         saved in `${res_folder}/result_keypoints.json`.
 
@@ -221,17 +221,21 @@ class BottomUpCocoDataset(BottomUpBaseDataset):
             num_keypoints: K
 
         Args:
-            outputs (list(preds, scores, image_path, heatmap)):
+            outputs (list(preds, scores, num_people, image_path, heatmap)):
 
                 * preds (list[np.ndarray(P, K, 3+tag_num)]):
                   Pose predictions for all people in images.
                 * scores (list[P]):
+                * num_people (list[int]): The number of people in each
+                  image.
                 * image_path (list[str]): For example, ['coco/images/
                 val2017/000000397133.jpg']
                 * heatmap (np.ndarray[N, K, H, W]): model outputs.
 
             res_folder (str): Path of directory to save the results.
             metric (str | list[str]): Metric to be performed. Defaults: 'mAP'.
+            nproc (int): The number of processes to evaluate the images with.
+                Default: 1.
 
         Returns:
             dict: Evaluation results for evaluation metric.
@@ -249,9 +253,14 @@ class BottomUpCocoDataset(BottomUpBaseDataset):
         image_paths = []
 
         for output in outputs:
-            preds.append(output['preds'])
-            scores.append(output['scores'])
-            image_paths.append(output['image_paths'][0])
+            # the people of the images in a batch are concatenated
+            num_people = output.get('num_people', [len(output['preds'])])
+            start = 0
+            for image_path, num in zip(output['image_paths'], num_people):
+                preds.append(output['preds'][start:start + num])
+                scores.append(output['scores'][start:start + num])
+                image_paths.append(image_path)
+                start += num
 
         kpts = defaultdict(list)
         # iterate over images
@@ -284,7 +293,7 @@ class BottomUpCocoDataset(BottomUpBaseDataset):
 
         self._write_coco_keypoint_results(valid_kpts, res_file)
 
-        info_str = self._do_python_keypoint_eval(res_file)
+        info_str = self._do_python_keypoint_eval(res_file, nproc=nproc)
         name_value = OrderedDict(info_str)
         return name_value
 
@@ -337,7 +346,7 @@ class BottomUpCocoDataset(BottomUpBaseDataset):
 
         return cat_results
 
-    def _do_python_keypoint_eval(self, res_file):
+    def _do_python_keypoint_eval(self, res_file, nproc=1):
         """Keypoint evaluation using COCOAPI."""
 
         stats_names = [
@@ -354,7 +363,8 @@ class BottomUpCocoDataset(BottomUpBaseDataset):
                 return info_str
 
         coco_det = self.coco.loadRes(res_file)
-        coco_eval = COCOeval(self.coco, coco_det, 'keypoints', self.sigmas)
+        coco_eval = ParallelCOCOeval(
+            self.coco, coco_det, 'keypoints', self.sigmas, nproc=nproc)
         coco_eval.params.useSegm = None
         coco_eval.evaluate()
         coco_eval.accumulate()
@@ -1,8 +1,8 @@
 import json_tricks as json
 import numpy as np
 from xtcocotools.coco import COCO
-from xtcocotools.cocoeval import COCOeval
 
+from mmpose.core.evaluation import ParallelCOCOeval
 from mmpose.datasets.builder import DATASETS
 from .bottom_up_coco import BottomUpCocoDataset
 
@@ -100,7 +100,7 @@ class BottomUpMhpDataset(BottomUpCocoDataset):
 
         print(f'=> num_images: {self.num_images}')
 
-    def _do_python_keypoint_eval(self, res_file):
+    def _do_python_keypoint_eval(self, res_file, nproc=1):
         """Keypoint evaluation using COCOAPI."""
 
         stats_names = [
@@ -118,8 +118,13 @@ class BottomUpMhpDataset(BottomUpCocoDataset):
 
         coco_det = self.coco.loadRes(res_file)
 
-        coco_eval = COCOeval(
-            self.coco, coco_det, 'keypoints', self.sigmas, use_area=False)
+        coco_eval = ParallelCOCOeval(
+            self.coco,
+            coco_det,
+            'keypoints',
+            self.sigmas,
+            use_area=False,
+            nproc=nproc)
         coco_eval.params.useSegm = None
         coco_eval.evaluate()
         coco_eval.accumulate()
@@ -121,6 +121,11 @@ class FaceAFLWDataset(FaceBaseDataset):
 
         return np.tile(box_sizes, [1, 2])
 
+    def _get_nme_normalize_factor(self, items, gts):
+        """Get the box sizes of the samples as the normalize factor of NME."""
+        box_sizes = np.array([item['box_size'] for item in items])
+        return self._get_normalize_factor(box_sizes.reshape([-1, 1]))
+
     def _report_metric(self, res_file, metrics):
         """Keypoint evaluation.
 
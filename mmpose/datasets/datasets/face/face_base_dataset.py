@@ -1,11 +1,13 @@
 import copy
 from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
 
 import json_tricks as json
 import numpy as np
 from torch.utils.data import Dataset
 from xtcocotools.coco import COCO
 
+from mmpose.core.evaluation import KeypointAccumulator
 from mmpose.datasets.pipelines import Compose
 
 
@@ -127,6 +129,64 @@ class FaceBaseDataset(Dataset, metaclass=ABCMeta):
         with open(res_file, 'w') as f:
             json.dump(keypoints, f, sort_keys=True, indent=4)
 
+    def get_accumulator(self, metric='NME', **kwargs):
+        """Get the accumulator of the metrics, which is updated with the
+        outputs of the model batch by batch by :meth:`accumulate`, instead of
+        keeping all the outputs for :meth:`evaluate`.
+
+        Args:
+            metric (str | list[str]): Metric to be performed.
+                Options: 'NME'.
+
+        Returns:
+            KeypointAccumulator: The accumulator of the metrics.
+        """
+        metrics = metric if isinstance(metric, list) else [metric]
+        allowed_metrics = ['NME']
+        for metric in metrics:
+            if metric not in allowed_metrics:
+                raise KeyError(f'metric {metric} is not supported')
+
+        return KeypointAccumulator(metrics)
+
+    def accumulate(self, accumulator, output):
+        """Update the accumulator with the output of the model on a batch.
+
+        Args:
+            accumulator (KeypointAccumulator): The accumulator returned by
+                :meth:`get_accumulator`.
+            output (dict): The output of a batch. See :meth:`evaluate`.
+        """
+        items = [self.db[bbox_id] for bbox_id in output['bbox_ids']]
+        gts = np.array([np.array(item['joints_3d'])[:, :-1] for item in items])
+        masks = np.array([(np.array(item['joints_3d_visible'])[:, 0]) > 0
+                          for item in items])
+        accumulator.update(
+            output['preds'][:, :, :-1],
+            gts,
+            masks,
+            normalize_factor=self._get_nme_normalize_factor(items, gts))
+
+    def _get_nme_normalize_factor(self, items, gts):
+        """Get the normalize factor of NME for the samples.
+
+        Args:
+            items (list[dict]): The samples in the database.
+            gts (np.ndarray[N, K, 2]): Groundtruth keypoint location.
+
+        Return:
+            np.ndarray[N, 2]: normalized factor
+        """
+        return self._get_normalize_factor(gts)
+
+    def evaluate_accumulator(self, accumulator, **kwargs):
+        """Get the metrics accumulated by :meth:`accumulate`.
+
+        Returns:
+            dict: Evaluation results for evaluation metric.
+        """
+        return OrderedDict(accumulator.summarize())
+
     def __len__(self):
         """Get the size of the dataset."""
         return len(self.db)
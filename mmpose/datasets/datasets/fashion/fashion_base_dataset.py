@@ -1,11 +1,13 @@
 import copy
 from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
 
 import json_tricks as json
 import numpy as np
 from torch.utils.data import Dataset
 from xtcocotools.coco import COCO
 
+from mmpose.core.evaluation import KeypointAccumulator
 from mmpose.core.evaluation.top_down_eval import (keypoint_auc, keypoint_epe,
                                                   keypoint_pck_accuracy)
 from mmpose.datasets.pipelines import Compose
@@ -199,6 +201,67 @@ class FashionBaseDataset(Dataset, metaclass=ABCMeta):
 
         return info_str
 
+    def get_accumulator(self,
+                        metric='PCK',
+                        pck_thr=0.2,
+                        pckh_thr=0.7,
+                        auc_nor=30,
+                        **kwargs):
+        """Get the accumulator of the metrics, which is updated with the
+        outputs of the model batch by batch by :meth:`accumulate`, instead of
+        keeping all the outputs for :meth:`evaluate`.
+
+        Args:
+            metric (str | list[str]): Metric to be performed.
+                Options: 'PCK', 'PCKh', 'AUC', 'EPE'.
+            pck_thr (float): PCK threshold, default as 0.2.
+            pckh_thr (float): PCKh threshold, default as 0.7.
+            auc_nor (float): AUC normalization factor, default as 30 pixel.
+
+        Returns:
+            KeypointAccumulator: The accumulator of the metrics.
+        """
+        metrics = metric if isinstance(metric, list) else [metric]
+        allowed_metrics = ['PCK', 'PCKh', 'AUC', 'EPE']
+        for metric in metrics:
+            if metric not in allowed_metrics:
+                raise KeyError(f'metric {metric} is not supported')
+
+        return KeypointAccumulator(metrics, pck_thr, pckh_thr, auc_nor)
+
+    def accumulate(self, accumulator, output):
+        """Update the accumulator with the output of the model on a batch.
+
+        Args:
+            accumulator (KeypointAccumulator): The accumulator returned by
+                :meth:`get_accumulator`.
+            output (dict): The output of a batch. See :meth:`evaluate`.
+        """
+        items = [self.db[bbox_id] for bbox_id in output['bbox_ids']]
+        gts = np.array([np.array(item['joints_3d'])[:, :-1] for item in items])
+        masks = np.array([(np.array(item['joints_3d_visible'])[:, 0]) > 0
+                          for item in items])
+        bbox_size = None
+        if 'PCK' in accumulator.metrics:
+            bbox_size = [np.max(np.array(item['bbox'])[2:]) for item in items]
+        head_size = None
+        if 'PCKh' in accumulator.metrics:
+            head_size = [item['head_size'] for item in items]
+        accumulator.update(
+            output['preds'][:, :, :-1],
+            gts,
+            masks,
+            bbox_size=bbox_size,
+            head_size=head_size)
+
+    def evaluate_accumulator(self, accumulator, **kwargs):
+        """Get the metrics accumulated by :meth:`accumulate`.
+
+        Returns:
+            dict: Evaluation results for evaluation metric.
+        """
+        return OrderedDict(accumulator.summarize())
+
     def __len__(self):
         """Get the size of the dataset."""
         return len(self.db)
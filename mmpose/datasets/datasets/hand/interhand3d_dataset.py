@@ -304,6 +304,12 @@ class InterHand3DDataset(HandBaseDataset):
 
         return gt_db
 
+    def get_accumulator(self, metric='MPJPE', **kwargs):
+        """The metrics of InterHand3D are evaluated on all the outputs by
+        :meth:`evaluate`, which are not accumulated batch by batch."""
+        raise NotImplementedError(
+            f'{self.__class__.__name__} does not support online evaluation')
+
     def evaluate(self, outputs, res_folder, metric='MPJPE', **kwargs):
         """Evaluate interhand2d keypoint results. The pose prediction results
         will be saved in `${res_folder}/result_keypoints.json`.
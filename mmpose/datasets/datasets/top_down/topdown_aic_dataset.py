@@ -2,8 +2,8 @@ import warnings
 
 import numpy as np
 from xtcocotools.coco import COCO
-from xtcocotools.cocoeval import COCOeval
 
+from ....core.evaluation import ParallelCOCOeval
 from ...builder import DATASETS
 from .topdown_coco_dataset import TopDownCocoDataset
 
@@ -115,11 +115,16 @@ class TopDownAicDataset(TopDownCocoDataset):
         gt_db = self._load_coco_keypoint_annotations()
         return gt_db
 
-    def _do_python_keypoint_eval(self, res_file):
+    def _do_python_keypoint_eval(self, res_file, nproc=1):
         """Keypoint evaluation using COCOAPI."""
         coco_det = self.coco.loadRes(res_file)
-        coco_eval = COCOeval(
-            self.coco, coco_det, 'keypoints', self.sigmas, use_area=False)
+        coco_eval = ParallelCOCOeval(
+            self.coco,
+            coco_det,
+            'keypoints',
+            self.sigmas,
+            use_area=False,
+            nproc=nproc)
         coco_eval.params.useSegm = None
         coco_eval.evaluate()
         coco_eval.accumulate()
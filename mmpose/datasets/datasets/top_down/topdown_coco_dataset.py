@@ -1,13 +1,13 @@
 import os
 import warnings
-from collections import OrderedDict, defaultdict
+from collections import OrderedDict
 
 import json_tricks as json
 import numpy as np
 from xtcocotools.coco import COCO
-from xtcocotools.cocoeval import COCOeval
 
-from ....core.post_processing import oks_nms, soft_oks_nms
+from ....core.evaluation import ParallelCOCOeval, ResultAccumulator
+from ....core.post_processing import batched_oks_nms
 from ...builder import DATASETS
 from .topdown_base_dataset import TopDownBaseDataset
 
@@ -302,9 +302,15 @@ class TopDownCocoDataset(TopDownBaseDataset):
               f'low score@{self.det_bbox_thr}: {bbox_id}')
         return kpt_db
 
-    def evaluate(self, outputs, res_folder, metric='mAP', **kwargs):
+    def evaluate(self,
+                 outputs,
+                 res_folder=None,
+                 metric='mAP',
+                 nproc=1,
+                 **kwargs):
         """Evaluate coco keypoint results. The pose prediction results will be
-        saved in `${res_folder}/result_keypoints.json`.
+        saved in `${res_folder}/result_keypoints.json` if res_folder is given,
+        and are evaluated in memory without reading the file back.
 
         Note:
             batch_size: N
@@ -322,8 +328,11 @@ class TopDownCocoDataset(TopDownBaseDataset):
                     /000000393226.jpg']
                 :heatmap (np.ndarray[N, K, H, W]): model output heatmap
                 :bbox_id (list(int)).
-            res_folder (str): Path of directory to save the results.
+            res_folder (str, optional): Path of directory to save the
+                results. If None, the results are not saved. Default: None.
             metric (str | list[str]): Metric to be performed. Defaults: 'mAP'.
+            nproc (int): The number of processes to evaluate the images with.
+                Default: 1.
 
         Returns:
             dict: Evaluation results for evaluation metric.
@@ -334,67 +343,161 @@ class TopDownCocoDataset(TopDownBaseDataset):
             if metric not in allowed_metrics:
                 raise KeyError(f'metric {metric} is not supported')
 
-        res_file = os.path.join(res_folder, 'result_keypoints.json')
-
-        kpts = defaultdict(list)
-
-        for output in outputs:
-            preds = output['preds']
-            boxes = output['boxes']
-            image_paths = output['image_paths']
-            bbox_ids = output['bbox_ids']
-
-            batch_size = len(image_paths)
-            for i in range(batch_size):
-                image_id = self.name2id[image_paths[i][len(self.img_prefix):]]
-                kpts[image_id].append({
-                    'keypoints': preds[i],
-                    'center': boxes[i][0:2],
-                    'scale': boxes[i][2:4],
-                    'area': boxes[i][4],
-                    'score': boxes[i][5],
-                    'image_id': image_id,
-                    'bbox_id': bbox_ids[i]
-                })
-        kpts = self._sort_and_unique_bboxes(kpts)
-
-        # rescoring and oks nms
-        num_joints = self.ann_info['num_joints']
-        vis_thr = self.vis_thr
-        oks_thr = self.oks_thr
-        valid_kpts = []
-        for image_id in kpts.keys():
-            img_kpts = kpts[image_id]
-            for n_p in img_kpts:
-                box_score = n_p['score']
-                kpt_score = 0
-                valid_num = 0
-                for n_jt in range(0, num_joints):
-                    t_s = n_p['keypoints'][n_jt][2]
-                    if t_s > vis_thr:
-                        kpt_score = kpt_score + t_s
-                        valid_num = valid_num + 1
-                if valid_num != 0:
-                    kpt_score = kpt_score / valid_num
-                # rescoring
-                n_p['score'] = kpt_score * box_score
-
-            if self.use_nms:
-                nms = soft_oks_nms if self.soft_nms else oks_nms
-                keep = nms(img_kpts, oks_thr, sigmas=self.sigmas)
-                valid_kpts.append([img_kpts[_keep] for _keep in keep])
-            else:
-                valid_kpts.append(img_kpts)
-
-        self._write_coco_keypoint_results(valid_kpts, res_file)
-
-        info_str = self._do_python_keypoint_eval(res_file)
+        # gather the predictions of all the batches into flat arrays
+        preds = np.concatenate([output['preds'] for output in outputs])
+        boxes = np.concatenate([output['boxes'] for output in outputs])
+        bbox_ids = np.concatenate([output['bbox_ids'] for output in outputs])
+        image_ids = np.concatenate(
+            [self._get_image_ids(output['image_paths']) for output in outputs])
+        scores = self._rescore(preds, boxes)
+
+        return self._evaluate_keypoints(preds, boxes, scores, bbox_ids,
+                                        image_ids, res_folder, nproc)
+
+    def get_accumulator(self, metric='mAP', **kwargs):
+        """Get the accumulator of the results, which is updated with the
+        outputs of the model batch by batch by :meth:`accumulate`, instead of
+        keeping all the outputs (e.g. the heatmaps) for :meth:`evaluate`.
+
+        Only the keypoints, the boxes and the rescored scores of the people
+        are kept, since mAP is computed on all the results at once.
+
+        Args:
+            metric (str | list[str]): Metric to be performed. Defaults: 'mAP'.
+
+        Returns:
+            ResultAccumulator: The accumulator of the results.
+        """
+        metrics = metric if isinstance(metric, list) else [metric]
+        allowed_metrics = ['mAP']
+        for metric in metrics:
+            if metric not in allowed_metrics:
+                raise KeyError(f'metric {metric} is not supported')
+
+        return ResultAccumulator()
+
+    def accumulate(self, accumulator, output):
+        """Update the accumulator with the output of the model on a batch.
+
+        Args:
+            accumulator (ResultAccumulator): The accumulator returned by
+                :meth:`get_accumulator`.
+            output (dict): The output of a batch. See :meth:`evaluate`.
+        """
+        preds = output['preds']
+        boxes = output['boxes']
+        accumulator.update(
+            preds=preds,
+            boxes=boxes,
+            scores=self._rescore(preds, boxes),
+            bbox_ids=output['bbox_ids'],
+            image_ids=self._get_image_ids(output['image_paths']))
+
+    def evaluate_accumulator(self,
+                             accumulator,
+                             res_folder=None,
+                             nproc=1,
+                             **kwargs):
+        """Evaluate the coco keypoint results accumulated by
+        :meth:`accumulate`. See :meth:`evaluate` for the arguments.
+
+        Returns:
+            dict: Evaluation results for evaluation metric.
+        """
+        return self._evaluate_keypoints(
+            accumulator.get('preds'), accumulator.get('boxes'),
+            accumulator.get('scores'), accumulator.get('bbox_ids'),
+            accumulator.get('image_ids'), res_folder, nproc)
+
+    def _get_image_ids(self, image_paths):
+        """Get the image ids of the image paths."""
+        return np.array([
+            self.name2id[image_path[len(self.img_prefix):]]
+            for image_path in image_paths
+        ])
+
+    def _rescore(self, preds, boxes):
+        """Rescore the people with the mean score of the visible keypoints.
+
+        Args:
+            preds (np.ndarray[N, K, 3]): The predicted keypoints.
+            boxes (np.ndarray[N, 6]): The boxes, whose last column is the
+                score of the box.
+
+        Returns:
+            np.ndarray[N]: The scores of the people.
+        """
+        kpt_scores = preds[:, :self.ann_info['num_joints'], 2]
+        valid = kpt_scores > self.vis_thr
+        num_valid = valid.sum(axis=1)
+        kpt_score = np.where(valid, kpt_scores, 0).sum(axis=1) / np.maximum(
+            num_valid, 1)
+        return kpt_score * boxes[:, 5]
+
+    def _evaluate_keypoints(self, preds, boxes, scores, bbox_ids, image_ids,
+                            res_folder, nproc):
+        """Remove the repeated people, run oks nms and evaluate the coco
+        keypoint results."""
+        # group the people by image and sort them by bbox id, where only
+        # the first one of the repeated bbox ids is kept
+        order = np.lexsort((bbox_ids, image_ids))
+        image_ids = image_ids[order]
+        bbox_ids = bbox_ids[order]
+        unique = np.ones(len(order), dtype=bool)
+        unique[1:] = (image_ids[1:] != image_ids[:-1]) | (
+            bbox_ids[1:] != bbox_ids[:-1])
+        order = order[unique]
+        image_ids = image_ids[unique]
+        bbox_ids = bbox_ids[unique]
+        preds = preds[order]
+        boxes = boxes[order]
+        scores = scores[order]
+
+        # the index of the first person of each image
+        offsets = np.concatenate([[0],
+                                  np.flatnonzero(np.diff(image_ids)) + 1,
+                                  [len(image_ids)]])
+
+        # oks nms
+        if self.use_nms:
+            keep = batched_oks_nms(
+                preds,
+                scores,
+                boxes[:, 4],
+                offsets,
+                self.oks_thr,
+                soft=self.soft_nms,
+                sigmas=self.sigmas)
+        else:
+            keep = np.arange(len(preds))
+
+        valid_kpts = [[] for _ in range(len(offsets) - 1)]
+        for i, image_idx in zip(keep,
+                                np.searchsorted(offsets, keep, 'right') - 1):
+            valid_kpts[image_idx].append({
+                'keypoints': preds[i],
+                'center': boxes[i, 0:2],
+                'scale': boxes[i, 2:4],
+                'area': boxes[i, 4],
+                'score': scores[i],
+                'image_id': int(image_ids[i]),
+                'bbox_id': bbox_ids[i]
+            })
+
+        results = self._get_coco_keypoint_results(valid_kpts)
+        if res_folder is not None:
+            # the results are saved before the evaluation, which adds the
+            # bbox and area to the results
+            res_file = os.path.join(res_folder, 'result_keypoints.json')
+            self._write_coco_keypoint_results(results, res_file)
+
+        info_str = self._do_python_keypoint_eval(results, nproc=nproc)
         name_value = OrderedDict(info_str)
 
         return name_value
 
-    def _write_coco_keypoint_results(self, keypoints, res_file):
-        """Write results into a json file."""
+    def _get_coco_keypoint_results(self, keypoints):
+        """Get the coco keypoint results of all the images."""
         data_pack = [{
             'cat_id': self._class_to_coco_ind[cls],
             'cls_ind': cls_ind,
@@ -404,10 +507,19 @@ class TopDownCocoDataset(TopDownBaseDataset):
         } for cls_ind, cls in enumerate(self.classes)
                      if not cls == '__background__']
 
-        results = self._coco_keypoint_results_one_category_kernel(data_pack[0])
+        return self._coco_keypoint_results_one_category_kernel(data_pack[0])
 
+    @staticmethod
+    def _write_coco_keypoint_results(results, res_file):
+        """Write results into a compact json file, one result at a time."""
         with open(res_file, 'w') as f:
-            json.dump(results, f, sort_keys=True, indent=4)
+            f.write('[')
+            for i, result in enumerate(results):
+                if i > 0:
+                    f.write(',')
+                f.write('\n')
+                f.write(json.dumps(result, separators=(',', ':')))
+            f.write('\n]\n')
 
     def _coco_keypoint_results_one_category_kernel(self, data_pack):
         """Get coco keypoint results."""
@@ -437,10 +549,18 @@ class TopDownCocoDataset(TopDownBaseDataset):
 
         return cat_results
 
-    def _do_python_keypoint_eval(self, res_file):
-        """Keypoint evaluation using COCOAPI."""
+    def _do_python_keypoint_eval(self, res_file, nproc=1):
+        """Keypoint evaluation using COCOAPI.
+
+        Args:
+            res_file (str | list[dict]): The result file, or the results in
+                memory, which are passed to ``COCO.loadRes``.
+            nproc (int): The number of processes to evaluate the images with.
+                Default: 1.
+        """
         coco_det = self.coco.loadRes(res_file)
-        coco_eval = COCOeval(self.coco, coco_det, 'keypoints', self.sigmas)
+        coco_eval = ParallelCOCOeval(
+            self.coco, coco_det, 'keypoints', self.sigmas, nproc=nproc)
         coco_eval.params.useSegm = None
         coco_eval.evaluate()
         coco_eval.accumulate()
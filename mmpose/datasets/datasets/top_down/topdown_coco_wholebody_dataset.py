@@ -3,8 +3,8 @@ import warnings
 
 import numpy as np
 from xtcocotools.coco import COCO
-from xtcocotools.cocoeval import COCOeval
 
+from ....core.evaluation import ParallelCOCOeval
 from ...builder import DATASETS
 from .topdown_coco_dataset import TopDownCocoDataset
 
@@ -252,71 +252,77 @@ class TopDownCocoWholeBodyDataset(TopDownCocoDataset):
 
         return cat_results
 
-    def _do_python_keypoint_eval(self, res_file):
+    def _do_python_keypoint_eval(self, res_file, nproc=1):
         """Keypoint evaluation using COCOAPI."""
         coco_det = self.coco.loadRes(res_file)
 
-        coco_eval = COCOeval(
+        coco_eval = ParallelCOCOeval(
             self.coco,
             coco_det,
             'keypoints_body',
             np.array(self.sigmas_body),
-            use_area=True)
+            use_area=True,
+            nproc=nproc)
         coco_eval.params.useSegm = None
         coco_eval.evaluate()
         coco_eval.accumulate()
         coco_eval.summarize()
 
-        coco_eval = COCOeval(
+        coco_eval = ParallelCOCOeval(
             self.coco,
             coco_det,
             'keypoints_foot',
             np.array(self.sigmas_foot),
-            use_area=True)
+            use_area=True,
+            nproc=nproc)
         coco_eval.params.useSegm = None
         coco_eval.evaluate()
         coco_eval.accumulate()
         coco_eval.summarize()
 
-        coco_eval = COCOeval(
+        coco_eval = ParallelCOCOeval(
             self.coco,
             coco_det,
             'keypoints_face',
             np.array(self.sigmas_face),
-            use_area=True)
+            use_area=True,
+            nproc=nproc)
         coco_eval.params.useSegm = None
         coco_eval.evaluate()
         coco_eval.accumulate()
         coco_eval.summarize()
 
-        coco_eval = COCOeval(
+        coco_eval = ParallelCOCOeval(
             self.coco,
             coco_det,
             'keypoints_lefthand',
             np.array(self.sigmas_lefthand),
-            use_area=True)
+            use_area=True,
+            nproc=nproc)
         coco_eval.params.useSegm = None
         coco_eval.evaluate()
         coco_eval.accumulate()
         coco_eval.summarize()
 
-        coco_eval = COCOeval(
+        coco_eval = ParallelCOCOeval(
             self.coco,
             coco_det,
             'keypoints_righthand',
             np.array(self.sigmas_righthand),
-            use_area=True)
+            use_area=True,
+            nproc=nproc)
         coco_eval.params.useSegm = None
         coco_eval.evaluate()
         coco_eval.accumulate()
         coco_eval.summarize()
 
-        coco_eval = COCOeval(
+        coco_eval = ParallelCOCOeval(
             self.coco,
             coco_det,
             'keypoints_wholebody',
             np.array(self.sigmas_wholebody),
-            use_area=True)
+            use_area=True,
+            nproc=nproc)
         coco_eval.params.useSegm = None
         coco_eval.evaluate()
         coco_eval.accumulate()
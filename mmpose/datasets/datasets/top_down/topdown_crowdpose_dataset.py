@@ -2,8 +2,8 @@ import warnings
 
 import numpy as np
 from xtcocotools.coco import COCO
-from xtcocotools.cocoeval import COCOeval
 
+from ....core.evaluation import ParallelCOCOeval
 from ...builder import DATASETS
 from .topdown_coco_dataset import TopDownCocoDataset
 
@@ -113,15 +113,16 @@ class TopDownCrowdPoseDataset(TopDownCocoDataset):
         print(f'=> num_images: {self.num_images}')
         print(f'=> load {len(self.db)} samples')
 
-    def _do_python_keypoint_eval(self, res_file):
+    def _do_python_keypoint_eval(self, res_file, nproc=1):
         """Keypoint evaluation using COCOAPI."""
         coco_det = self.coco.loadRes(res_file)
-        coco_eval = COCOeval(
+        coco_eval = ParallelCOCOeval(
             self.coco,
             coco_det,
             'keypoints_crowd',
             self.sigmas,
-            use_area=False)
+            use_area=False,
+            nproc=nproc)
         coco_eval.params.useSegm = None
         coco_eval.evaluate()
         coco_eval.accumulate()
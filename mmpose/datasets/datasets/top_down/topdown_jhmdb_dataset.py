@@ -293,6 +293,12 @@ class TopDownJhmdbDataset(TopDownCocoDataset):
 
         return info_str
 
+    def get_accumulator(self, metric='PCK', **kwargs):
+        """The metrics of JHMDB are evaluated on all the outputs by
+        :meth:`evaluate`, which are not accumulated batch by batch."""
+        raise NotImplementedError(
+            f'{self.__class__.__name__} does not support online evaluation')
+
     def evaluate(self, outputs, res_folder, metric='PCK', **kwargs):
         """Evaluate onehand10k keypoint results. The pose prediction results
         will be saved in `${res_folder}/result_keypoints.json`.
@@ -119,6 +119,12 @@ class TopDownPoseTrack18Dataset(TopDownCocoDataset):
         print(f'=> num_images: {self.num_images}')
         print(f'=> load {len(self.db)} samples')
 
+    def get_accumulator(self, metric='mAP', **kwargs):
+        """The metrics of PoseTrack18 are evaluated on all the outputs by
+        :meth:`evaluate`, which are not accumulated batch by batch."""
+        raise NotImplementedError(
+            f'{self.__class__.__name__} does not support online evaluation')
+
     def evaluate(self, outputs, res_folder, metric='mAP', **kwargs):
         """Evaluate coco keypoint results. The pose prediction results will be
         saved in `${res_folder}/result_keypoints.json`.
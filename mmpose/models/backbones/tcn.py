@@ -1,5 +1,6 @@
 import copy
 
+import torch
 import torch.nn as nn
 from mmcv.cnn import ConvModule, build_conv_layer, constant_init, kaiming_init
 from mmcv.utils.parrots_wrapper import _BatchNorm
@@ -255,6 +256,63 @@ class TCN(BaseBackbone):
 
         return tuple(outs)
 
+    def forward_step(self, x, cache=None):
+        """Forward a new frame of each sequence incrementally.
+
+        The inputs of each layer in the last frames are cached, so only one
+        new output is computed by each layer for the new frame, instead of
+        running the whole receptive field again. The outputs are the same as
+        ``forward()`` on the last ``receptive_field`` frames of the
+        sequences, where the frames before the first step are padded by
+        replicating the first frame.
+
+        Note:
+            batch_size: N
+            in_channels: C
+
+        Args:
+            x (torch.Tensor[NxCx1]): The inputs of the new frame.
+            cache (list[torch.Tensor] | None): The cache returned by the
+                previous step. If None, the sequences start with ``x``.
+
+        Returns:
+            tuple[torch.Tensor]: The outputs of the blocks for the new frame,
+                each with a temporal length of 1.
+            list[torch.Tensor]: The cache for the next step.
+        """
+        layers = [self.expand_conv] + list(self.tcn_blocks)
+        outs = []
+        new_cache = []
+        dilation = 1
+        for i, layer in enumerate(layers):
+            window_size = (self.kernel_sizes[i] - 1) * dilation + 1
+            if cache is None:
+                window = x.expand(-1, -1, window_size)
+            else:
+                window = torch.cat((cache[i], x), dim=2)
+            new_cache.append(window[:, :, 1:])
+            if self.use_stride_conv:
+                # the strided convolutions only take the dilated positions
+                window = window[:, :, ::dilation]
+
+            x = layer(window)
+            if i == 0:
+                if self.dropout is not None:
+                    x = self.dropout(x)
+            else:
+                outs.append(x)
+            dilation *= self.kernel_sizes[i]
+
+        return tuple(outs), new_cache
+
+    @property
+    def receptive_field(self):
+        """int: The number of input frames for one output frame."""
+        receptive_field = 1
+        for kernel_size in self.kernel_sizes:
+            receptive_field *= kernel_size
+        return receptive_field
+
     def init_weights(self, pretrained=None):
         """Initialize the weights."""
         super().init_weights(pretrained)
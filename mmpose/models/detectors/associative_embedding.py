@@ -2,6 +2,7 @@ import warnings
 
 import mmcv
 import torch
+import torch.nn.functional as F
 from mmcv.image import imwrite
 from mmcv.visualization.image import imshow
 
@@ -197,62 +198,114 @@ class AssociativeEmbedding(BasePose):
     def forward_test(self, img, img_metas, return_heatmap=False, **kwargs):
         """Inference the bottom-up model.
 
+        The resized images of a batch are padded to the same size at the
+        bottom and the right to run as one batch, and the outputs are cropped
+        back to the valid region of each image before the grouping, which is
+        performed for each image separately.
+
         Note:
-            Batchsize = N (currently support batchsize = 1)
+            Batchsize = N
             num_img_channel: C
             img_width: imgW
             img_height: imgH
 
         Args:
             flip_index (List(int)):
-            aug_data (List(Tensor[NxCximgHximgW])): Multi-scale image
+            aug_data (List(Tensor[1xCximgHximgW])): Multi-scale image
             test_scale_factor (List(float)): Multi-scale factor
             base_size (Tuple(int)): Base size of image when scale is 1
             center (np.ndarray): center of image
             scale (np.ndarray): the scale of image
+
+        Returns:
+            dict: The results of the batch, where the people of all the
+                images are concatenated in "preds" and "scores", and
+                "num_people" is the number of people in each image.
         """
-        assert img.size(0) == 1
-        assert len(img_metas) == 1
+        assert img.size(0) == len(img_metas)
 
-        img_metas = img_metas[0]
+        multi_scale_outputs = self._forward_multi_scale(
+            [[aug_data.to(img.device) for aug_data in img_meta['aug_data']]
+             for img_meta in img_metas])
 
-        aug_data = img_metas['aug_data']
+        result = {}
+        preds = []
+        scores = []
+        num_people = []
+        image_paths = []
+        heatmaps = []
+        for img_meta, outputs in zip(img_metas, multi_scale_outputs):
+            aggregated_heatmaps, tags = self._aggregate_multi_scale(
+                img_meta, outputs)
+
+            # perform grouping
+            grouped, _scores = self.parser.parse(aggregated_heatmaps, tags,
+                                                 self.test_cfg['adjust'],
+                                                 self.test_cfg['refine'])
+
+            _preds = get_group_preds(
+                grouped,
+                img_meta['center'],
+                img_meta['scale'],
+                [aggregated_heatmaps.size(3),
+                 aggregated_heatmaps.size(2)],
+                use_udp=self.use_udp)
+
+            preds.extend(_preds)
+            scores.extend(_scores)
+            num_people.append(len(_preds))
+            image_paths.append(img_meta['image_file'])
+            heatmaps.append(aggregated_heatmaps)
 
-        test_scale_factor = img_metas['test_scale_factor']
-        base_size = img_metas['base_size']
-        center = img_metas['center']
-        scale = img_metas['scale']
+        if return_heatmap:
+            # the heatmaps of different sizes are padded at the bottom and
+            # the right
+            heatmap_h = max(heatmap.size(2) for heatmap in heatmaps)
+            heatmap_w = max(heatmap.size(3) for heatmap in heatmaps)
+            output_heatmap = torch.cat([
+                F.pad(heatmap, (0, heatmap_w - heatmap.size(3), 0,
+                                heatmap_h - heatmap.size(2)))
+                for heatmap in heatmaps
+            ]).detach().cpu().numpy()
+        else:
+            output_heatmap = None
 
-        result = {}
+        result['preds'] = preds
+        result['scores'] = scores
+        result['num_people'] = num_people
+        result['image_paths'] = image_paths
+        result['output_heatmap'] = output_heatmap
+
+        return result
+
+    def _aggregate_multi_scale(self, img_meta, outputs):
+        """Aggregate the outputs of the test scales of an image.
+
+        Args:
+            img_meta (dict): The meta info of the image.
+            outputs (list(tuple)): The outputs of each test scale and of its
+                flipped image, returned by :meth:`_forward_multi_scale`.
+
+        Returns:
+            tuple: The averaged heatmaps and the concatenated tags.
+        """
+        test_scale_factor = img_meta['test_scale_factor']
 
         aggregated_heatmaps = None
         tags_list = []
         for idx, s in enumerate(sorted(test_scale_factor, reverse=True)):
-            image_resized = aug_data[idx].to(img.device)
-
-            features = self.backbone(image_resized)
-            if self.with_keypoint:
-                outputs = self.keypoint_head(features)
-
-            if self.test_cfg.get('flip_test', True):
-                # use flip test
-                features_flipped = self.backbone(
-                    torch.flip(image_resized, [3]))
-                if self.with_keypoint:
-                    outputs_flipped = self.keypoint_head(features_flipped)
-            else:
-                outputs_flipped = None
+            outputs_, outputs_flipped = outputs[idx]
 
             _, heatmaps, tags = get_multi_stage_outputs(
-                outputs,
+                outputs_,
                 outputs_flipped,
                 self.test_cfg['num_joints'],
                 self.test_cfg['with_heatmaps'],
                 self.test_cfg['with_ae'],
                 self.test_cfg['tag_per_joint'],
-                img_metas['flip_index'],
+                img_meta['flip_index'],
                 self.test_cfg['project2image'],
-                base_size,
+                img_meta['base_size'],
                 align_corners=self.use_udp)
 
             aggregated_heatmaps, tags_list = aggregate_results(
@@ -271,32 +324,94 @@ class AssociativeEmbedding(BasePose):
             len(test_scale_factor))
         tags = torch.cat(tags_list, dim=4)
 
-        # perform grouping
-        grouped, scores = self.parser.parse(aggregated_heatmaps, tags,
-                                            self.test_cfg['adjust'],
-                                            self.test_cfg['refine'])
+        return aggregated_heatmaps, tags
 
-        preds = get_group_preds(
-            grouped,
-            center,
-            scale, [aggregated_heatmaps.size(3),
-                    aggregated_heatmaps.size(2)],
-            use_udp=self.use_udp)
+    def _forward_multi_scale(self, images):
+        """Run the model on the images of all the test scales and their
+        flipped images if flip test is used.
 
-        image_paths = []
-        image_paths.append(img_metas['image_file'])
+        The images of the same test scale in a batch are padded to the
+        largest size at the bottom and the right and run as one batch, and
+        the outputs are cropped back. With ``flip_test_mode='batched'`` in
+        test_cfg, the images and their flipped images are run as one batch.
+        With ``batch_scales=True``, the images of all the scales are run as
+        one batch. The padding may slightly change the outputs near the
+        bottom and the right border of the smaller images.
 
-        if return_heatmap:
-            output_heatmap = aggregated_heatmaps.detach().cpu().numpy()
-        else:
-            output_heatmap = None
+        Args:
+            images (list(list(torch.Tensor[1xCximgHximgW]))): The resized
+                images of the test scales of each image in the batch.
 
-        result['preds'] = preds
-        result['scores'] = scores
-        result['image_paths'] = image_paths
-        result['output_heatmap'] = output_heatmap
+        Returns:
+            list(list(tuple)): The outputs of the keypoint head for the
+                image of each test scale of each image in the batch and its
+                flipped image (None if flip test is not used).
+        """
+        flip_test = self.test_cfg.get('flip_test', True)
+        flip_test_mode = self.test_cfg.get('flip_test_mode', 'separate')
+        assert flip_test_mode in ('separate', 'batched')
+        num_scales = len(images[0])
+        assert all(len(scale_images) == num_scales for scale_images in images)
+
+        # the (image index, scale index) of the images in each group
+        if self.test_cfg.get('batch_scales', False):
+            groups = [[(i, j) for j in range(num_scales)
+                       for i in range(len(images))]]
+        else:
+            groups = [[(i, j) for i in range(len(images))]
+                      for j in range(num_scales)]
+
+        results = [[None] * num_scales for _ in images]
+        for group in groups:
+            group_images = [images[i][j] for i, j in group]
+            sizes = [image.shape[2:] for image in group_images]
+            batch_h = max(h for h, _ in sizes)
+            batch_w = max(w for _, w in sizes)
+            inputs = [
+                F.pad(image, (0, batch_w - w, 0, batch_h - h))
+                for image, (h, w) in zip(group_images, sizes)
+            ]
+            if flip_test:
+                inputs += [
+                    F.pad(
+                        torch.flip(image, [3]),
+                        (0, batch_w - w, 0, batch_h - h))
+                    for image, (h, w) in zip(group_images, sizes)
+                ]
+
+            if flip_test and flip_test_mode == 'separate':
+                # run the images and the flipped images separately
+                batches = [
+                    torch.cat(inputs[:len(group)]),
+                    torch.cat(inputs[len(group):])
+                ]
+            else:
+                batches = [torch.cat(inputs)]
 
-        return result
+            outputs = []
+            for batch in batches:
+                features = self.backbone(batch)
+                if self.with_keypoint:
+                    batch_outputs = self.keypoint_head(features)
+                for k in range(batch.size(0)):
+                    outputs.append(
+                        [output[k:k + 1] for output in batch_outputs])
+
+            # crop the outputs of the padded images
+            for k, image_outputs in enumerate(outputs):
+                h, w = sizes[k % len(group)]
+                outputs[k] = [
+                    output[..., :h * output.size(2) // batch_h, :w *
+                           output.size(3) // batch_w]
+                    for output in image_outputs
+                ]
+
+            for k, (i, j) in enumerate(group):
+                outputs_flipped = outputs[len(group) + k] if flip_test \
+                    else None
+                results[i][j] = (outputs[k], outputs_flipped)
+
+        return results
 
     def show_result(self,
                     img,
@@ -258,6 +258,37 @@ class PoseLifter(BasePose):
 
         return results
 
+    def forward_step(self, input, metas, cache=None):
+        """Defines the computation performed at every step when the
+        sequences are fed frame by frame. The backbone should support
+        ``forward_step``, e.g. :class:`TCN`, so the activations of the
+        previous frames are reused.
+
+        Args:
+            input (torch.Tensor[NxKixCix1]): Input keypoint coordinates of
+                the new frame.
+            metas (list(dict)): Information about data augmentation
+            cache (list|None): The cache returned by the previous step. If
+                None, the sequences start with ``input``.
+
+        Returns:
+            dict: The predicted poses, in the same form as ``forward_test``.
+            list: The cache for the next step.
+        """
+        assert input.size(0) == len(metas)
+        assert self.with_keypoint and not self.with_traj
+
+        results = {}
+
+        features, cache = self.backbone.forward_step(input, cache)
+        if self.with_neck:
+            features = self.neck(features)
+        output = self.keypoint_head.inference_model(features)
+        keypoint_result = self.keypoint_head.decode(metas, output)
+        results.update(keypoint_result)
+
+        return results, cache
+
     def forward_dummy(self, input):
         """Used for computing network FLOPs.
 
@@ -2,12 +2,14 @@ import warnings
 
 import mmcv
 import numpy as np
+import torch
 from mmcv.image import imwrite
 from mmcv.visualization.image import imshow
 
 from mmpose.core import imshow_bboxes, imshow_keypoints
 from .. import builder
 from ..builder import POSENETS
+from ..heads import TopdownHeatmapBaseHead
 from .base import BasePose
 
 try:
@@ -165,22 +167,38 @@ class TopDown(BasePose):
             assert 'bbox_id' in img_metas[0]
 
         result = {}
+        # keep the heatmaps on the device unless they are returned, so that
+        # only the decoded keypoints are copied to the host
+        head_kwargs = {}
+        if not return_heatmap and isinstance(self.keypoint_head,
+                                             TopdownHeatmapBaseHead):
+            head_kwargs['return_tensor'] = True
+
+        flip_test = self.test_cfg.get('flip_test', True)
+        flip_test_mode = self.test_cfg.get('flip_test_mode', 'separate')
+        assert flip_test_mode in ('separate', 'batched')
+        if flip_test and flip_test_mode == 'batched':
+            # run the images and the flipped images in one batch
+            output_heatmap = self._forward_flip_batched(
+                img, img_metas[0]['flip_pairs'], head_kwargs)
+            flip_test = False
+        else:
+            features = self.backbone(img)
+            if self.with_neck:
+                features = self.neck(features)
+            if self.with_keypoint:
+                output_heatmap = self.keypoint_head.inference_model(
+                    features, flip_pairs=None, **head_kwargs)
 
-        features = self.backbone(img)
-        if self.with_neck:
-            features = self.neck(features)
-        if self.with_keypoint:
-            output_heatmap = self.keypoint_head.inference_model(
-                features, flip_pairs=None)
-
-        if self.test_cfg.get('flip_test', True):
+        if flip_test:
             img_flipped = img.flip(3)
             features_flipped = self.backbone(img_flipped)
             if self.with_neck:
                 features_flipped = self.neck(features_flipped)
             if self.with_keypoint:
                 output_flipped_heatmap = self.keypoint_head.inference_model(
-                    features_flipped, img_metas[0]['flip_pairs'])
+                    features_flipped, img_metas[0]['flip_pairs'],
+                    **head_kwargs)
                 output_heatmap = (output_heatmap +
                                   output_flipped_heatmap) * 0.5
 
@@ -196,6 +214,45 @@ class TopDown(BasePose):
 
         return result
 
+    def _forward_flip_batched(self, img, flip_pairs, head_kwargs):
+        """Run flip test with the images and the flipped images in one batch.
+
+        Args:
+            img (torch.Tensor[NxCxHxW]): Input images.
+            flip_pairs (list[tuple()]): Pairs of keypoints which are mirrored.
+            head_kwargs (dict): Extra arguments of ``inference_model`` of the
+                keypoint head.
+
+        Returns:
+            np.ndarray | torch.Tensor | None: The average of the outputs of
+                the images and the flipped images.
+        """
+        batch_size = img.size(0)
+        features = self.backbone(torch.cat([img, img.flip(3)]))
+        if self.with_neck:
+            features = self.neck(features)
+        if not self.with_keypoint:
+            return None
+
+        if isinstance(self.keypoint_head, TopdownHeatmapBaseHead):
+            # run the head once and flip back the outputs of the flipped
+            # images
+            output = self.keypoint_head.inference_model(
+                features, flip_pairs=None, return_tensor=True)
+            output_heatmap = self.keypoint_head._get_output_heatmap(
+                output[:batch_size], None, **head_kwargs)
+            output_flipped_heatmap = self.keypoint_head._get_output_heatmap(
+                output[batch_size:], flip_pairs, **head_kwargs)
+        else:
+            # other heads flip back their outputs in inference_model
+            output_heatmap = self.keypoint_head.inference_model(
+                _slice_features(features, 0, batch_size), None, **head_kwargs)
+            output_flipped_heatmap = self.keypoint_head.inference_model(
+                _slice_features(features, batch_size, 2 * batch_size),
+                flip_pairs, **head_kwargs)
+
+        return (output_heatmap + output_flipped_heatmap) * 0.5
+
     def forward_dummy(self, img):
         """Used for computing network FLOPs.
 
@@ -299,3 +356,12 @@ class TopDown(BasePose):
             imwrite(img, out_file)
 
         return img
+
+
+def _slice_features(features, start, end):
+    """Slice the batch of the features, which is a tensor or a list/tuple of
+    tensors."""
+    if isinstance(features, (list, tuple)):
+        return type(features)(
+            _slice_features(feature, start, end) for feature in features)
+    return features[start:end]
@@ -4,6 +4,7 @@ import numpy as np
 import torch.nn as nn
 
 from mmpose.core.evaluation.top_down_eval import keypoints_from_heatmaps
+from mmpose.core.post_processing import flip_back
 
 
 class TopdownHeatmapBaseHead(nn.Module):
@@ -36,6 +37,40 @@ class TopdownHeatmapBaseHead(nn.Module):
     def inference_model(self, **kwargs):
         """Inference function."""
 
+    def _get_output_heatmap(self,
+                            output,
+                            flip_pairs=None,
+                            return_tensor=False):
+        """Get the heatmaps to decode from the output of the head.
+
+        Args:
+            output (torch.Tensor[NxKxHxW]): Output of the head.
+            flip_pairs (None | list[tuple()):
+                Pairs of keypoints which are mirrored.
+            return_tensor (bool): Option to keep the heatmaps as a tensor on
+                the device of the model, instead of copying them to a numpy
+                array. Default: False.
+
+        Returns:
+            output_heatmap (np.ndarray | torch.Tensor): Output heatmaps.
+        """
+        output_heatmap = output.detach()
+        if not return_tensor:
+            output_heatmap = output_heatmap.cpu().numpy()
+
+        if flip_pairs is not None:
+            output_heatmap = flip_back(
+                output_heatmap, flip_pairs, target_type=self.target_type)
+            # feature is not aligned, shift flipped heatmap for higher accuracy
+            if self.test_cfg.get('shift_heatmap', False):
+                if return_tensor:
+                    # the source and target of the shift overlap in memory
+                    output_heatmap[:, :, :, 1:] = \
+                        output_heatmap[:, :, :, :-1].clone()
+                else:
+                    output_heatmap[:, :, :, 1:] = output_heatmap[:, :, :, :-1]
+        return output_heatmap
+
     def decode(self, img_metas, output, **kwargs):
         """Decode keypoints from heatmaps.
 
@@ -47,7 +82,9 @@ class TopdownHeatmapBaseHead(nn.Module):
                 - "scale": scale of the bbox
                 - "rotation": rotation of the bbox
                 - "bbox_score": score of bbox
-            output (np.ndarray[N, K, H, W]): model predicted heatmaps.
+            output (np.ndarray[N, K, H, W] | torch.Tensor[N, K, H, W]): model
+                predicted heatmaps. Tensors are decoded on their own device
+                when the decoding options allow it.
         """
         batch_size = len(img_metas)
 
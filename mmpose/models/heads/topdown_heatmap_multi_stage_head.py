@@ -7,7 +7,6 @@ from mmcv.cnn import (ConvModule, DepthwiseSeparableConvModule, Linear,
                       kaiming_init, normal_init)
 
 from mmpose.core.evaluation import pose_pck_accuracy
-from mmpose.core.post_processing import flip_back
 from mmpose.models.builder import build_loss
 from ..builder import HEADS
 from .topdown_heatmap_base_head import TopdownHeatmapBaseHead
@@ -187,34 +186,24 @@ class TopdownHeatmapMultiStageHead(TopdownHeatmapBaseHead):
             out.append(y)
         return out
 
-    def inference_model(self, x, flip_pairs=None):
+    def inference_model(self, x, flip_pairs=None, return_tensor=False):
         """Inference function.
 
         Returns:
-            output_heatmap (np.ndarray): Output heatmaps.
+            output_heatmap (np.ndarray | torch.Tensor): Output heatmaps.
 
         Args:
             x (List[torch.Tensor[NxKxHxW]]): Input features.
             flip_pairs (None | list[tuple()):
                 Pairs of keypoints which are mirrored.
+            return_tensor (bool): Option to keep the heatmaps as a tensor on
+                the device of the model. Default: False.
         """
         output = self.forward(x)
         assert isinstance(output, list)
         output = output[-1]
 
-        if flip_pairs is not None:
-            # perform flip
-            output_heatmap = flip_back(
-                output.detach().cpu().numpy(),
-                flip_pairs,
-                target_type=self.target_type)
-            # feature is not aligned, shift flipped heatmap for higher accuracy
-            if self.test_cfg.get('shift_heatmap', False):
-                output_heatmap[:, :, :, 1:] = output_heatmap[:, :, :, :-1]
-        else:
-            output_heatmap = output.detach().cpu().numpy()
-
-        return output_heatmap
+        return self._get_output_heatmap(output, flip_pairs, return_tensor)
 
     def _make_deconv_layer(self, num_layers, num_filters, num_kernels):
         """Make deconv layers."""
@@ -533,31 +522,23 @@ class TopdownHeatmapMSMUHead(TopdownHeatmapBaseHead):
 
         return out
 
-    def inference_model(self, x, flip_pairs=None):
+    def inference_model(self, x, flip_pairs=None, return_tensor=False):
         """Inference function.
 
         Returns:
-            output_heatmap (np.ndarray): Output heatmaps.
+            output_heatmap (np.ndarray | torch.Tensor): Output heatmaps.
 
         Args:
             x (List[torch.Tensor[NxKxHxW]]): Input features.
             flip_pairs (None | list[tuple()):
                 Pairs of keypoints which are mirrored.
+            return_tensor (bool): Option to keep the heatmaps as a tensor on
+                the device of the model. Default: False.
         """
         output = self.forward(x)
         assert isinstance(output, list)
         output = output[-1]
-        if flip_pairs is not None:
-            output_heatmap = flip_back(
-                output.detach().cpu().numpy(),
-                flip_pairs,
-                target_type=self.target_type)
-            # feature is not aligned, shift flipped heatmap for higher accuracy
-            if self.test_cfg.get('shift_heatmap', False):
-                output_heatmap[:, :, :, 1:] = output_heatmap[:, :, :, :-1]
-        else:
-            output_heatmap = output.detach().cpu().numpy()
-        return output_heatmap
+        return self._get_output_heatmap(output, flip_pairs, return_tensor)
 
     def init_weights(self):
         """Initialize model weights."""
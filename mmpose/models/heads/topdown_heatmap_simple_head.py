@@ -4,7 +4,6 @@ from mmcv.cnn import (build_conv_layer, build_norm_layer, build_upsample_layer,
                       constant_init, normal_init)
 
 from mmpose.core.evaluation import pose_pck_accuracy
-from mmpose.core.post_processing import flip_back
 from mmpose.models.builder import build_loss
 from mmpose.models.utils.ops import resize
 from ..builder import HEADS
@@ -196,30 +195,22 @@ class TopdownHeatmapSimpleHead(TopdownHeatmapBaseHead):
         x = self.final_layer(x)
         return x
 
-    def inference_model(self, x, flip_pairs=None):
+    def inference_model(self, x, flip_pairs=None, return_tensor=False):
         """Inference function.
 
         Returns:
-            output_heatmap (np.ndarray): Output heatmaps.
+            output_heatmap (np.ndarray | torch.Tensor): Output heatmaps.
 
         Args:
             x (torch.Tensor[NxKxHxW]): Input features.
             flip_pairs (None | list[tuple()):
                 Pairs of keypoints which are mirrored.
+            return_tensor (bool): Option to keep the heatmaps as a tensor on
+                the device of the model. Default: False.
         """
         output = self.forward(x)
 
-        if flip_pairs is not None:
-            output_heatmap = flip_back(
-                output.detach().cpu().numpy(),
-                flip_pairs,
-                target_type=self.target_type)
-            # feature is not aligned, shift flipped heatmap for higher accuracy
-            if self.test_cfg.get('shift_heatmap', False):
-                output_heatmap[:, :, :, 1:] = output_heatmap[:, :, :, :-1]
-        else:
-            output_heatmap = output.detach().cpu().numpy()
-        return output_heatmap
+        return self._get_output_heatmap(output, flip_pairs, return_tensor)
 
     def _init_inputs(self, in_channels, in_index, input_transform):
         """Check and initialize input transforms.
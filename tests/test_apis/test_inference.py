@@ -1,9 +1,16 @@
+import copy
+
+import mmcv
 import numpy as np
 import pytest
 
 from mmpose.apis import (inference_bottom_up_pose_model,
-                         inference_top_down_pose_model, init_pose_model,
+                         inference_top_down_pose_model,
+                         inference_top_down_video_pose_model, init_pose_model,
                          process_mmdet_results, vis_pose_result)
+from mmpose.apis.inference import (_interpolate_pose_results,
+                                   _top_down_batch_crop,
+                                   _top_down_collate_bboxes)
 
 
 def test_top_down_demo():
@@ -146,6 +153,252 @@ def test_top_down_demo():
             dataset='test')
 
 
+def test_top_down_shared_frame():
+    pose_model = init_pose_model(
+        'configs/body/2d_kpt_sview_rgb_img/topdown_heatmap/'
+        'coco/res50_coco_256x192.py',
+        None,
+        device='cpu')
+    image_name = 'tests/data/coco/000000000785.jpg'
+    person_result = [{'bbox': [50, 50, 50, 100]}, {'bbox': [100, 80, 60, 120]}]
+
+    # the frame is shared by all bboxes, for both path and ndarray inputs
+    pose_results, _ = inference_top_down_pose_model(
+        pose_model, image_name, person_result, format='xywh')
+    img = mmcv.imread(image_name)
+    pose_results_ndarray, _ = inference_top_down_pose_model(
+        pose_model, img, person_result, format='xywh')
+
+    assert len(pose_results) == len(pose_results_ndarray) == 2
+    for res, res_ndarray in zip(pose_results, pose_results_ndarray):
+        np.testing.assert_allclose(res['keypoints'], res_ndarray['keypoints'])
+
+
+def test_inference_cache():
+    pose_model = init_pose_model(
+        'configs/body/2d_kpt_sview_rgb_img/topdown_heatmap/'
+        'coco/res50_coco_256x192.py',
+        None,
+        device='cpu')
+    image_name = 'tests/data/coco/000000000785.jpg'
+    person_result = [{'bbox': [50, 50, 50, 100]}]
+
+    pose_results, _ = inference_top_down_pose_model(
+        pose_model, image_name, person_result, format='xywh')
+    cache = pose_model._inference_cache['top_down']['TopDownCocoDataset']
+    test_pipeline = cache['test_pipeline']
+
+    # the cached pipeline is reused by the following calls
+    pose_results_cached, _ = inference_top_down_pose_model(
+        pose_model, image_name, person_result, format='xywh')
+    cache = pose_model._inference_cache['top_down']['TopDownCocoDataset']
+    assert cache['test_pipeline'] is test_pipeline
+    np.testing.assert_allclose(pose_results[0]['keypoints'],
+                               pose_results_cached[0]['keypoints'])
+
+    # the cache is reset when the config is replaced
+    pose_model.cfg = copy.deepcopy(pose_model.cfg)
+    _ = inference_top_down_pose_model(
+        pose_model, image_name, person_result, format='xywh')
+    cache = pose_model._inference_cache['top_down']['TopDownCocoDataset']
+    assert cache['test_pipeline'] is not test_pipeline
+
+
+def test_top_down_batch_crop():
+    for config in ('res50_coco_256x192.py', 'hrnet_w32_coco_256x192_udp.py'):
+        pose_model = init_pose_model(
+            'configs/body/2d_kpt_sview_rgb_img/topdown_heatmap/coco/' + config,
+            None,
+            device='cpu')
+        image_name = 'tests/data/coco/000000000785.jpg'
+        bboxes = np.array([[50, 50, 50, 100, 0.9], [100, 80, 60, 120, 0.8],
+                           [-20, 300, 200, 150, 0.7]])
+        _ = inference_top_down_pose_model(
+            pose_model, image_name, [{
+                'bbox': bboxes[0]
+            }], format='xywh')
+        cache = pose_model._inference_cache['top_down']['TopDownCocoDataset']
+        assert cache['batch_crop_transforms'] is not None
+        frame = cache['load_image']({'img_or_path': image_name})
+
+        # the batched crop is equivalent to the per-bbox pipeline
+        batch_data = _top_down_batch_crop(pose_model.cfg, frame, bboxes,
+                                          'TopDownCocoDataset',
+                                          cache['ann_info'],
+                                          cache['batch_crop_transforms'])
+        batch_data_ref = _top_down_collate_bboxes(pose_model.cfg, frame,
+                                                  bboxes, 'TopDownCocoDataset',
+                                                  cache['ann_info'],
+                                                  cache['test_pipeline'])
+        assert batch_data['img'].shape == batch_data_ref['img'].shape
+        # allow rare 1-pixel differences of the interpolation
+        diff = (batch_data['img'] - batch_data_ref['img']).abs()
+        assert (diff > 1e-4).float().mean() < 1e-3
+        for img_metas, img_metas_ref in zip(batch_data['img_metas'],
+                                            batch_data_ref['img_metas']):
+            assert img_metas.keys() == img_metas_ref.keys()
+            np.testing.assert_allclose(img_metas['center'],
+                                       img_metas_ref['center'])
+            np.testing.assert_allclose(img_metas['scale'],
+                                       img_metas_ref['scale'])
+
+
+def test_top_down_max_batch_size():
+    pose_model = init_pose_model(
+        'configs/body/2d_kpt_sview_rgb_img/topdown_heatmap/'
+        'coco/res50_coco_256x192.py',
+        None,
+        device='cpu')
+    image_name = 'tests/data/coco/000000000785.jpg'
+    person_result = [{
+        'bbox': [50, 50, 50, 100]
+    }, {
+        'bbox': [100, 80, 60, 120]
+    }, {
+        'bbox': [10, 20, 100, 200]
+    }]
+    outputs = ('backbone.layer4', )
+
+    pose_results, returned_outputs = inference_top_down_pose_model(
+        pose_model,
+        image_name,
+        person_result,
+        return_heatmap=True,
+        outputs=outputs)
+
+    # the bboxes are processed in chunks of 2 and the results concatenated
+    pose_results_chunked, returned_outputs_chunked = \
+        inference_top_down_pose_model(
+            pose_model,
+            image_name,
+            person_result,
+            return_heatmap=True,
+            outputs=outputs,
+            max_batch_size=2)
+
+    assert len(pose_results_chunked) == len(pose_results) == 3
+    for res, res_chunked in zip(pose_results, pose_results_chunked):
+        np.testing.assert_allclose(
+            res['keypoints'], res_chunked['keypoints'], rtol=1e-5)
+    for name in ('heatmap', ) + outputs:
+        assert returned_outputs_chunked[0][name].shape == \
+            returned_outputs[0][name].shape
+        np.testing.assert_allclose(
+            returned_outputs_chunked[0][name],
+            returned_outputs[0][name],
+            rtol=1e-4,
+            atol=1e-5)
+
+
+def test_top_down_video():
+    pose_model = init_pose_model(
+        'configs/body/2d_kpt_sview_rgb_img/topdown_heatmap/'
+        'coco/res50_coco_256x192.py',
+        None,
+        device='cpu')
+    img = mmcv.imread('tests/data/coco/000000000785.jpg')
+    detected_frames = []
+
+    def detect(img):
+        detected_frames.append(img)
+        return [{
+            'bbox': [50, 50, 150, 250, 0.9]
+        }, {
+            'bbox': [100, 80, 160, 200, 0.8]
+        }, {
+            'bbox': [10, 20, 20, 30, 0.1]
+        }]
+
+    frames = [img.copy() for _ in range(8)]
+
+    # the detector runs on every 3 frames, and the people are cropped from
+    # their keypoints on the other frames
+    results = list(
+        inference_top_down_video_pose_model(
+            pose_model,
+            frames,
+            detect,
+            det_interval=3,
+            bbox_thr=0.3,
+            format='xyxy',
+            kpt_thr=-1))
+    assert len(detected_frames) == 3
+    assert all(detected is frames[i]
+               for detected, i in zip(detected_frames, [0, 3, 6]))
+    assert len(results) == len(frames)
+    for pose_results in results:
+        assert len(pose_results) == 2
+        assert pose_results[0]['bbox'].shape == (5, )
+        assert pose_results[0]['keypoints'].shape == (17, 3)
+
+    # all the frames are key frames if the people are lost
+    detected_frames.clear()
+    results = list(
+        inference_top_down_video_pose_model(
+            pose_model,
+            frames,
+            detect,
+            det_interval=3,
+            bbox_thr=0.3,
+            format='xyxy',
+            kpt_thr=2))
+    assert len(detected_frames) == len(results) == len(frames)
+
+    # interpolate the poses between the key frames, the last frame is always
+    # a key frame
+    detected_frames.clear()
+    results = list(
+        inference_top_down_video_pose_model(
+            pose_model,
+            frames,
+            detect,
+            det_interval=3,
+            propagation='interpolate',
+            bbox_thr=0.3,
+            format='xyxy'))
+    assert len(detected_frames) == 4
+    assert len(results) == len(frames)
+    for pose_results in results:
+        assert len(pose_results) == 2
+        np.testing.assert_allclose(
+            pose_results[0]['keypoints'],
+            results[0][0]['keypoints'],
+            rtol=1e-5)
+
+    with pytest.raises(AssertionError):
+        next(
+            inference_top_down_video_pose_model(
+                pose_model, frames, detect, propagation='unknown'))
+
+
+def test_interpolate_pose_results():
+    results_start = [{
+        'bbox': np.array([0., 0., 10., 10.]),
+        'keypoints': np.zeros((17, 3)),
+        'track_id': 0
+    }, {
+        'bbox': np.array([100., 100., 110., 110.]),
+        'keypoints': np.zeros((17, 3)),
+        'track_id': 1
+    }]
+    results_end = [{
+        'bbox': np.array([50., 50., 60., 60.]),
+        'keypoints': np.ones((17, 3)),
+    }, {
+        'bbox': np.array([3., 0., 13., 10.]),
+        'keypoints': np.full((17, 3), 3.),
+    }]
+    interpolated = _interpolate_pose_results(results_start, results_end, 2)
+    assert len(interpolated) == 2
+    for i, pose_results in enumerate(interpolated):
+        # only the matched person is interpolated
+        assert len(pose_results) == 1
+        assert pose_results[0]['track_id'] == 0
+        np.testing.assert_allclose(pose_results[0]['keypoints'], i + 1)
+        np.testing.assert_allclose(pose_results[0]['bbox'],
+                                   [i + 1, 0, i + 11, 10])
+
+
 def test_bottom_up_demo():
 
     # build the pose model from a config file and a checkpoint file
@@ -163,6 +416,29 @@ def test_bottom_up_demo():
     vis_pose_result(
         pose_model, image_name, pose_results, dataset='BottomUpCocoDataset')
 
+    # test a batch of images of different sizes
+    image_names = [
+        'tests/data/coco/000000000785.jpg', 'tests/data/coco/000000196141.jpg',
+        'tests/data/coco/000000040083.jpg'
+    ]
+    pose_results, returned_outputs = inference_bottom_up_pose_model(
+        pose_model, image_names, return_heatmap=True)
+    assert len(pose_results) == 3
+    assert len(returned_outputs) == 1
+    assert returned_outputs[0]['heatmap'].shape[0] == 3
+    _, returned_outputs_single = inference_bottom_up_pose_model(
+        pose_model, image_names[0], return_heatmap=True)
+    np.testing.assert_allclose(
+        returned_outputs[0]['heatmap'][:1],
+        returned_outputs_single[0]['heatmap'],
+        rtol=1e-4,
+        atol=1e-5)
+
+    pose_results, returned_outputs = inference_bottom_up_pose_model(
+        pose_model, image_names, max_batch_size=2)
+    assert len(pose_results) == 3
+    assert len(returned_outputs) == 2
+
 
 def test_process_mmdet_results():
     det_results = [np.array([0, 0, 100, 100])]
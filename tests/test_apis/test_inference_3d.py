@@ -7,10 +7,11 @@ import pytest
 import torch
 from tests.utils.mesh_utils import generate_smpl_weight_file
 
-from mmpose.apis import (extract_pose_sequence, inference_interhand_3d_model,
-                         inference_mesh_model, inference_pose_lifter_model,
-                         init_pose_model, vis_3d_mesh_result,
-                         vis_3d_pose_result)
+from mmpose.apis import (StreamingPoseLifter, extract_pose_sequence,
+                         inference_interhand_3d_model, inference_mesh_model,
+                         inference_pose_lifter_batch,
+                         inference_pose_lifter_model, init_pose_model,
+                         vis_3d_mesh_result, vis_3d_pose_result)
 from mmpose.models import build_posenet
 
 
@@ -115,6 +116,119 @@ def test_pose_lifter_demo():
         dataset=dataset)
 
 
+def test_pose_lifter_batch():
+    rng = np.random.RandomState(0)
+    for config, seq_len in [
+        ('configs/body/3d_kpt_sview_rgb_img/pose_lift/'
+         'h36m/simplebaseline3d_h36m.py', 1),
+        ('configs/body/3d_kpt_sview_rgb_vid/video_pose_lift/h36m/'
+         'videopose3d_h36m_27frames_fullconv_supervised.py', 27)
+    ]:
+        pose_model = init_pose_model(config, None, device='cpu')
+        dataset = pose_model.cfg.data['test']['type']
+
+        keypoints = rng.rand(3, seq_len, 17, 3) * 100
+        bboxes = np.tile([10., 10., 60., 90.], (3, seq_len, 1))
+        bboxes[..., 2:] += rng.rand(3, seq_len, 2) * 20
+        poses_3d = inference_pose_lifter_batch(
+            pose_model,
+            keypoints,
+            dataset,
+            bbox_centers=(bboxes[..., :2] + bboxes[..., 2:]) / 2,
+            bbox_scales=(bboxes[..., 2:] - bboxes[..., :2]).max(axis=-1),
+            image_size=[1000, 1000])
+        assert poses_3d.shape == (3, 17, 4)
+
+        # the same as lifting the people one by one
+        for i in range(3):
+            pose_results_2d = [[{
+                'keypoints': keypoints[i, t],
+                'bbox': bboxes[i, t]
+            }] for t in range(seq_len)]
+            pose_lift_results = inference_pose_lifter_model(
+                pose_model,
+                pose_results_2d,
+                dataset,
+                with_track_id=False,
+                image_size=[1000, 1000],
+                norm_pose_2d=True)
+            np.testing.assert_allclose(
+                poses_3d[i],
+                pose_lift_results[0]['keypoints_3d'],
+                rtol=1e-4,
+                atol=1e-4)
+
+
+def test_streaming_pose_lifter():
+    rng = np.random.RandomState(0)
+    pose_results_2d = []
+    for frame_idx in range(20):
+        pose_det_results = []
+        for track_id in range(3):
+            # track 1 is lost for a few frames, and track 2 leaves early
+            if track_id == 1 and 6 <= frame_idx < 9 or \
+                    track_id == 2 and frame_idx >= 15:
+                continue
+            pose_det_results.append({
+                'keypoints': rng.rand(17, 3) * 100,
+                'bbox': [10, 10, 60, 90],
+                'track_id': track_id
+            })
+        pose_results_2d.append(pose_det_results)
+
+    for causal in (True, False):
+        cfg = mmcv.Config.fromfile(
+            'configs/body/3d_kpt_sview_rgb_vid/video_pose_lift/h36m/'
+            'videopose3d_h36m_243frames_fullconv_supervised_cpn_ft.py')
+        cfg.model.backbone.update(
+            stem_channels=16, num_blocks=1, kernel_sizes=(3, 3), causal=causal)
+        cfg.model.keypoint_head.in_channels = 16
+        cfg.test_data_cfg.update(seq_len=9, causal=causal)
+        pose_model = init_pose_model(cfg, None, device='cpu')
+        dataset = pose_model.cfg.data['test']['type']
+
+        expected = []
+        for i in range(len(pose_results_2d)):
+            pose_results_2d_seq = extract_pose_sequence(
+                pose_results_2d, i, causal=causal, seq_len=9, step=1)
+            expected.append(
+                inference_pose_lifter_model(
+                    pose_model,
+                    pose_results_2d_seq,
+                    dataset,
+                    image_size=[1000, 1000],
+                    norm_pose_2d=True))
+
+        for use_cache in (False, True):
+            lifter = StreamingPoseLifter(
+                pose_model,
+                dataset,
+                image_size=[1000, 1000],
+                norm_pose_2d=True,
+                use_cache=use_cache)
+            assert lifter.use_cache == use_cache
+            results = []
+            for i, pose_det_results in enumerate(pose_results_2d):
+                frames = lifter.update(pose_det_results)
+                # the frames on the right are needed if not causal
+                assert len(frames) == int(causal or i >= 4)
+                results.extend(frames)
+            results.extend(lifter.flush())
+
+            assert [frame_idx for frame_idx, _ in results] == list(range(20))
+            for (_, pose_lift_results), expected_results in zip(
+                    results, expected):
+                assert len(pose_lift_results) == len(expected_results)
+                for res, expected_res in zip(pose_lift_results,
+                                             expected_results):
+                    assert res['track_id'] == expected_res['track_id']
+                    np.testing.assert_allclose(
+                        res['keypoints_3d'],
+                        expected_res['keypoints_3d'],
+                        rtol=1e-4,
+                        atol=1e-4)
+
+
 def test_interhand3d_demo():
     # H36M demo
     pose_model = init_pose_model(
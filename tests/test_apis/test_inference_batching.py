@@ -0,0 +1,83 @@
+import threading
+
+import mmcv
+import numpy as np
+import pytest
+
+from mmpose.apis import (TopDownPoseBatcher, inference_top_down_pose_model,
+                         init_pose_model)
+
+
+def test_top_down_pose_batcher():
+    pose_model = init_pose_model(
+        'configs/body/2d_kpt_sview_rgb_img/topdown_heatmap/'
+        'coco/res50_coco_256x192.py',
+        None,
+        device='cpu')
+    image_name = 'tests/data/coco/000000000785.jpg'
+    img = mmcv.imread(image_name)
+    frames = [
+        (image_name, [{
+            'bbox': [50, 50, 50, 100, 0.9],
+            'track_id': 0
+        }]),
+        (img, [{
+            'bbox': [100, 80, 60, 120, 0.8]
+        }, {
+            'bbox': [10, 20, 100, 200, 0.7]
+        }]),
+        (img, []),
+        (image_name, [{
+            'bbox': [-20, 300, 200, 150, 0.1]
+        }, {
+            'bbox': [50, 50, 50, 100, 0.9]
+        }]),
+    ]
+    expected_results = [
+        inference_top_down_pose_model(
+            pose_model, img_or_path, person_results, bbox_thr=0.3)[0]
+        for img_or_path, person_results in frames
+    ]
+
+    for batch_size in (1, 2, 16):
+        with TopDownPoseBatcher(
+                pose_model, batch_size=batch_size, max_latency=0.05,
+                bbox_thr=0.3) as batcher:
+            futures = [
+                batcher.submit(img_or_path, person_results)
+                for img_or_path, person_results in frames
+            ]
+            pose_results = [future.result() for future in futures]
+
+        # results are scattered back to the frames in order
+        assert len(pose_results) == len(expected_results)
+        for results, expected in zip(pose_results, expected_results):
+            assert len(results) == len(expected)
+            for res, res_expected in zip(results, expected):
+                np.testing.assert_allclose(
+                    res['keypoints'], res_expected['keypoints'], rtol=1e-5)
+                np.testing.assert_allclose(res['bbox'], res_expected['bbox'])
+                assert res.get('track_id') == res_expected.get('track_id')
+
+    # the frames submitted concurrently with close() are either rejected or
+    # run before the worker stops
+    batcher = TopDownPoseBatcher(pose_model, batch_size=4, max_latency=0.05)
+    futures = []
+
+    def _submit():
+        for _ in range(5):
+            try:
+                futures.append(batcher.submit(img, frames[1][1]))
+            except RuntimeError:
+                break
+
+    threads = [threading.Thread(target=_submit) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    batcher.close()
+    for thread in threads:
+        thread.join()
+    for future in futures:
+        assert len(future.result(timeout=60)) == 2
+    with pytest.raises(RuntimeError):
+        batcher.submit(img, frames[1][1])
@@ -0,0 +1,67 @@
+import threading
+import time
+
+import pytest
+
+from mmpose.apis import StreamingPipeline
+
+
+def test_streaming_pipeline():
+    # the outputs are in the order of the inputs
+    pipeline = StreamingPipeline([lambda x: x + 1, lambda x: x * 2])
+    assert list(pipeline.run(range(20))) == [(x + 1) * 2 for x in range(20)]
+    assert list(pipeline.run([])) == []
+
+    # also with several workers which finish the items out of order
+    def shuffle(x):
+        time.sleep(0.001 * (x % 3))
+        return x
+
+    # a stage with one worker gets the items in order
+    seen = []
+
+    def record(x):
+        seen.append(x)
+        return x
+
+    pipeline = StreamingPipeline([(shuffle, 3), record, (shuffle, 2)],
+                                 queue_size=2)
+    assert list(pipeline.run(range(30))) == list(range(30))
+    assert seen == list(range(30))
+
+    # the stages run at the same time
+    def slow(x):
+        time.sleep(0.02)
+        return x
+
+    pipeline = StreamingPipeline([slow, slow, slow])
+    start = time.perf_counter()
+    assert list(pipeline.run(range(20))) == list(range(20))
+    assert time.perf_counter() - start < 3 * 20 * 0.02
+
+    # the errors of the stages are raised
+    def fail(x):
+        if x == 5:
+            raise ValueError('stage failed')
+        return x
+
+    pipeline = StreamingPipeline([slow, fail, slow])
+    with pytest.raises(ValueError, match='stage failed'):
+        list(pipeline.run(range(20)))
+
+    def fail_inputs():
+        yield 0
+        raise ValueError('input failed')
+
+    with pytest.raises(ValueError, match='input failed'):
+        list(pipeline.run(fail_inputs()))
+
+    # the workers stop when the caller stops early
+    num_threads = threading.active_count()
+    for x in pipeline.run(range(100)):
+        if x == 3:
+            break
+    assert threading.active_count() == num_threads
+
+    with pytest.raises(AssertionError):
+        StreamingPipeline([])
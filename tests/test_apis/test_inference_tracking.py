@@ -1,8 +1,11 @@
+import numpy as np
 import pytest
 
-from mmpose.apis import (get_track_id, inference_bottom_up_pose_model,
+from mmpose.apis import (PoseTracker, get_track_id,
+                         inference_bottom_up_pose_model,
                          inference_top_down_pose_model, init_pose_model,
                          vis_pose_tracking_result)
+from mmpose.core import OneEuroFilter
 
 
 def test_top_down_pose_tracking_demo():
@@ -148,3 +151,117 @@ def test_bottom_up_pose_tracking_demo():
     # one_euro
     pose_results, next_id = get_track_id(
         pose_results, pose_results_last, next_id=next_id, use_one_euro=True)
+
+
+def _demo_pose_results(bboxes):
+    pose_results = []
+    for bbox in bboxes:
+        bbox = np.array(bbox, dtype=np.float32)
+        keypoints = np.ones((17, 3), dtype=np.float32)
+        keypoints[:, 0] = np.linspace(bbox[0], bbox[2], 17)
+        keypoints[:, 1] = np.linspace(bbox[1], bbox[3], 17)
+        pose_results.append(dict(bbox=bbox, keypoints=keypoints))
+    return pose_results
+
+
+def test_pose_tracker():
+    bboxes = [[0, 0, 10, 10], [6, 0, 16, 10], [50, 50, 80, 90]]
+    for use_oks in (False, True):
+        for assignment in ('hungarian', 'greedy'):
+            tracker = PoseTracker(use_oks=use_oks, assignment=assignment)
+            pose_results = tracker.update(_demo_pose_results(bboxes))
+            assert [res['track_id'] for res in pose_results] == [0, 1, 2]
+
+            # the same people in another order, and a new person
+            pose_results = tracker.update(
+                _demo_pose_results(bboxes[::-1] + [[100, 100, 120, 150]]))
+            assert [res['track_id'] for res in pose_results] == [2, 1, 0, 3]
+
+            # the same as get_track_id for people far from each other
+            results_last = _demo_pose_results(bboxes[1:])
+            results_last, next_id = get_track_id(
+                results_last, [], 0, use_oks=use_oks)
+            pose_results, _ = get_track_id(
+                _demo_pose_results(bboxes[:0:-1]),
+                results_last,
+                next_id,
+                use_oks=use_oks)
+            tracker.reset()
+            tracker.update(_demo_pose_results(bboxes[1:]))
+            tracker_results = tracker.update(_demo_pose_results(bboxes[:0:-1]))
+            assert [res['track_id'] for res in tracker_results] == \
+                [res['track_id'] for res in pose_results]
+
+            # the tracks are lost on an empty frame
+            assert tracker.update([]) == []
+            pose_results = tracker.update(_demo_pose_results(bboxes))
+            assert [res['track_id'] for res in pose_results] == [2, 3, 4]
+
+    # the global assignment avoids the id swaps of greedy matching
+    tracker = PoseTracker()
+    tracker.update(_demo_pose_results([[0, 0, 10, 10], [6, 0, 16, 10]]))
+    pose_results = tracker.update(
+        _demo_pose_results([[4, 0, 14, 10], [8, 0, 18, 10]]))
+    assert [res['track_id'] for res in pose_results] == [0, 1]
+
+    # people with too few keypoints are not tracked
+    tracker = PoseTracker()
+    pose_results = _demo_pose_results(bboxes)
+    pose_results[1]['keypoints'][3:, 1] = 0
+    pose_results = tracker.update(pose_results)
+    assert [res['track_id'] for res in pose_results] == [0, -1, 1]
+
+    # the keypoints of each track are smoothed by one-euro-filter
+    tracker = PoseTracker(use_one_euro=True, fps=30)
+    filters = {}
+    for t in range(3):
+        pose_results = _demo_pose_results(
+            [np.array(bbox) + t for bbox in bboxes[::(-1)**t]])
+        expected = [res['keypoints'][:, :2].copy() for res in pose_results]
+        pose_results = tracker.update(pose_results)
+        for res, keypoints in zip(pose_results, expected):
+            if t == 0:
+                filters[res['track_id']] = OneEuroFilter(keypoints, fps=30)
+            else:
+                keypoints = filters[res['track_id']](keypoints)
+            np.testing.assert_allclose(res['keypoints'][:, :2], keypoints)
+
+    # the tracks are kept for max_miss frames
+    for max_miss in (0, 2):
+        tracker = PoseTracker(max_miss=max_miss, use_one_euro=True)
+        tracker.update(_demo_pose_results(bboxes))
+        tracker.update(_demo_pose_results(bboxes[:1]))
+        tracker.update([])
+        assert (tracker.ages == 3).all()
+        pose_results = tracker.update(_demo_pose_results(bboxes))
+        if max_miss == 0:
+            assert [res['track_id'] for res in pose_results] == [3, 4, 5]
+        else:
+            assert [res['track_id'] for res in pose_results] == [0, 1, 2]
+            np.testing.assert_array_equal(tracker.ages, [4, 4, 4])
+            np.testing.assert_array_equal(tracker.hits, [3, 2, 2])
+            np.testing.assert_array_equal(tracker.misses, [0, 0, 0])
+        tracker.update([])
+        tracker.update([])
+        tracker.update([])
+        assert len(tracker.track_ids) == 0
+        assert len(tracker.one_euro) == 0
+
+    # the bounding boxes of the tracks are moved with their velocities
+    for use_velocity in (False, True):
+        tracker = PoseTracker(max_miss=1, use_velocity=use_velocity)
+        track_ids = []
+        for t in range(5):
+            # the person is missed on the 4th frame
+            bbox = [t * 5, 0, t * 5 + 10, 10]
+            pose_results = tracker.update(
+                _demo_pose_results([bbox] if t != 3 else []))
+            track_ids += [res['track_id'] for res in pose_results]
+        if use_velocity:
+            assert track_ids == [0, 0, 0, 0]
+            np.testing.assert_allclose(tracker.velocities, [[5, 0, 5, 0]])
+        else:
+            assert track_ids == [0, 0, 0, 1]
+
+    with pytest.raises(AssertionError):
+        PoseTracker(assignment='unknown')
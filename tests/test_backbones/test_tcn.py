@@ -150,3 +150,27 @@ def test_tcn_backbone():
     for m1, m2 in zip(model1.modules(), model2.modules()):
         if isinstance(m1, nn.Conv1d):
             assert torch.isclose(m1.weight.grad, m2.weight.grad).all()
+
+
+def test_tcn_forward_step():
+    for use_stride_conv in (False, True):
+        model = TCN(
+            in_channels=34,
+            stem_channels=16,
+            num_blocks=2,
+            kernel_sizes=(3, 3, 3),
+            use_stride_conv=use_stride_conv)
+        model.eval()
+        assert model.receptive_field == 27
+
+        pose2d = torch.rand((2, 34, 10))
+        # the sequences are padded by replicating the first frame
+        padded = torch.cat((pose2d[:, :, :1].expand(-1, -1, 26), pose2d), 2)
+        cache = None
+        with torch.no_grad():
+            for t in range(pose2d.shape[2]):
+                outs, cache = model.forward_step(pose2d[:, :, t:t + 1], cache)
+                expected = model(padded[:, :, t:t + 27])
+                assert len(outs) == 2
+                assert outs[-1].shape == (2, 16, 1)
+                torch.testing.assert_close(outs[-1], expected[-1][:, :, -1:])
@@ -54,6 +54,22 @@ def test_body3d_h36m_dataset():
         np.testing.assert_almost_equal(infos['P-MPJPE'], 0.0)
         np.testing.assert_almost_equal(infos['N-MPJPE'], 0.0)
 
+    # the errors accumulated batch by batch are the same as evaluate
+    rng = np.random.RandomState(0)
+    for output in outputs:
+        output['preds'] = output['preds'] + rng.randn(
+            *output['preds'].shape) * 0.1
+    accumulator = custom_dataset.get_accumulator(metrics)
+    for output in outputs:
+        custom_dataset.accumulate(accumulator, output)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        infos = custom_dataset.evaluate(outputs, tmpdir, metrics)
+    infos_accumulated = custom_dataset.evaluate_accumulator(
+        accumulator, metric=metrics)
+    assert list(infos_accumulated) == list(infos)
+    for name, value in infos.items():
+        np.testing.assert_almost_equal(infos_accumulated[name], value)
+
     # test multi-frame input with joint_2d_src = 'detection'
     data_cfg = dict(
         num_joints=17,
@@ -93,6 +93,25 @@ def test_bottom_up_COCO_dataset():
         infos = custom_dataset.evaluate(outputs, tmpdir, 'mAP')
         assert_almost_equal(infos['AP'], 1.0)
 
+        # the outputs of batches of 2 images
+        batch_outputs = []
+        for output, output_next in zip(outputs[::2], outputs[1::2]):
+            batch_outputs.append({
+                'preds':
+                list(output['preds']) + list(output_next['preds']),
+                'scores':
+                output['scores'] + output_next['scores'],
+                'num_people':
+                [len(output['preds']),
+                 len(output_next['preds'])],
+                'image_paths':
+                output['image_paths'] + output_next['image_paths'],
+                'output_heatmap':
+                None
+            })
+        infos = custom_dataset.evaluate(batch_outputs, tmpdir, 'mAP')
+        assert_almost_equal(infos['AP'], 1.0)
+
         with pytest.raises(KeyError):
             _ = custom_dataset.evaluate(outputs, tmpdir, 'PCK')
 
@@ -108,6 +108,21 @@ def test_face_300W_dataset():
         with pytest.raises(KeyError):
             _ = custom_dataset.evaluate(outputs, tmpdir, 'mAP')
 
+    # the metrics accumulated batch by batch are the same as evaluate
+    rng = np.random.RandomState(0)
+    for output in outputs:
+        output['preds'][:, :, :2] += rng.randn(
+            len(output['preds']), output['preds'].shape[1], 2)
+    accumulator = custom_dataset.get_accumulator(['NME'])
+    for output in outputs:
+        custom_dataset.accumulate(accumulator, output)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        infos = custom_dataset.evaluate(outputs, tmpdir, ['NME'])
+    infos_accumulated = custom_dataset.evaluate_accumulator(accumulator)
+    assert list(infos_accumulated) == list(infos)
+    for name, value in infos.items():
+        assert_almost_equal(infos_accumulated[name], value, decimal=5)
+
 
 def test_face_AFLW_dataset():
     dataset = 'FaceAFLWDataset'
@@ -159,6 +174,21 @@ def test_face_AFLW_dataset():
         with pytest.raises(KeyError):
             _ = custom_dataset.evaluate(outputs, tmpdir, 'mAP')
 
+    # the metrics accumulated batch by batch are the same as evaluate
+    rng = np.random.RandomState(0)
+    for output in outputs:
+        output['preds'][:, :, :2] += rng.randn(
+            len(output['preds']), output['preds'].shape[1], 2)
+    accumulator = custom_dataset.get_accumulator(['NME'])
+    for output in outputs:
+        custom_dataset.accumulate(accumulator, output)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        infos = custom_dataset.evaluate(outputs, tmpdir, ['NME'])
+    infos_accumulated = custom_dataset.evaluate_accumulator(accumulator)
+    assert list(infos_accumulated) == list(infos)
+    for name, value in infos.items():
+        assert_almost_equal(infos_accumulated[name], value, decimal=5)
+
 
 def test_face_WFLW_dataset():
     dataset = 'FaceWFLWDataset'
@@ -108,6 +108,21 @@ def test_top_down_OneHand10K_dataset():
         with pytest.raises(KeyError):
             infos = custom_dataset.evaluate(outputs, tmpdir, 'mAP')
 
+    # the metrics accumulated batch by batch are the same as evaluate
+    rng = np.random.RandomState(0)
+    for output in outputs:
+        output['preds'][:, :, :2] += rng.randn(
+            len(output['preds']), output['preds'].shape[1], 2)
+    accumulator = custom_dataset.get_accumulator(['PCK', 'EPE', 'AUC'])
+    for output in outputs:
+        custom_dataset.accumulate(accumulator, output)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        infos = custom_dataset.evaluate(outputs, tmpdir, ['PCK', 'EPE', 'AUC'])
+    infos_accumulated = custom_dataset.evaluate_accumulator(accumulator)
+    assert list(infos_accumulated) == list(infos)
+    for name, value in infos.items():
+        assert_almost_equal(infos_accumulated[name], value, decimal=5)
+
 
 def test_top_down_FreiHand_dataset():
     dataset = 'FreiHandDataset'
@@ -277,6 +292,22 @@ def test_top_down_Panoptic_dataset():
         with pytest.raises(KeyError):
             infos = custom_dataset.evaluate(outputs, tmpdir, 'mAP')
 
+    # the metrics accumulated batch by batch are the same as evaluate
+    rng = np.random.RandomState(0)
+    for output in outputs:
+        output['preds'][:, :, :2] += rng.randn(
+            len(output['preds']), output['preds'].shape[1], 2)
+    accumulator = custom_dataset.get_accumulator(['PCKh', 'EPE', 'AUC'])
+    for output in outputs:
+        custom_dataset.accumulate(accumulator, output)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        infos = custom_dataset.evaluate(outputs, tmpdir,
+                                        ['PCKh', 'EPE', 'AUC'])
+    infos_accumulated = custom_dataset.evaluate_accumulator(accumulator)
+    assert list(infos_accumulated) == list(infos)
+    for name, value in infos.items():
+        assert_almost_equal(infos_accumulated[name], value, decimal=5)
+
 
 def test_top_down_InterHand2D_dataset():
     dataset = 'InterHand2DDataset'
@@ -1,7 +1,9 @@
 import copy
+import os.path as osp
 import tempfile
 from unittest.mock import MagicMock
 
+import mmcv
 import numpy as np
 import pytest
 from numpy.testing import assert_almost_equal
@@ -128,9 +130,34 @@ def test_top_down_COCO_dataset():
         infos = custom_dataset.evaluate(outputs, tmpdir, 'mAP')
         assert_almost_equal(infos['AP'], 1.0)
 
+        # the repeated bbox ids are removed
+        res_file = osp.join(tmpdir, 'result_keypoints.json')
+        num_results = len(mmcv.load(res_file))
+        infos = custom_dataset.evaluate(outputs[::-1] + outputs, tmpdir)
+        assert_almost_equal(infos['AP'], 1.0)
+        assert len(mmcv.load(res_file)) == num_results
+
         with pytest.raises(KeyError):
             _ = custom_dataset.evaluate(outputs, tmpdir, 'PCK')
 
+    # evaluate in memory without saving the results
+    infos = custom_dataset.evaluate(outputs)
+    assert_almost_equal(infos['AP'], 1.0)
+
+    # the results accumulated batch by batch are evaluated as evaluate
+    rng = np.random.RandomState(0)
+    for output in outputs:
+        output['preds'][:, :, :2] += rng.randn(
+            len(output['preds']), output['preds'].shape[1], 2) * 5
+    accumulator = custom_dataset.get_accumulator('mAP')
+    for output in outputs[::-1] + outputs:
+        custom_dataset.accumulate(accumulator, output)
+    infos_accumulated = custom_dataset.evaluate_accumulator(accumulator)
+    assert infos_accumulated == custom_dataset.evaluate(outputs)
+
+    with pytest.raises(KeyError):
+        _ = custom_dataset.get_accumulator('PCK')
+
 
 def test_top_down_MHP_dataset():
     dataset = 'TopDownMhpDataset'
@@ -345,6 +372,9 @@ def test_top_down_CrowdPose_dataset():
         infos = custom_dataset.evaluate(outputs, tmpdir, 'mAP')
         assert_almost_equal(infos['AP'], 1.0)
 
+        infos = custom_dataset.evaluate(outputs, tmpdir, 'mAP', nproc=2)
+        assert_almost_equal(infos['AP'], 1.0)
+
         with pytest.raises(KeyError):
             _ = custom_dataset.evaluate(outputs, tmpdir, 'PCK')
 
@@ -0,0 +1,118 @@
+import pickle
+
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose, assert_almost_equal
+
+from mmpose.core import (KeypointAccumulator, MPJPEAccumulator,
+                         ResultAccumulator, keypoint_auc, keypoint_epe,
+                         keypoint_mpjpe, keypoint_pck_accuracy)
+from mmpose.core.evaluation.top_down_eval import keypoint_nme
+
+
+def _accumulate(accumulator, num_chunks, *arrays, **kwargs):
+    """Update the accumulator with the chunks of the arrays, and merge the
+    accumulators of the two halves of the chunks."""
+    others = [accumulator, pickle.loads(pickle.dumps(accumulator))]
+    chunks = [np.array_split(array, num_chunks) for array in arrays]
+    kwarg_chunks = {
+        key: np.array_split(value, num_chunks)
+        for key, value in kwargs.items()
+    }
+    for i in range(num_chunks):
+        others[i % 2].update(
+            *[chunk[i] for chunk in chunks], **{
+                key: value[i]
+                for key, value in kwarg_chunks.items()
+            })
+    accumulator.merge(others[1])
+    return accumulator
+
+
+@pytest.mark.parametrize('num_chunks', [1, 3, 7])
+def test_keypoint_accumulator(num_chunks):
+    rng = np.random.RandomState(0)
+    pred = rng.rand(20, 5, 2) * 100
+    gt = rng.rand(20, 5, 2) * 100
+    mask = rng.rand(20, 5) > 0.3
+    mask[:, 4] = False
+    bbox_size = rng.rand(20) * 200 + 50
+    head_size = rng.rand(20) * 50 + 10
+    normalize_factor = rng.rand(20, 2) * 100 + 10
+
+    accumulator = KeypointAccumulator(['PCK', 'PCKh', 'AUC', 'EPE', 'NME'])
+    accumulator = _accumulate(
+        accumulator,
+        num_chunks,
+        pred,
+        gt,
+        mask,
+        bbox_size=bbox_size,
+        head_size=head_size,
+        normalize_factor=normalize_factor)
+    results = dict(accumulator.summarize())
+    assert list(results) == ['PCK', 'PCKh', 'AUC', 'EPE', 'NME']
+
+    _, pck, _ = keypoint_pck_accuracy(pred, gt, mask, 0.2,
+                                      np.tile(bbox_size[:, None], (1, 2)))
+    assert_almost_equal(results['PCK'], pck)
+    _, pckh, _ = keypoint_pck_accuracy(pred, gt, mask, 0.7,
+                                       np.tile(head_size[:, None], (1, 2)))
+    assert_almost_equal(results['PCKh'], pckh)
+    assert_almost_equal(results['AUC'],
+                        keypoint_auc(pred, gt, mask, 30, num_step=20))
+    # the errors are summed in float64 instead of float32
+    assert_allclose(results['EPE'], keypoint_epe(pred, gt, mask), rtol=1e-6)
+    assert_allclose(
+        results['NME'],
+        keypoint_nme(pred, gt, mask, normalize_factor),
+        rtol=1e-6)
+
+
+def test_keypoint_accumulator_empty():
+    accumulator = KeypointAccumulator('PCK')
+    accumulator.update(
+        np.zeros((0, 5, 2)), np.zeros((0, 5, 2)), np.zeros((0, 5)),
+        np.zeros(0))
+    assert accumulator.summarize() == [('PCK', 0)]
+
+
+@pytest.mark.parametrize('num_chunks', [1, 4])
+def test_mpjpe_accumulator(num_chunks):
+    rng = np.random.RandomState(0)
+    pred = rng.rand(12, 6, 3)
+    gt = rng.rand(12, 6, 3)
+    mask = rng.rand(12, 6) > 0.2
+    groups = np.array(['b', 'a', 'b', 'c'] * 3)
+
+    alignments = ['none', 'procrustes', 'scale']
+    accumulator = _accumulate(
+        MPJPEAccumulator(alignments),
+        num_chunks,
+        pred,
+        gt,
+        mask,
+        groups=groups)
+    assert accumulator.groups == ['b', 'a', 'c']
+
+    for alignment in alignments:
+        assert_almost_equal(
+            accumulator.summarize(alignment),
+            keypoint_mpjpe(pred, gt, mask, alignment))
+        for group in ['a', 'b', 'c']:
+            indices = groups == group
+            assert_almost_equal(
+                accumulator.summarize(alignment, group),
+                keypoint_mpjpe(pred[indices], gt[indices], mask[indices],
+                               alignment))
+
+
+def test_result_accumulator():
+    accumulator = ResultAccumulator()
+    other = ResultAccumulator()
+    accumulator.update(preds=np.zeros((2, 3)), ids=[0, 1])
+    other.update(preds=np.ones((1, 3)), ids=[2])
+    accumulator.merge(other)
+
+    assert accumulator.get('preds').shape == (3, 3)
+    assert accumulator.get('ids').tolist() == [0, 1, 2]
@@ -0,0 +1,88 @@
+import copy
+
+import numpy as np
+import pytest
+from xtcocotools.coco import COCO
+from xtcocotools.cocoeval import COCOeval
+
+from mmpose.core import ParallelCOCOeval
+
+
+def _make_results(coco, fields, seed=0):
+    """Perturb the ground truths of the images to make the results."""
+    rng = np.random.RandomState(seed)
+    results = []
+    for ann in coco.dataset['annotations']:
+        for _ in range(rng.randint(0, 4)):
+            result = dict(
+                image_id=ann['image_id'],
+                category_id=ann['category_id'],
+                score=float(rng.rand()))
+            for field in fields:
+                keypoints = np.array(ann[field], dtype=float).reshape(-1, 3)
+                keypoints[:, :2] += rng.randn(len(keypoints), 2) * 10
+                keypoints[:, 2] = rng.rand(len(keypoints))
+                result[field] = keypoints.reshape(-1).tolist()
+            results.append(result)
+    return results
+
+
+def _evaluate(eval_cls, coco, results, iou_type, sigmas, use_area, **kwargs):
+    coco_det = coco.loadRes(copy.deepcopy(results))
+    coco_eval = eval_cls(
+        coco, coco_det, iou_type, sigmas, use_area=use_area, **kwargs)
+    coco_eval.params.useSegm = None
+    coco_eval.evaluate()
+    coco_eval.accumulate()
+    coco_eval.summarize()
+    return coco_eval
+
+
+@pytest.mark.parametrize('nproc', [1, 2])
+@pytest.mark.parametrize('ann_file, iou_type, num_keypoints, use_area', [
+    ('tests/data/coco/test_coco.json', 'keypoints', 17, True),
+    ('tests/data/crowdpose/test_crowdpose.json', 'keypoints_crowd', 14, False),
+    ('tests/data/coco/test_coco_wholebody.json', 'keypoints_face', 68, True),
+    ('tests/data/coco/test_coco_wholebody.json', 'keypoints_wholebody', 133,
+     True)
+])
+def test_parallel_coco_eval(ann_file, iou_type, num_keypoints, use_area,
+                            nproc):
+    coco = COCO(ann_file)
+    if 'wholebody' in ann_file:
+        fields = [
+            'keypoints', 'foot_kpts', 'face_kpts', 'lefthand_kpts',
+            'righthand_kpts'
+        ]
+    else:
+        fields = ['keypoints']
+    results = _make_results(coco, fields)
+    sigmas = np.linspace(0.025, 0.1, num_keypoints)
+
+    coco_eval = _evaluate(COCOeval, coco, results, iou_type, sigmas, use_area)
+    parallel_coco_eval = _evaluate(
+        ParallelCOCOeval,
+        coco,
+        results,
+        iou_type,
+        sigmas,
+        use_area,
+        nproc=nproc)
+
+    assert np.array_equal(parallel_coco_eval.stats, coco_eval.stats)
+    assert parallel_coco_eval.ious.keys() == coco_eval.ious.keys()
+    for key, ious in coco_eval.ious.items():
+        assert np.array_equal(parallel_coco_eval.ious[key], ious)
+    assert len(parallel_coco_eval.evalImgs) == len(coco_eval.evalImgs)
+    for parallel_eval_img, eval_img in zip(parallel_coco_eval.evalImgs,
+                                           coco_eval.evalImgs):
+        if eval_img is None:
+            assert parallel_eval_img is None
+            continue
+        for key in ['dtMatches', 'gtMatches', 'dtScores', 'dtIgnore']:
+            assert np.array_equal(parallel_eval_img[key], eval_img[key])
+
+
+def test_parallel_coco_eval_iou_type():
+    with pytest.raises(AssertionError):
+        _ = ParallelCOCOeval(iouType='bbox')
@@ -1,10 +1,14 @@
+import cv2
 import numpy as np
 import pytest
+import torch
 from numpy.testing import assert_array_almost_equal
 
 from mmpose.core import (keypoint_auc, keypoint_epe, keypoint_pck_accuracy,
                          keypoints_from_heatmaps, keypoints_from_heatmaps3d,
                          multilabel_classification_accuracy, pose_pck_accuracy)
+from mmpose.core.evaluation.top_down_eval import _get_max_preds, _taylor
+from mmpose.core.post_processing import transform_preds
 
 
 def test_pose_pck_accuracy():
@@ -77,6 +81,129 @@ def test_keypoints_from_heatmaps():
     assert isinstance(maxvals2, np.ndarray)
 
 
+def _keypoints_from_heatmaps_loop(heatmaps,
+                                  center,
+                                  scale,
+                                  post_process,
+                                  kernel=11):
+    """Decode the keypoints of each heatmap one by one, as a reference."""
+    heatmaps = heatmaps.copy()
+    N, K, H, W = heatmaps.shape
+    if post_process in ['megvii', 'unbiased']:
+        blurred = heatmaps.copy()
+        border = (kernel - 1) // 2
+        for n in range(N):
+            for k in range(K):
+                origin_max = np.max(blurred[n, k])
+                dr = np.zeros((H + 2 * border, W + 2 * border),
+                              dtype=np.float32)
+                dr[border:-border, border:-border] = blurred[n, k]
+                dr = cv2.GaussianBlur(dr, (kernel, kernel), 0)
+                blurred[n, k] = dr[border:-border, border:-border]
+                blurred[n, k] *= origin_max / np.max(blurred[n, k])
+        if post_process == 'megvii':
+            heatmaps = blurred
+
+    preds, maxvals = _get_max_preds(heatmaps)
+    for n in range(N):
+        for k in range(K):
+            if post_process == 'unbiased':
+                preds[n][k] = _taylor(
+                    np.log(np.maximum(blurred[n][k], 1e-10)), preds[n][k])
+                continue
+            if post_process is None:
+                continue
+            heatmap = heatmaps[n][k]
+            px = int(preds[n][k][0])
+            py = int(preds[n][k][1])
+            if 1 < px < W - 1 and 1 < py < H - 1:
+                diff = np.array([
+                    heatmap[py][px + 1] - heatmap[py][px - 1],
+                    heatmap[py + 1][px] - heatmap[py - 1][px]
+                ])
+                preds[n][k] += np.sign(diff) * .25
+                if post_process == 'megvii':
+                    preds[n][k] += 0.5
+
+    for n in range(N):
+        preds[n] = transform_preds(preds[n], center[n], scale[n], [W, H])
+    if post_process == 'megvii':
+        maxvals = maxvals / 255.0 + 0.5
+    return preds, maxvals
+
+
+def _demo_heatmaps(N, K, H=64, W=48, seed=0):
+    """Gaussian heatmaps with noise, including peaks on the borders."""
+    rng = np.random.RandomState(seed)
+    x = rng.uniform(-2, W + 2, (N, K, 1, 1))
+    y = rng.uniform(-2, H + 2, (N, K, 1, 1))
+    heatmaps = np.exp(-((np.arange(W) - x)**2 +
+                        (np.arange(H)[:, None] - y)**2) / 8)
+    heatmaps += rng.random_sample((N, K, H, W)) * 0.01
+    # a heatmap without any positive response
+    heatmaps[0, 0] = -0.5
+    return heatmaps.astype(np.float32)
+
+
+def test_keypoints_from_heatmaps_vectorized():
+    heatmaps = _demo_heatmaps(3, 17)
+    center = np.array([[127, 127], [64, 96], [300, 200]], dtype=np.float32)
+    scale = np.array([[0.32, 0.32], [0.24, 0.32], [1.5, 2.0]],
+                     dtype=np.float32)
+
+    for post_process in [None, 'default', 'unbiased', 'megvii']:
+        preds, maxvals = _keypoints_from_heatmaps_loop(heatmaps, center, scale,
+                                                       post_process)
+        for inputs in [heatmaps, torch.from_numpy(heatmaps)]:
+            preds1, maxvals1 = keypoints_from_heatmaps(
+                inputs, center, scale, post_process=post_process)
+            assert isinstance(preds1, np.ndarray)
+            assert isinstance(maxvals1, np.ndarray)
+            assert_array_almost_equal(preds, preds1, decimal=4)
+            assert_array_almost_equal(maxvals, maxvals1, decimal=4)
+
+    # the heatmaps are not modified
+    heatmaps_copy = heatmaps.copy()
+    _ = keypoints_from_heatmaps(heatmaps, center, scale, post_process='megvii')
+    assert_array_almost_equal(heatmaps, heatmaps_copy)
+
+    # udp
+    for target_type, num_channels in [('GaussianHeatmap', 17),
+                                      ('CombinedTarget', 51)]:
+        heatmaps = _demo_heatmaps(3, num_channels)
+        if target_type == 'CombinedTarget':
+            heatmaps[:, 1::3] = heatmaps[:, 1::3] * 2 - 1
+            heatmaps[:, 2::3] = heatmaps[:, 2::3] * 2 - 1
+        preds, maxvals = keypoints_from_heatmaps(
+            heatmaps,
+            center,
+            scale,
+            kernel=3,
+            use_udp=True,
+            target_type=target_type)
+        # the instances are decoded independently
+        preds0, maxvals0 = keypoints_from_heatmaps(
+            heatmaps[1:2],
+            center[1:2],
+            scale[1:2],
+            kernel=3,
+            use_udp=True,
+            target_type=target_type)
+        assert_array_almost_equal(preds[1:2], preds0, decimal=4)
+        assert_array_almost_equal(maxvals[1:2], maxvals0, decimal=4)
+        preds1, maxvals1 = keypoints_from_heatmaps(
+            torch.from_numpy(heatmaps),
+            center,
+            scale,
+            kernel=3,
+            use_udp=True,
+            target_type=target_type)
+        # the locations without any positive response are meaningless
+        valid = maxvals[..., 0] > 0
+        assert_array_almost_equal(preds[valid], preds1[valid], decimal=4)
+        assert_array_almost_equal(maxvals, maxvals1, decimal=4)
+
+
 def test_keypoint_pck_accuracy():
     output = np.zeros((2, 5, 2))
     target = np.zeros((2, 5, 2))
@@ -81,6 +81,176 @@ def test_bottomup_forward():
         _ = detector.forward_dummy(imgs)
 
 
+def test_bottomup_forward_batched():
+    model_cfg = dict(
+        backbone=dict(type='ResNet', depth=18),
+        keypoint_head=dict(
+            type='AESimpleHead',
+            in_channels=512,
+            num_joints=17,
+            num_deconv_layers=0,
+            tag_per_joint=True,
+            with_ae_loss=[True],
+            extra=dict(final_conv_kernel=1, ),
+            loss_keypoint=dict(
+                type='MultiLossFactory',
+                num_joints=17,
+                num_stages=1,
+                ae_loss_type='exp',
+                with_ae_loss=[True],
+                push_loss_factor=[0.001],
+                pull_loss_factor=[0.001],
+                with_heatmaps_loss=[True],
+                heatmaps_loss_factor=[1.0])),
+        train_cfg=dict(),
+        test_cfg=dict(
+            num_joints=17,
+            max_num_people=30,
+            scale_factor=[1, 0.5],
+            with_heatmaps=[True],
+            with_ae=[True],
+            project2image=True,
+            nms_kernel=5,
+            nms_padding=2,
+            tag_per_joint=True,
+            detection_threshold=0.1,
+            tag_threshold=1,
+            use_detection_val=True,
+            ignore_too_much=False,
+            adjust=True,
+            refine=True,
+            flip_test=True))
+
+    rng = np.random.RandomState(0)
+    img_metas = _demo_mm_inputs()['img_metas']
+    img_metas[0]['aug_data'] = [
+        torch.FloatTensor(rng.rand(1, 3, 256, 256)),
+        torch.FloatTensor(rng.rand(1, 3, 128, 128))
+    ]
+    img_metas[0]['test_scale_factor'] = [1, 0.5]
+    imgs = torch.zeros(1, 3, 256, 256)
+
+    detector = AssociativeEmbedding(**model_cfg)
+    detector.eval()
+    with torch.no_grad():
+        result = detector.forward(
+            imgs, img_metas=img_metas, return_loss=False, return_heatmap=True)
+
+    # run the image and its flipped image as one batch
+    detector.test_cfg['flip_test_mode'] = 'batched'
+    with torch.no_grad():
+        result_batched = detector.forward(
+            imgs, img_metas=img_metas, return_loss=False, return_heatmap=True)
+    np.testing.assert_allclose(
+        result_batched['output_heatmap'],
+        result['output_heatmap'],
+        rtol=1e-4,
+        atol=1e-5)
+
+    # run all the scales as one batch
+    detector.test_cfg['batch_scales'] = True
+    with torch.no_grad():
+        result_batched = detector.forward(
+            imgs, img_metas=img_metas, return_loss=False, return_heatmap=True)
+    assert result_batched['output_heatmap'].shape == \
+        result['output_heatmap'].shape
+
+    # the outputs are the same with only one scale
+    img_metas[0]['aug_data'] = img_metas[0]['aug_data'][:1]
+    img_metas[0]['test_scale_factor'] = [1]
+    with torch.no_grad():
+        result_batched = detector.forward(
+            imgs, img_metas=img_metas, return_loss=False, return_heatmap=True)
+    detector.test_cfg['flip_test_mode'] = 'separate'
+    detector.test_cfg['batch_scales'] = False
+    with torch.no_grad():
+        result = detector.forward(
+            imgs, img_metas=img_metas, return_loss=False, return_heatmap=True)
+    np.testing.assert_allclose(
+        result_batched['output_heatmap'],
+        result['output_heatmap'],
+        rtol=1e-4,
+        atol=1e-5)
+
+
+def test_bottomup_forward_multi_image():
+    model_cfg = dict(
+        backbone=dict(type='ResNet', depth=18),
+        keypoint_head=dict(
+            type='AESimpleHead',
+            in_channels=512,
+            num_joints=17,
+            num_deconv_layers=0,
+            tag_per_joint=True,
+            with_ae_loss=[True],
+            extra=dict(final_conv_kernel=1, ),
+            loss_keypoint=dict(
+                type='MultiLossFactory',
+                num_joints=17,
+                num_stages=1,
+                ae_loss_type='exp',
+                with_ae_loss=[True],
+                push_loss_factor=[0.001],
+                pull_loss_factor=[0.001],
+                with_heatmaps_loss=[True],
+                heatmaps_loss_factor=[1.0])),
+        train_cfg=dict(),
+        test_cfg=dict(
+            num_joints=17,
+            max_num_people=30,
+            scale_factor=[1],
+            with_heatmaps=[True],
+            with_ae=[True],
+            project2image=True,
+            nms_kernel=5,
+            nms_padding=2,
+            tag_per_joint=True,
+            detection_threshold=0.1,
+            tag_threshold=1,
+            use_detection_val=True,
+            ignore_too_much=False,
+            adjust=True,
+            refine=True,
+            flip_test=True))
+
+    rng = np.random.RandomState(0)
+    img_metas = _demo_mm_inputs((3, 3, 256, 256))['img_metas']
+    img_metas[1]['aug_data'] = [torch.FloatTensor(rng.rand(1, 3, 256, 256))]
+    # an image of a smaller size, which is padded in the batch
+    img_metas[2]['aug_data'] = [torch.FloatTensor(rng.rand(1, 3, 128, 192))]
+    img_metas[2]['base_size'] = (192, 128)
+    for i, img_meta in enumerate(img_metas):
+        img_meta['image_file'] = f'test_{i}.jpg'
+    imgs = torch.zeros(3, 3, 256, 256)
+
+    detector = AssociativeEmbedding(**model_cfg)
+    detector.eval()
+    with torch.no_grad():
+        result = detector.forward(
+            imgs, img_metas=img_metas, return_loss=False, return_heatmap=True)
+    assert result['image_paths'] == ['test_0.jpg', 'test_1.jpg', 'test_2.jpg']
+    assert len(result['num_people']) == 3
+    assert len(result['preds']) == sum(result['num_people'])
+    assert len(result['scores']) == sum(result['num_people'])
+    assert result['output_heatmap'].shape == (3, 17, 256, 256)
+
+    # the results of the images of the same size are the same as the
+    # results of each image
+    for i in range(2):
+        with torch.no_grad():
+            result_single = detector.forward(
+                imgs[i:i + 1],
+                img_metas=img_metas[i:i + 1],
+                return_loss=False,
+                return_heatmap=True)
+        np.testing.assert_allclose(
+            result['output_heatmap'][i:i + 1],
+            result_single['output_heatmap'],
+            rtol=1e-4,
+            atol=1e-5)
+        assert result['num_people'][i] == result_single['num_people'][0]
+
+
 def _demo_mm_inputs(input_shape=(1, 3, 256, 256)):
     """Create a superset of inputs needed to run test or train batches.
 
@@ -95,6 +95,72 @@ def test_topdown_forward():
     with torch.no_grad():
         _ = detector.forward(imgs, img_metas=img_metas, return_loss=False)
 
+    # Test decoding the heatmaps on the device gives the same keypoints
+    for post_process in ['default', 'unbiased', 'megvii']:
+        detector.keypoint_head.test_cfg['post_process'] = post_process
+        with torch.no_grad():
+            result = detector.forward(
+                imgs, img_metas=img_metas, return_loss=False)
+            result_heatmap = detector.forward(
+                imgs,
+                img_metas=img_metas,
+                return_loss=False,
+                return_heatmap=True)
+        assert result['output_heatmap'] is None
+        assert isinstance(result_heatmap['output_heatmap'], np.ndarray)
+        np.testing.assert_allclose(
+            result['preds'], result_heatmap['preds'], rtol=1e-3)
+    detector.keypoint_head.test_cfg['post_process'] = 'default'
+
+    # Test flip test with the images and the flipped images in one batch
+    detector.eval()
+    batch_imgs = torch.cat([imgs, imgs.flip(2)])
+    batch_img_metas = img_metas * 2
+    for return_heatmap in [False, True]:
+        detector.test_cfg['flip_test_mode'] = 'separate'
+        with torch.no_grad():
+            result = detector.forward(
+                batch_imgs,
+                img_metas=batch_img_metas,
+                return_loss=False,
+                return_heatmap=return_heatmap)
+        detector.test_cfg['flip_test_mode'] = 'batched'
+        with torch.no_grad():
+            result_batched = detector.forward(
+                batch_imgs,
+                img_metas=batch_img_metas,
+                return_loss=False,
+                return_heatmap=return_heatmap)
+        np.testing.assert_array_almost_equal(result_batched['preds'],
+                                             result['preds'])
+        if return_heatmap:
+            np.testing.assert_allclose(
+                result_batched['output_heatmap'],
+                result['output_heatmap'],
+                rtol=1e-4,
+                atol=1e-6)
+
+    # Test batched flip test with a regression head
+    detector = TopDown(
+        backbone=dict(type='ResNet', depth=18),
+        neck=dict(type='GlobalAveragePooling'),
+        keypoint_head=dict(
+            type='DeepposeRegressionHead',
+            in_channels=512,
+            num_joints=17,
+            loss_keypoint=dict(type='SmoothL1Loss', use_target_weight=False)),
+        train_cfg=dict(),
+        test_cfg=dict(flip_test=True))
+    detector.eval()
+    with torch.no_grad():
+        result = detector.forward(
+            batch_imgs, img_metas=batch_img_metas, return_loss=False)
+        detector.test_cfg['flip_test_mode'] = 'batched'
+        result_batched = detector.forward(
+            batch_imgs, img_metas=batch_img_metas, return_loss=False)
+    np.testing.assert_array_almost_equal(result_batched['preds'],
+                                         result['preds'])
+
     # flip test
     model_cfg = dict(
         type='TopDown',
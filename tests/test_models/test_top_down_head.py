@@ -262,6 +262,23 @@ def test_top_down_simple_head():
 
     head.init_weights()
 
+    # test the heatmaps are kept as a tensor
+    head = TopdownHeatmapSimpleHead(
+        out_channels=3,
+        in_channels=512,
+        num_deconv_layers=0,
+        loss_keypoint=dict(type='JointsMSELoss', use_target_weight=True),
+        test_cfg=dict(shift_heatmap=True))
+    head.init_weights()
+    inputs = _demo_inputs((2, 512, 8, 8))
+    for flip_pairs in [None, [(0, 1)]]:
+        heatmap = head.inference_model(inputs, flip_pairs)
+        heatmap_tensor = head.inference_model(
+            inputs, flip_pairs, return_tensor=True)
+        assert isinstance(heatmap, np.ndarray)
+        assert isinstance(heatmap_tensor, torch.Tensor)
+        np.testing.assert_array_almost_equal(heatmap, heatmap_tensor.numpy())
+
 
 def test_top_down_multistage_head():
     """Test multistage head."""
@@ -383,6 +400,24 @@ def test_top_down_multistage_head():
 
     head.init_weights()
 
+    # test the heatmaps are kept as a tensor
+    head = TopdownHeatmapMultiStageHead(
+        out_channels=3,
+        in_channels=512,
+        num_deconv_layers=0,
+        loss_keypoint=dict(type='JointsMSELoss', use_target_weight=True),
+        test_cfg=dict(shift_heatmap=True))
+    head.init_weights()
+    head.eval()
+    inputs = [_demo_inputs((2, 512, 8, 8))]
+    for flip_pairs in [None, [(0, 1)]]:
+        heatmap = head.inference_model(inputs, flip_pairs)
+        heatmap_tensor = head.inference_model(
+            inputs, flip_pairs, return_tensor=True)
+        assert isinstance(heatmap, np.ndarray)
+        assert isinstance(heatmap_tensor, torch.Tensor)
+        np.testing.assert_array_almost_equal(heatmap, heatmap_tensor.numpy())
+
 
 def test_top_down_msmu_head():
     """Test multi-stage multi-unit head."""
@@ -478,6 +513,28 @@ def test_top_down_msmu_head():
 
     head.init_weights()
 
+    # test the heatmaps are kept as a tensor
+    head = TopdownHeatmapMSMUHead(
+        out_shape=(16, 12),
+        unit_channels=256,
+        out_channels=17,
+        num_stages=2,
+        num_units=2,
+        loss_keypoint=(
+            [dict(type='JointsMSELoss', use_target_weight=True)] * 2 +
+            [dict(type='JointsOHKMMSELoss', use_target_weight=True)]) * 2,
+        test_cfg=dict(shift_heatmap=True))
+    head.init_weights()
+    head.eval()
+    inputs = [[_demo_inputs((2, 256, 8, 8))] * 2] * 2
+    for flip_pairs in [None, [(0, 1)]]:
+        heatmap = head.inference_model(inputs, flip_pairs)
+        heatmap_tensor = head.inference_model(
+            inputs, flip_pairs, return_tensor=True)
+        assert isinstance(heatmap, np.ndarray)
+        assert isinstance(heatmap_tensor, torch.Tensor)
+        np.testing.assert_array_almost_equal(heatmap, heatmap_tensor.numpy())
+
 
 def test_fc_head():
     """Test fc head."""
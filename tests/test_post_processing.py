@@ -1,9 +1,11 @@
 import numpy as np
+import torch
 from numpy.testing import assert_array_almost_equal
 
 from mmpose.core import (affine_transform, flip_back, fliplr_joints,
-                         fliplr_regression, get_affine_transform, rotate_point,
-                         transform_preds)
+                         fliplr_regression, get_affine_transform,
+                         get_affine_transform_batch, get_warp_matrix,
+                         get_warp_matrix_batch, rotate_point, transform_preds)
 
 
 def test_affine_transform():
@@ -47,6 +49,17 @@ def test_flip_back():
     heatmaps = heatmaps[:, :, :, ::-1]
     assert_array_almost_equal(ori_heatmaps[:, :, :, ::-1], heatmaps)
 
+    # test flipping tensors
+    for target_type, channels in [('GaussianHeatmap', 2),
+                                  ('CombinedTarget', 6)]:
+        heatmaps = np.random.random([2, channels, 32, 32])
+        flipped_heatmaps = flip_back(
+            heatmaps.copy(), [[0, 1]], target_type=target_type)
+        flipped_tensor = flip_back(
+            torch.from_numpy(heatmaps), [[0, 1]], target_type=target_type)
+        assert isinstance(flipped_tensor, torch.Tensor)
+        assert_array_almost_equal(flipped_heatmaps, flipped_tensor.numpy())
+
 
 def test_transform_preds():
     coords = np.random.random([2, 2])
@@ -73,6 +86,33 @@ def test_get_affine_transform():
     assert_array_almost_equal(trans, ans)
 
 
+def test_get_affine_transform_batch():
+    center = np.random.uniform(0, 500, (8, 2))
+    scale = np.random.uniform(0.5, 2, (8, 2))
+    rot = np.random.uniform(-30, 30, 8)
+    size = np.array([192, 256])
+    for inv in (False, True):
+        ans = get_affine_transform_batch(
+            center, scale, rot, size, shift=(0.1, 0.1), inv=inv)
+        assert ans.shape == (8, 2, 3)
+        for i in range(8):
+            trans = get_affine_transform(
+                center[i], scale[i], rot[i], size, shift=(0.1, 0.1), inv=inv)
+            np.testing.assert_allclose(ans[i], trans, rtol=1e-4, atol=1e-2)
+
+
+def test_get_warp_matrix_batch():
+    center = np.random.uniform(0, 500, (8, 2))
+    scale = np.random.uniform(0.5, 2, (8, 2))
+    size = np.array([192, 256])
+    ans = get_warp_matrix_batch(0, center * 2.0, size - 1.0, scale * 200.0)
+    assert ans.shape == (8, 2, 3)
+    for i in range(8):
+        trans = get_warp_matrix(0, center[i] * 2.0, size - 1.0,
+                                scale[i] * 200.0)
+        assert_array_almost_equal(ans[i], trans)
+
+
 def test_flip_regression():
     coords = np.random.rand(3, 3)
     flip_pairs = [[1, 2]]
@@ -1,6 +1,8 @@
 import numpy as np
+import pytest
 
-from mmpose.core.post_processing.one_euro_filter import OneEuroFilter
+from mmpose.core.post_processing.one_euro_filter import (BatchedOneEuroFilter,
+                                                         OneEuroFilter)
 
 
 def test_one_euro_filter():
@@ -33,3 +35,37 @@ def test_one_euro_filter():
     for i in range(1, len(kpts)):
         kpts[i]['keypoints'][:, :2] = one_euro_filter(
             kpts[i]['keypoints'][:, :2])
+
+
+def test_batched_one_euro_filter():
+    rng = np.random.RandomState(0)
+    keypoints = rng.uniform(-1, 100, (10, 6, 17, 2))
+
+    for fps in (None, 30):
+        batched_filter = BatchedOneEuroFilter(fps=fps)
+        filters = {}
+        for t in range(len(keypoints)):
+            # the tracks come and go
+            track_ids = [i for i in range(6) if (i + t) % 4 != 0]
+            x = keypoints[t, track_ids]
+            x_hat = batched_filter(track_ids, x)
+            assert x_hat.shape == x.shape
+            for track_id, x_i, x_hat_i in zip(track_ids, x, x_hat):
+                if track_id not in filters:
+                    filters[track_id] = OneEuroFilter(x_i, fps=fps)
+                    np.testing.assert_allclose(x_hat_i, x_i)
+                elif fps is not None:
+                    # the same as filtering each track separately
+                    np.testing.assert_allclose(x_hat_i, filters[track_id](x_i))
+            lost = [i for i in range(6) if (i + t) % 4 == 0]
+            batched_filter.remove(lost)
+            for track_id in lost:
+                filters.pop(track_id, None)
+            assert len(batched_filter) == len(filters)
+
+    batched_filter = BatchedOneEuroFilter()
+    batched_filter.add([3], keypoints[0, :1])
+    with pytest.raises(AssertionError):
+        batched_filter.add([3], keypoints[0, :1])
+    batched_filter.remove([5])
+    assert len(batched_filter) == 1
@@ -1,6 +1,11 @@
+import numpy as np
+import pytest
 import torch
+from numpy.testing import assert_array_almost_equal, assert_array_equal
 
-from mmpose.core.post_processing.group import HeatmapParser
+from mmpose.core.post_processing.group import (HeatmapParser,
+                                               _greedy_max_match,
+                                               _py_max_match, _scipy_max_match)
 
 
 def test_group():
@@ -37,3 +42,110 @@ def test_group():
     assert grouped[0][0, 0, 0] == 10.
     grouped, scores = parser.parse(fake_heatmap, fake_tag, False, True)
     assert grouped[0][0, 0, 0] == 10.
+
+
+def _refine_reference(heatmap, tag, keypoints, use_udp=False):
+    """Refine the missing joints of a person joint by joint."""
+    K, H, W = heatmap.shape
+    detected = keypoints[:, 2] > 0
+    x = np.clip(keypoints[detected, 0].astype(int), 0, W - 1)
+    y = np.clip(keypoints[detected, 1].astype(int), 0, H - 1)
+    prev_tag = np.mean(tag[detected, y, x], axis=0)
+
+    for i in range(K):
+        distance_tag = ((tag[i] - prev_tag[None, None, :])**2).sum(axis=2)**0.5
+        norm_heatmap = heatmap[i] - np.round(distance_tag)
+        y, x = np.unravel_index(np.argmax(norm_heatmap), heatmap[i].shape)
+        xx, yy = x, y
+        val = heatmap[i, y, x]
+        x, y = float(x), float(y)
+        if not use_udp:
+            x += 0.5
+            y += 0.5
+        if heatmap[i, yy, min(W - 1, xx + 1)] > heatmap[i, yy, max(0, xx - 1)]:
+            x += 0.25
+        else:
+            x -= 0.25
+        if heatmap[i, min(H - 1, yy + 1), xx] > heatmap[i, max(0, yy - 1), xx]:
+            y += 0.25
+        else:
+            y -= 0.25
+        if val > 0 and keypoints[i, 2] == 0:
+            keypoints[i, :3] = (x, y, val)
+    return keypoints
+
+
+def test_refine_batch():
+    rng = np.random.RandomState(0)
+    heatmap = rng.rand(17, 32, 32).astype(np.float32)
+    tag = rng.randn(17, 32, 32, 2).astype(np.float32)
+    keypoints = np.zeros((5, 17, 5), dtype=np.float32)
+    keypoints[..., :2] = rng.randint(0, 32, (5, 17, 2))
+    keypoints[..., 2] = rng.rand(5, 17) > 0.5
+    keypoints[:, 0, 2] = 1
+    keypoints[..., 3:] = rng.randn(5, 17, 2)
+
+    for use_udp in (False, True):
+        refined = HeatmapParser.refine_batch(
+            torch.from_numpy(heatmap), torch.from_numpy(tag), keypoints.copy(),
+            use_udp)
+        # refining all the people at once is the same as joint by joint
+        for i in range(len(keypoints)):
+            expected = _refine_reference(heatmap, tag, keypoints[i].copy(),
+                                         use_udp)
+            assert_array_almost_equal(refined[i], expected)
+            assert_array_almost_equal(
+                HeatmapParser.refine(heatmap, tag, keypoints[i].copy(),
+                                     use_udp), expected)
+        assert (refined[..., 2] > 0).all()
+
+
+def test_max_match():
+    rng = np.random.RandomState(0)
+    for num_rows, num_cols in [(1, 1), (3, 5), (8, 8), (20, 30)]:
+        scores = rng.rand(num_rows, num_cols)
+        pairs = _py_max_match(scores)
+        # the optimal assignment is unique without ties
+        assert_array_equal(_scipy_max_match(scores), pairs)
+        greedy_pairs = _greedy_max_match(scores)
+        assert_array_equal(greedy_pairs[:, 0], np.arange(num_rows))
+        assert len(np.unique(greedy_pairs[:, 1])) == num_rows
+        assert scores[tuple(greedy_pairs.T)].sum() >= \
+            scores[tuple(pairs.T)].sum()
+
+    # greedy matching takes the lowest costs first
+    scores = np.array([[1., 2.], [2., 10.]])
+    assert_array_equal(_py_max_match(scores), [[0, 1], [1, 0]])
+    assert_array_equal(_greedy_max_match(scores), [[0, 0], [1, 1]])
+
+
+def test_group_assignment():
+    cfg = dict(
+        num_joints=17,
+        detection_threshold=0.1,
+        tag_threshold=1,
+        use_detection_val=True,
+        ignore_too_much=False,
+        nms_kernel=5,
+        nms_padding=2,
+        tag_per_joint=True,
+        max_num_people=30)
+    rng = np.random.RandomState(0)
+    fake_heatmap = torch.zeros(1, 17, 64, 64)
+    fake_tag = torch.zeros(1, 17, 64, 64, 1)
+    for person_id in range(5):
+        for joint_id in range(17):
+            y, x = rng.randint(0, 64, 2)
+            fake_heatmap[0, joint_id, y, x] = 0.5 + rng.rand() / 2
+            fake_tag[0, joint_id, y, x] = person_id * 2 + rng.rand() / 2
+
+    results = {}
+    for assignment in ['munkres', 'scipy', 'greedy']:
+        parser = HeatmapParser(dict(cfg, assignment=assignment))
+        results[assignment], _ = parser.parse(fake_heatmap, fake_tag)
+        assert results[assignment][0].shape[0] == 5
+    assert_array_almost_equal(results['scipy'][0], results['munkres'][0])
+    assert_array_almost_equal(results['greedy'][0], results['munkres'][0])
+
+    with pytest.raises(AssertionError):
+        HeatmapParser(dict(cfg, assignment='unknown'))
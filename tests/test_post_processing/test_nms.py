@@ -1,6 +1,9 @@
 import numpy as np
 
-from mmpose.core.post_processing.nms import nms, oks_iou, oks_nms, soft_oks_nms
+from mmpose.core.post_processing.nms import (batched_oks_nms, nms, oks_iou,
+                                             oks_iou_matrix, oks_nms,
+                                             oks_nms_array, soft_oks_nms,
+                                             soft_oks_nms_array)
 
 
 def test_soft_oks_nms():
@@ -39,3 +42,74 @@ def test_oks_iou():
     assert result[0] == 1.
     result = oks_iou(np.zeros([17 * 3]), np.ones([1, 17 * 3]), 1, [1])
     assert result[0] < 0.01
+
+
+def test_oks_iou_matrix():
+    rng = np.random.RandomState(0)
+    kpts = np.concatenate([rng.rand(5, 17, 2) * 10,
+                           rng.rand(5, 17, 1)],
+                          axis=-1)
+    areas = rng.rand(5) * 100 + 10
+    for vis_thr in [None, 0.5]:
+        ious = oks_iou_matrix(
+            kpts[:2], kpts, areas[:2], areas, vis_thr=vis_thr)
+        assert ious.shape == (2, 5)
+        for i in range(2):
+            np.testing.assert_array_equal(
+                ious[i],
+                oks_iou(
+                    kpts[i].flatten(),
+                    kpts.reshape(5, -1),
+                    areas[i],
+                    areas,
+                    vis_thr=vis_thr))
+
+    # no visible keypoint
+    ious = oks_iou_matrix(kpts[:1], kpts[:1], areas[:1], areas[:1], vis_thr=1)
+    assert ious[0, 0] == 0
+
+
+def test_oks_nms_array():
+    rng = np.random.RandomState(0)
+    kpts = np.concatenate(
+        [rng.rand(10, 1, 2) * 20 + rng.rand(10, 17, 2),
+         rng.rand(10, 17, 1)],
+        axis=-1)
+    kpts[1] = kpts[0]
+    scores = rng.rand(10)
+    areas = rng.rand(10) * 100 + 10
+    kpts_db = [
+        dict(keypoints=kpts[i], score=scores[i], area=areas[i])
+        for i in range(10)
+    ]
+
+    keep = oks_nms_array(kpts, scores, areas, 0.5)
+    np.testing.assert_array_equal(keep, oks_nms(kpts_db, 0.5))
+    # the duplicated pose is suppressed
+    assert (0 in keep) != (1 in keep)
+    keep_soft = soft_oks_nms_array(kpts, scores, areas, 0.5, max_dets=5)
+    np.testing.assert_array_equal(keep_soft,
+                                  soft_oks_nms(kpts_db, 0.5, max_dets=5))
+    assert len(keep_soft) == 5
+
+    assert len(oks_nms_array(kpts[:0], scores[:0], areas[:0], 0.5)) == 0
+    assert len(soft_oks_nms_array(kpts[:0], scores[:0], areas[:0], 0.5)) == 0
+
+    # the poses of 3 images, where the second image is empty
+    offsets = np.array([0, 6, 6, 10])
+    keep = batched_oks_nms(kpts, scores, areas, offsets, 0.5)
+    np.testing.assert_array_equal(
+        keep,
+        np.concatenate([
+            oks_nms_array(kpts[:6], scores[:6], areas[:6], 0.5),
+            oks_nms_array(kpts[6:], scores[6:], areas[6:], 0.5) + 6
+        ]))
+    keep = batched_oks_nms(
+        kpts, scores, areas, offsets, 0.5, soft=True, max_dets=3)
+    np.testing.assert_array_equal(
+        keep,
+        np.concatenate([
+            soft_oks_nms_array(kpts[:6], scores[:6], areas[:6], 0.5, 3),
+            soft_oks_nms_array(kpts[6:], scores[6:], areas[6:], 0.5, 3) + 6
+        ]))
+    assert len(batched_oks_nms(kpts, scores, areas, [0], 0.5)) == 0
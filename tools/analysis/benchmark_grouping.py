@@ -0,0 +1,122 @@
+import argparse
+import time
+
+import numpy as np
+
+from mmpose.core.post_processing.group import _MATCHERS, _match_by_tag, _Params
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the assignment algorithms of AE grouping')
+    parser.add_argument(
+        '--num-people',
+        type=int,
+        nargs='+',
+        default=[1, 5, 10, 20, 30, 50],
+        help='the numbers of people to benchmark')
+    parser.add_argument(
+        '--num-joints', type=int, default=17, help='number of keypoints')
+    parser.add_argument(
+        '--tag-dim',
+        type=int,
+        default=2,
+        help='dim of tags, 2 with flip testing and 1 without')
+    parser.add_argument(
+        '--tag-noise',
+        type=float,
+        default=0.5,
+        help='std of the tags around the tag of their person, while the tags '
+        'of two people are 2 apart on average')
+    parser.add_argument(
+        '--repeat', type=int, default=20, help='number of synthetic images')
+    parser.add_argument('--seed', type=int, default=0, help='random seed')
+    args = parser.parse_args()
+    return args
+
+
+def make_inputs(num_people, num_joints, tag_dim, tag_noise, rng):
+    """Simulate the top k tags, locations and values of one image.
+
+    Every person has its own tag, and each of its joints is detected with a
+    noisy tag. The remaining top k entries are background responses below the
+    detection threshold. The x coordinate of a detected joint is the index of
+    its person, to check the grouping afterwards.
+    """
+    max_num_people = max(30, num_people)
+    person_tags = rng.permutation(num_people)[:, None] * 2.0 + rng.uniform(
+        -0.5, 0.5, (num_people, tag_dim))
+
+    tag_k = rng.uniform(-1, 2 * num_people,
+                        (num_joints, max_num_people, tag_dim))
+    loc_k = np.full((num_joints, max_num_people, 2), -1.)
+    val_k = rng.uniform(0, 0.1, (num_joints, max_num_people))
+
+    for k in range(num_joints):
+        # some joints are occluded
+        visible = np.nonzero(rng.rand(num_people) > 0.2)[0]
+        slots = rng.permutation(max_num_people)[:len(visible)]
+        tag_k[k, slots] = person_tags[visible] + rng.normal(
+            0, tag_noise, (len(visible), tag_dim))
+        val_k[k, slots] = rng.uniform(0.2, 1, len(visible))
+        loc_k[k, slots, 0] = visible
+
+    return tag_k, loc_k, val_k.astype(np.float32)
+
+
+def grouping_accuracy(ans):
+    """The fraction of the grouped joints which belong to the major person of
+    their group."""
+    num_correct = 0
+    num_joints = 0
+    for person in ans:
+        person_ids = person[person[:, 2] > 0, 0].astype(int)
+        num_correct += np.bincount(person_ids).max()
+        num_joints += len(person_ids)
+    return num_correct / num_joints
+
+
+def main():
+    args = parse_args()
+    rng = np.random.RandomState(args.seed)
+
+    cfg = dict(
+        num_joints=args.num_joints,
+        max_num_people=30,
+        detection_threshold=0.1,
+        tag_threshold=1,
+        use_detection_val=True,
+        ignore_too_much=False)
+
+    header = ['people'] + [f'{name} (ms)' for name in _MATCHERS]
+    header += [f'{name} acc' for name in _MATCHERS]
+    print(''.join(f'{item:>14}' for item in header))
+    for num_people in args.num_people:
+        cfg['max_num_people'] = max(30, num_people)
+        inputs = []
+        for _ in range(args.repeat):
+            inputs.append(
+                make_inputs(num_people, args.num_joints, args.tag_dim,
+                            args.tag_noise, rng))
+
+        latency = {}
+        results = {}
+        for name in _MATCHERS:
+            params = _Params(dict(cfg, assignment=name))
+            start = time.perf_counter()
+            results[name] = [_match_by_tag(inp, params) for inp in inputs]
+            latency[name] = (time.perf_counter() - start) / len(inputs)
+
+        accuracy = {
+            name: np.mean([grouping_accuracy(ans) for ans in results[name]])
+            for name in _MATCHERS
+        }
+
+        row = [str(num_people)]
+        row += [f'{latency[name] * 1000:.2f}' for name in _MATCHERS]
+        row += [f'{accuracy[name]:.2%}' for name in _MATCHERS]
+        print(''.join(f'{item:>14}' for item in row))
+
+
+if __name__ == '__main__':
+    main()
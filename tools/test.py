@@ -44,6 +44,11 @@ def parse_args():
         '--gpu_collect',
         action='store_true',
         help='whether to use gpu to collect results')
+    parser.add_argument(
+        '--online-eval',
+        action='store_true',
+        help='whether to accumulate the metrics batch by batch during the '
+        'test, instead of evaluating all the results at the end')
     parser.add_argument('--tmpdir', help='tmp dir for writing some results')
     parser.add_argument(
         '--cfg-options',
@@ -130,27 +135,39 @@ def main():
     if args.fuse_conv_bn:
         model = fuse_conv_bn(model)
 
+    eval_config = cfg.get('evaluation', {})
+    eval_config = merge_configs(eval_config, dict(metric=args.eval))
+
+    accumulator = None
+    if args.online_eval:
+        assert hasattr(dataset, 'get_accumulator'), \
+            f'{type(dataset).__name__} does not support online evaluation'
+        assert not args.out, '--out is not supported with --online-eval'
+        accumulator = dataset.get_accumulator(**eval_config)
+
     if not distributed:
         model = MMDataParallel(model, device_ids=[0])
-        outputs = single_gpu_test(model, data_loader)
+        outputs = single_gpu_test(model, data_loader, accumulator)
     else:
         model = MMDistributedDataParallel(
             model.cuda(),
             device_ids=[torch.cuda.current_device()],
             broadcast_buffers=False)
         outputs = multi_gpu_test(model, data_loader, args.tmpdir,
-                                 args.gpu_collect)
+                                 args.gpu_collect, accumulator)
 
     rank, _ = get_dist_info()
-    eval_config = cfg.get('evaluation', {})
-    eval_config = merge_configs(eval_config, dict(metric=args.eval))
 
     if rank == 0:
-        if args.out:
-            print(f'\nwriting results to {args.out}')
-            mmcv.dump(outputs, args.out)
-
-        results = dataset.evaluate(outputs, cfg.work_dir, **eval_config)
+        if args.online_eval:
+            results = dataset.evaluate_accumulator(
+                outputs, res_folder=cfg.work_dir, **eval_config)
+        else:
+            if args.out:
+                print(f'\nwriting results to {args.out}')
+                mmcv.dump(outputs, args.out)
+
+            results = dataset.evaluate(outputs, cfg.work_dir, **eval_config)
         for k, v in sorted(results.items()):
             print(f'{k}: {v}')
 